@@ -0,0 +1,220 @@
+"""Benchmark of protobuf <-> pydantic conversion.
+
+Compares direct codec with previous dict based path (`MessageToDict` -> `DataProcessor` ->
+`model_validate` and `model_dump` -> `DataProcessor` -> `ParseDict`). Baseline is parsing
+(decode) or serializing (encode) of the same protobuf message, the only per-message work of
+plain grpcio servicer, so `overhead` column is the cost of codec relative to it.
+
+Run:
+    python -m benchmarks.codec
+"""
+
+import enum
+import timeit
+
+from google.protobuf.json_format import MessageToDict, ParseDict
+from pydantic import BaseModel
+
+from fast_grpc import FastGRPCService, grpc_method
+from fast_grpc.data_processor import (
+    DataProcessor,
+    EnumByNameTypeProcessor,
+    EnumNameByValueTypeProcessor,
+)
+
+ENUM_LOADER = DataProcessor(EnumByNameTypeProcessor())
+ENUM_DUMPER = DataProcessor(EnumNameByValueTypeProcessor())
+
+
+class Status(enum.Enum):
+    ACTIVE = "active"
+    BLOCKED = "blocked"
+
+
+class Flat(BaseModel):
+    id: int
+    name: str
+    score: float
+    enabled: bool
+    status: Status
+
+
+class Address(BaseModel):
+    city: str
+    street: str
+    building: int
+
+
+class Person(BaseModel):
+    name: str
+    address: Address
+    status: Status
+
+
+class Nested(BaseModel):
+    owner: Person
+    members: dict[str, Person]
+
+
+class LargeRepeated(BaseModel):
+    items: list[Flat]
+
+
+class Level3(BaseModel):
+    value: int
+    tags: list[str]
+
+
+class Level2(BaseModel):
+    value: int
+    child: Level3
+
+
+class Level1(BaseModel):
+    value: int
+    child: Level2
+    children: list[Level2]
+
+
+class Deep(BaseModel):
+    root: Level1
+
+
+class Maps(BaseModel):
+    counters: dict[str, int]
+    names: dict[int, str]
+    flags: dict[str, bool]
+
+
+class Enums(BaseModel):
+    status: Status
+    statuses: list[Status]
+    by_name: dict[str, Status]
+
+
+class BenchmarkCodecService(FastGRPCService):
+    @grpc_method
+    async def flat(self, request: Flat) -> Flat:
+        return request
+
+    @grpc_method
+    async def nested(self, request: Nested) -> Nested:
+        return request
+
+    @grpc_method
+    async def large_repeated(self, request: LargeRepeated) -> LargeRepeated:
+        return request
+
+    @grpc_method
+    async def deep(self, request: Deep) -> Deep:
+        return request
+
+    @grpc_method
+    async def maps(self, request: Maps) -> Maps:
+        return request
+
+    @grpc_method
+    async def enums(self, request: Enums) -> Enums:
+        return request
+
+
+def make_flat(index: int = 0) -> Flat:
+    return Flat(id=index, name=f"name-{index}", score=index / 3, enabled=True,
+                status=Status.BLOCKED)
+
+
+def make_person(index: int = 0) -> Person:
+    return Person(
+        name=f"person-{index}",
+        address=Address(city="City", street="Street", building=index),
+        status=Status.ACTIVE,
+    )
+
+
+def make_level1(index: int = 0) -> Level1:
+    level2 = Level2(value=index, child=Level3(value=index, tags=["a", "b", "c"]))
+    return Level1(value=index, child=level2, children=[level2] * 5)
+
+
+SAMPLES = {
+    "flat": make_flat(),
+    "nested": Nested(
+        owner=make_person(),
+        members={str(index): make_person(index) for index in range(10)},
+    ),
+    "large_repeated": LargeRepeated(items=[make_flat(index) for index in range(1000)]),
+    "deep": Deep(root=make_level1()),
+    "maps": Maps(
+        counters={f"key-{index}": index for index in range(100)},
+        names={index: f"name-{index}" for index in range(100)},
+        flags={f"flag-{index}": index % 2 == 0 for index in range(100)},
+    ),
+    "enums": Enums(
+        status=Status.ACTIVE,
+        statuses=[Status.ACTIVE, Status.BLOCKED] * 50,
+        by_name={f"name-{index}": Status.BLOCKED for index in range(50)},
+    ),
+}
+
+
+def legacy_decode(message, model: type[BaseModel]) -> BaseModel:
+    data = MessageToDict(
+        message,
+        always_print_fields_with_no_presence=True,
+        preserving_proto_field_name=True,
+    )
+    return model.model_validate(ENUM_LOADER(data=data, model=model))
+
+
+def legacy_encode(instance: BaseModel, message_class):
+    data = ENUM_DUMPER(data=instance.model_dump(mode="json"), model=type(instance))
+    return ParseDict(data, message_class(), ignore_unknown_fields=True)
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    print(
+        f"{'shape':<16}{'direction':<10}{'protobuf, us':>14}{'legacy, us':>14}"
+        f"{'codec, us':>14}{'speedup':>10}{'overhead':>10}"
+    )
+    for shape, instance in SAMPLES.items():
+        model = type(instance)
+        codec = BenchmarkCodecService.codecs[model.__name__]
+        message_class = codec.message_class
+        message = codec.encode(instance)
+        data = message.SerializeToString()
+        number = 20 if shape == "large_repeated" else 2000
+
+        cases = (
+            (
+                "decode",
+                lambda message_class=message_class, data=data: message_class.FromString(data),
+                lambda message=message, model=model: legacy_decode(message, model),
+                lambda codec=codec, message=message: codec.decode(message),
+            ),
+            (
+                "encode",
+                message.SerializeToString,
+                lambda instance=instance, message_class=message_class: legacy_encode(
+                    instance,
+                    message_class,
+                ),
+                lambda codec=codec, instance=instance: codec.encode(instance),
+            ),
+        )
+        for direction, baseline, legacy, direct in cases:
+            baseline_time = measure(baseline, number=number) * 1e6
+            legacy_time = measure(legacy, number=number) * 1e6
+            direct_time = measure(direct, number=number) * 1e6
+            print(
+                f"{shape:<16}{direction:<10}{baseline_time:>14.2f}{legacy_time:>14.2f}"
+                f"{direct_time:>14.2f}{legacy_time / direct_time:>9.1f}x"
+                f"{direct_time / baseline_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
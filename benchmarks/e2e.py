@@ -0,0 +1,182 @@
+"""End-to-end loopback benchmark of unary and server streaming calls.
+
+Server runs in separate process, load is generated by concurrent calls of plain grpcio stub
+(so results compare servers only) and of generated Fast-gRPC client (so client overhead is
+added). Baseline is hand-written plain grpcio servicer with the same `_pb2` modules.
+
+Run:
+    python -m benchmarks.e2e
+"""
+
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
+import grpc
+from pydantic import BaseModel
+
+from fast_grpc import FastGRPC, FastGRPCService, grpc_method
+
+# Messages of pb2 module, built in memory, are unknown to pylint
+# pylint: disable=no-member
+
+CONCURRENCY = 32
+DURATION = 3.0
+WARMUP = 0.5
+STREAM_SIZE = 10
+
+
+class EchoRequest(BaseModel):
+    name: str
+    count: int
+
+
+class EchoResponse(BaseModel):
+    text: str
+    index: int
+
+
+class BenchmarkEchoService(FastGRPCService):
+    @grpc_method
+    async def unary(self, request: EchoRequest) -> EchoResponse:
+        return EchoResponse(text=request.name, index=request.count)
+
+    @grpc_method
+    async def stream(self, request: EchoRequest) -> AsyncIterator[EchoResponse]:
+        for index in range(request.count):
+            yield EchoResponse(text=request.name, index=index)
+
+
+def build_plain_server(port: int) -> grpc.aio.Server:
+    pb2 = BenchmarkEchoService.pb2
+
+    async def unary(request, context):
+        return pb2.EchoResponse(text=request.name, index=request.count)
+
+    async def stream(request, context):
+        for index in range(request.count):
+            yield pb2.EchoResponse(text=request.name, index=index)
+
+    # The same handlers, that `add_<Service>Servicer_to_server` of protoc registers
+    generic_handler = grpc.method_handlers_generic_handler(
+        "benchmarkechoservice.BenchmarkEchoService",
+        {
+            "unary": grpc.unary_unary_rpc_method_handler(
+                unary,
+                request_deserializer=pb2.EchoRequest.FromString,
+                response_serializer=pb2.EchoResponse.SerializeToString,
+            ),
+            "stream": grpc.unary_stream_rpc_method_handler(
+                stream,
+                request_deserializer=pb2.EchoRequest.FromString,
+                response_serializer=pb2.EchoResponse.SerializeToString,
+            ),
+        },
+    )
+    grpc_server = grpc.aio.server()
+    grpc_server.add_generic_rpc_handlers((generic_handler,))
+    grpc_server.add_insecure_port(f"[::]:{port}")
+    return grpc_server
+
+
+def serve(kind: str, port: int):
+    if kind == "fast_grpc":
+        FastGRPC(BenchmarkEchoService(), port=port).run()
+        return
+
+    async def run():
+        grpc_server = build_plain_server(port=port)
+        await grpc_server.start()
+        await grpc_server.wait_for_termination()
+
+    asyncio.run(run())
+
+
+async def run_load(call: Callable[[], Awaitable]) -> tuple[float, list[float]]:
+    latencies = []
+    started_at = time.perf_counter()
+    measure_from = started_at + WARMUP
+    finish_at = measure_from + DURATION
+
+    async def worker():
+        while True:
+            start = time.perf_counter()
+            if start >= finish_at:
+                return
+            await call()
+            if start >= measure_from:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return len(latencies) / DURATION, latencies
+
+
+async def run_client(port: int) -> dict[str, tuple[float, list[float]]]:
+    pb2 = BenchmarkEchoService.pb2
+    request = EchoRequest(name="world", count=STREAM_SIZE)
+    message = pb2.EchoRequest(name="world", count=STREAM_SIZE)
+
+    async def consume(responses: AsyncIterator):
+        async for _ in responses:
+            pass
+
+    results = {}
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        await asyncio.wait_for(channel.channel_ready(), timeout=30)
+        stub = BenchmarkEchoService.pb2_grpc.BenchmarkEchoServiceStub(channel)
+        results["unary, stub"] = await run_load(lambda: stub.unary(message))
+        results["stream, stub"] = await run_load(lambda: consume(stub.stream(message)))
+
+    async with BenchmarkEchoService.Client(host="127.0.0.1", port=port) as client:
+        results["unary, client"] = await run_load(lambda: client.unary(request))
+        results["stream, client"] = await run_load(lambda: consume(client.stream(request)))
+
+    return results
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def benchmark_server(kind: str) -> dict[str, tuple[float, list[float]]]:
+    port = get_free_port()
+    # Server process must not inherit gRPC state of benchmark process
+    process = multiprocessing.get_context("spawn").Process(target=serve, args=(kind, port))
+    process.start()
+    try:
+        return asyncio.run(run_client(port=port))
+    finally:
+        process.terminate()
+        process.join()
+
+
+def get_percentile(latencies: list[float], percentile: int) -> float:
+    return statistics.quantiles(latencies, n=100)[percentile - 1]
+
+
+def main():
+    baseline = benchmark_server(kind="grpcio")
+    results = benchmark_server(kind="fast_grpc")
+
+    print(
+        f"{'case':<18}{'grpcio rps':>12}{'rps':>10}{'relative':>10}"
+        f"{'grpcio p99, ms':>16}{'p99, ms':>10}{'relative':>10}"
+    )
+    for case, (rps, latencies) in results.items():
+        # Baseline of client cases is plain grpcio on both sides
+        baseline_rps, baseline_latencies = baseline[case.replace("client", "stub")]
+        baseline_p99 = get_percentile(baseline_latencies, percentile=99) * 1e3
+        p99 = get_percentile(latencies, percentile=99) * 1e3
+        print(
+            f"{case:<18}{baseline_rps:>12.0f}{rps:>10.0f}{rps / baseline_rps:>9.2f}x"
+            f"{baseline_p99:>16.2f}{p99:>10.2f}{p99 / baseline_p99:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark of service startup time.
+
+Each run is a fresh interpreter, so imports are measured cold. Fast-gRPC startup is split into
+import of package, definition of models and service class, materialization (building of `_pb2`
+modules in memory, or compilation with protoc and its cache lookup, codecs and client) and
+building of server. Baseline is plain grpcio server with the same precompiled `_pb2` modules.
+
+Run:
+    python -m benchmarks.startup
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 5
+
+
+def run_fast_grpc(engine: str) -> dict:
+    start = time.perf_counter()
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    import fast_grpc
+    imported = time.perf_counter()
+
+    from benchmarks.codec import BenchmarkCodecService
+    defined = time.perf_counter()
+
+    BenchmarkCodecService.engine = fast_grpc.ProtoEngine(engine)
+    BenchmarkCodecService.materialize()
+    materialized = time.perf_counter()
+
+    async def build():
+        app = fast_grpc.FastGRPC(BenchmarkCodecService(), port=0)
+        await app._build_server().stop(None)  # pylint: disable=protected-access
+
+    asyncio.run(build())
+    built = time.perf_counter()
+
+    return {
+        "timings": {
+            "import": imported - start,
+            "define": defined - imported,
+            "materialize": materialized - defined,
+            "server": built - materialized,
+        },
+    }
+
+
+def run_grpcio(grpc_path: str) -> dict:
+    start = time.perf_counter()
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+    import importlib
+
+    import grpc
+    imported = time.perf_counter()
+
+    sys.path.insert(0, grpc_path)
+    pb2_grpc = importlib.import_module("benchmarkcodecservice_pb2_grpc")
+    defined = time.perf_counter()
+
+    async def build():
+        grpc_server = grpc.aio.server()
+        pb2_grpc.add_BenchmarkCodecServiceServicer_to_server(
+            pb2_grpc.BenchmarkCodecServiceServicer(),
+            grpc_server,
+        )
+        grpc_server.add_insecure_port("[::]:0")
+        await grpc_server.stop(None)
+
+    asyncio.run(build())
+    built = time.perf_counter()
+
+    return {
+        "timings": {
+            "import": imported - start,
+            "define": defined - imported,
+            "materialize": 0.0,
+            "server": built - defined,
+        },
+    }
+
+
+def spawn(*args: str, cache_path: str | pathlib.Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "FAST_GRPC_CACHE_PATH": str(cache_path)},
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def get_best(results: list[dict]) -> dict[str, float]:
+    return {
+        stage: min(result["timings"][stage] for result in results)
+        for stage in results[0]["timings"]
+    }
+
+
+def main():
+    # pylint: disable=import-outside-toplevel
+    from benchmarks.codec import BenchmarkCodecService
+    from fast_grpc import proto
+
+    with tempfile.TemporaryDirectory() as temp_path:
+        grpc_path = proto.compile_proto_cached(
+            content=proto.render_proto(service=BenchmarkCodecService.proto_service),
+            file_prefix="benchmarkcodecservice",
+            cache_path=pathlib.Path(temp_path) / "baseline",
+        )
+        baseline = [spawn("grpcio", str(grpc_path), cache_path=temp_path) for _ in range(RUNS)]
+        descriptor = [spawn("fast_grpc", "descriptor", cache_path=temp_path) for _ in range(RUNS)]
+        protoc_cold = [
+            spawn("fast_grpc", "protoc", cache_path=pathlib.Path(temp_path) / f"cold-{index}")
+            for index in range(RUNS)
+        ]
+        protoc_warm = [spawn("fast_grpc", "protoc", cache_path=temp_path) for _ in range(RUNS)]
+
+    rows = (
+        ("grpcio", get_best(baseline)),
+        ("descriptor", get_best(descriptor)),
+        ("protoc cold", get_best(protoc_cold)),
+        ("protoc warm", get_best(protoc_warm)),
+    )
+    baseline_total = sum(rows[0][1].values())
+    print(
+        f"{'case':<16}{'import, ms':>12}{'define, ms':>12}{'materialize, ms':>17}"
+        f"{'server, ms':>12}{'total, ms':>12}{'relative':>10}"
+    )
+    for case, timings in rows:
+        total = sum(timings.values())
+        print(
+            f"{case:<16}{timings['import'] * 1e3:>12.1f}{timings['define'] * 1e3:>12.1f}"
+            f"{timings['materialize'] * 1e3:>17.1f}{timings['server'] * 1e3:>12.1f}"
+            f"{total * 1e3:>12.1f}{total / baseline_total:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "fast_grpc":
+        print(json.dumps(run_fast_grpc(engine=sys.argv[2])))
+    elif len(sys.argv) > 1 and sys.argv[1] == "grpcio":
+        print(json.dumps(run_grpcio(grpc_path=sys.argv[2])))
+    else:
+        main()
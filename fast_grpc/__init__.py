@@ -1,16 +1,65 @@
-from .app import FastGRPC
-from .enums import StatusCode
+from .app import FastGRPC, ServerConfig
+from .cache import LRUCache, ResponseCache
+from .coalescing import SingleFlight
+from .client import ChannelConfig, ChannelPool, FastGRPCClient, MapResult
+from .deadline import get_time_remaining
+from .enums import ProtoEngine, StatusCode
+from .executor import Executors
+from .limiter import (
+    ConcurrencyLimiter,
+    GradientLimiter,
+    LoadShedder,
+    LoopLagMonitor,
+    VegasLimiter,
+)
+from .method import RawRequest, grpc_method
+from .metrics import MethodMetrics, MetricsRegistry
 from .middleware import FastGRPCMiddleware
-from .service import FastGRPCService, grpc_method
+from .service import FastGRPCService
+from .tracing import OpenTelemetryTracer, Tracer, Tracing
+from .warmup import WarmupReport
 
 __all__ = (
     # app
     "FastGRPC",
+    "ServerConfig",
+    # cache
+    "LRUCache",
+    "ResponseCache",
+    # coalescing
+    "SingleFlight",
+    # client
+    "ChannelConfig",
+    "ChannelPool",
+    "FastGRPCClient",
+    "MapResult",
+    # deadline
+    "get_time_remaining",
     # enums
+    "ProtoEngine",
     "StatusCode",
+    # executor
+    "Executors",
+    # limiter
+    "ConcurrencyLimiter",
+    "GradientLimiter",
+    "LoadShedder",
+    "LoopLagMonitor",
+    "VegasLimiter",
+    # method
+    "RawRequest",
+    "grpc_method",
+    # metrics
+    "MethodMetrics",
+    "MetricsRegistry",
     # middleware
     "FastGRPCMiddleware",
     # service
     "FastGRPCService",
-    "grpc_method",
+    # tracing
+    "OpenTelemetryTracer",
+    "Tracer",
+    "Tracing",
+    # warmup
+    "WarmupReport",
 )
@@ -1,22 +1,220 @@
 import asyncio
+import collections
 import functools
-from typing import Callable
+import http.server
+import inspect
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+from concurrent import futures
+from typing import Any, Callable, Iterable
 
 import grpc
 from grpc.aio import server
 from grpc_interceptor.server import AsyncServerInterceptor
 from grpc_reflection.v1alpha import reflection as grpc_reflection
+from pydantic import BaseModel, ConfigDict
 
+from .executor import Executors
+from .limiter import ConcurrencyLimiter, LoadShedder, LoopLagMonitor
+from .method import serialize_response
+from .metrics import MethodMetrics, MetricsRegistry
 from .middleware import FastGRPCMiddleware
+from .proto import HANDLER_FACTORIES
 from .service import FastGRPCService
+from .tracing import Tracing
+from .warmup import WarmupReport, exercise_codecs, replay_requests
+
+logger = logging.getLogger(__name__)
+
+_WORKER_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+# Default limits of gRPC server, negative ones are unlimited
+_MESSAGE_LENGTH_DEFAULTS = {
+    "grpc.max_receive_message_length": 4 * 1024 * 1024,
+    "grpc.max_send_message_length": -1,
+}
+# Delay in seconds before restart of crashed worker, doubled by each recent crash
+_RESTART_DELAY = 0.1
+_MAX_RESTART_DELAY = 10.0
+
+
+async def _run_hook(hook: Callable[[], Any]):
+    result = hook()
+    if inspect.isawaitable(result):
+        await result
+
+
+class _WorkerRestarts:
+    """Schedule of restarts of crashed workers with delay, that doubles by each crash in window."""
+
+    def __init__(self, max_restarts: int, restart_window: float):
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self._crashes: collections.deque[float] = collections.deque()
+        self._restarts: dict[int, float] = {}
+
+    def crash(self, index: int) -> float | None:
+        """Schedule restart of crashed worker.
+
+        Returns:
+            Delay of restart in seconds, or None when workers crashed too often.
+        """
+
+        now = time.monotonic()
+        while self._crashes and self._crashes[0] <= now - self.restart_window:
+            self._crashes.popleft()
+        self._crashes.append(now)
+        if len(self._crashes) > self.max_restarts:
+            return None
+        delay = min(_RESTART_DELAY * 2 ** (len(self._crashes) - 1), _MAX_RESTART_DELAY)
+        self._restarts[index] = now + delay
+        return delay
+
+    def timeout(self) -> float | None:
+        """Time in seconds until the nearest restart, None without scheduled ones."""
+
+        if not self._restarts:
+            return None
+        return max(min(self._restarts.values()) - time.monotonic(), 0)
+
+    def pop_due(self) -> list[int]:
+        """Indexes of workers, that should be restarted now."""
+
+        now = time.monotonic()
+        indexes = [index for index, time_ in self._restarts.items() if time_ <= now]
+        for index in indexes:
+            del self._restarts[index]
+        return indexes
 
 
 class _FastGRPCInterceptor(AsyncServerInterceptor):
     def __init__(
             self,
-            middlewares: tuple[FastGRPCService | Callable] = (),
+            middlewares: tuple[FastGRPCMiddleware | Callable] = (),
+            tracing: Tracing | None = None,
     ):
-        self._middlewares = middlewares
+        self._middlewares = tuple(middlewares)
+        self._tracing = tracing
+        self._composed_methods: set[str] = set()
+        self._chains: dict[str, Callable] = {}
+        self._load_shedders: dict[str, LoadShedder] = {}
+        self._rejecting_methods: dict[tuple[str, bool], Callable] = {}
+        self._rejecting_handlers: dict[tuple[str, bool], grpc.RpcMethodHandler] = {}
+
+    def compose(
+            self,
+            method_name: str,
+            method: Callable,
+            load_shedder: LoadShedder | None = None,
+            metrics: MethodMetrics | None = None,
+    ) -> Callable:
+        """Wrap method into middlewares, load shedder, server span and metrics once, at service
+        registration.
+
+        Composed methods are skipped by interceptor on requests, because middlewares already
+        applied to them. Requests, that load shedder rejects before decoding, get the same span
+        and metrics.
+        """
+
+        self._composed_methods.add(method_name)
+        streaming = inspect.isasyncgenfunction(method)
+        method = self.compose_middlewares(method=method, streaming=streaming)
+        if load_shedder is not None:
+            self._load_shedders[method_name] = load_shedder
+            for dropping in (False, True):
+                self._rejecting_methods[method_name, dropping] = self._instrument(
+                    method_name=method_name,
+                    method=load_shedder.get_rejecting_method(
+                        streaming=streaming,
+                        dropping=dropping,
+                    ),
+                    streaming=streaming,
+                    metrics=metrics,
+                )
+            method = load_shedder.wrap(method=method, streaming=streaming)
+        return self._instrument(
+            method_name=method_name,
+            method=method,
+            streaming=streaming,
+            metrics=metrics,
+        )
+
+    def get_load_shedder(self, method_name: str) -> LoadShedder | None:
+        return self._load_shedders.get(method_name)
+
+    def compose_middlewares(self, method: Callable, streaming: bool) -> Callable:
+        if not self._middlewares:
+            return method
+        chain = self._apply_middlewares(method=method)
+        if not streaming:
+            return chain
+
+        async def stream_chain(request_or_iterator, context):
+            async for response in await chain(request_or_iterator, context):
+                yield response
+
+        return stream_chain
+
+    async def intercept_service(self, continuation, handler_call_details):
+        method_name = handler_call_details.method
+        if method_name not in self._composed_methods:
+            return await super().intercept_service(continuation, handler_call_details)
+
+        load_shedder = self._load_shedders.get(method_name)
+        if load_shedder is None:
+            return await continuation(handler_call_details)
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+        # Requests over limits are rejected without deserialization of their messages
+        if load_shedder.is_queued_too_long():
+            return self._get_rejecting_handler(
+                method_name=method_name,
+                handler=handler,
+                dropping=True,
+            )
+        if load_shedder.is_available():
+            return handler
+        return self._get_rejecting_handler(method_name=method_name, handler=handler)
+
+    def _instrument(
+            self,
+            method_name: str,
+            method: Callable,
+            streaming: bool,
+            metrics: MethodMetrics | None,
+    ) -> Callable:
+        if self._tracing is not None:
+            method = self._tracing.trace_request(
+                method_name=method_name,
+                method=method,
+                streaming=streaming,
+            )
+        if metrics is not None:
+            method = metrics.instrument(handler=method, server_streaming=streaming)
+        return method
+
+    def _get_rejecting_handler(
+            self,
+            method_name: str,
+            handler: grpc.RpcMethodHandler,
+            dropping: bool = False,
+    ) -> grpc.RpcMethodHandler:
+        key = (method_name, dropping)
+        rejecting_handler = self._rejecting_handlers.get(key)
+        if rejecting_handler is None:
+            behavior_name = (
+                f"{'stream' if handler.request_streaming else 'unary'}_"
+                f"{'stream' if handler.response_streaming else 'unary'}"
+            )
+            rejecting_handler = self._rejecting_handlers[key] = handler._replace(
+                request_deserializer=None,
+                **{behavior_name: self._rejecting_methods[key]},
+            )
+        return rejecting_handler
 
     async def intercept(
             self,
@@ -25,15 +223,97 @@ class _FastGRPCInterceptor(AsyncServerInterceptor):
             context: grpc.ServicerContext,
             method_name: str,
     ):
-        async def wrapper(request, context):
+        chain = self._chains.get(method_name)
+        if chain is None:
+            chain = self._chains[method_name] = self._apply_middlewares(method=method)
+        return await chain(request_or_iterator, context)
+
+    def _apply_middlewares(self, method: Callable) -> Callable:
+        async def wrapper(request_or_iterator, context):
             coroutine_or_iterator = method(request_or_iterator, context)
             if hasattr(coroutine_or_iterator, "__aiter__"):
                 return coroutine_or_iterator
             return await coroutine_or_iterator
 
+        if inspect.iscoroutinefunction(method):
+            wrapper = method
         for middleware in self._middlewares[::-1]:
             wrapper = functools.partial(middleware, wrapper)
-        return await wrapper(request_or_iterator, context)
+        return wrapper
+
+
+class ServerConfig(BaseModel):
+    """Options of gRPC server.
+
+    Args:
+        maximum_concurrent_rpcs (int | None): Maximum number of concurrent RPCs, others are
+            rejected with RESOURCE_EXHAUSTED.
+        max_send_message_length (int | None): Maximum size of outgoing message in bytes.
+        max_receive_message_length (int | None): Maximum size of incoming message in bytes.
+        keepalive_time_ms (int | None): Period of keepalive pings in milliseconds.
+        keepalive_timeout_ms (int | None): Time to wait for keepalive ping ack in milliseconds.
+        keepalive_permit_without_calls (bool | None): Flag for sending keepalive pings without
+            active calls.
+        http2_min_ping_interval_without_data_ms (int | None): Minimum allowed interval between
+            client pings without data in milliseconds.
+        http2_max_pings_without_data (int | None): Maximum number of pings without data.
+        http2_lookahead_bytes (int | None): Initial HTTP/2 flow-control window in bytes.
+        http2_bdp_probe (bool | None): Flag for dynamic flow-control window sizing.
+        http2_max_frame_size (int | None): Maximum HTTP/2 frame size in bytes.
+        compression (grpc.Compression | None): Default compression of responses.
+        migration_thread_pool_workers (int | None): Number of threads in pool for synchronous
+            handlers, default pool of gRPC is used if not set.
+        handler_thread_workers (int | None): Number of threads in pool of methods with
+            `executor="thread"`, default of `ThreadPoolExecutor` if not set.
+        handler_process_workers (int | None): Number of processes in pool of methods with
+            `executor="process"`, number of CPUs if not set.
+        options (tuple[tuple[str, Any], ...]): Any other gRPC server arguments.
+
+    Example:
+        ```python
+        config = ServerConfig(max_receive_message_length=32 * 1024 * 1024)
+        app = FastGRPC(ExampleService(), config=config)
+        ```
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    maximum_concurrent_rpcs: int | None = None
+    max_send_message_length: int | None = None
+    max_receive_message_length: int | None = None
+    keepalive_time_ms: int | None = None
+    keepalive_timeout_ms: int | None = None
+    keepalive_permit_without_calls: bool | None = None
+    http2_min_ping_interval_without_data_ms: int | None = None
+    http2_max_pings_without_data: int | None = None
+    http2_lookahead_bytes: int | None = None
+    http2_bdp_probe: bool | None = None
+    http2_max_frame_size: int | None = None
+    compression: grpc.Compression | None = None
+    migration_thread_pool_workers: int | None = None
+    handler_thread_workers: int | None = None
+    handler_process_workers: int | None = None
+    options: tuple[tuple[str, Any], ...] = ()
+
+    def get_options(self) -> tuple[tuple[str, Any], ...]:
+        options = []
+        for name in (
+                "max_send_message_length",
+                "max_receive_message_length",
+                "keepalive_time_ms",
+                "keepalive_timeout_ms",
+                "keepalive_permit_without_calls",
+                "http2_min_ping_interval_without_data_ms",
+                "http2_max_pings_without_data",
+                "http2_lookahead_bytes",
+                "http2_bdp_probe",
+                "http2_max_frame_size",
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                option_name = name.replace("http2_", "http2.", 1)
+                options.append((f"grpc.{option_name}", int(value)))
+        return (*options, *self.options)
 
 
 class FastGRPC:
@@ -45,6 +325,30 @@ class FastGRPC:
         port (int): Port for listen requests.
         reflection (bool): Flag for enable/disable server gRPC reflection.
         middlewares (tuple[FastGRPCMiddleware | Callable]): Tuple of middlewares (interceptors).
+            They get protobuf request messages, responses of cached or coalescing methods are
+            serialized messages (bytes), that are passed to client as is.
+        config (ServerConfig | None): Options of gRPC server.
+        metrics (MetricsRegistry | bool): Registry of methods metrics, new one if True. Methods
+            are not instrumented if not provided.
+        metrics_port (int | None): Port of local HTTP server with metrics in Prometheus text
+            format, with several workers each one listens port plus its index.
+        tracing (Tracing | None): Tracing of requests and their handling stages, requests are
+            not traced if not provided.
+        limiter (ConcurrencyLimiter | None): Limiter of concurrent requests to all methods,
+            requests over limit are rejected with RESOURCE_EXHAUSTED.
+        max_queue_delay (float | None): Maximum queueing delay of requests in seconds, that is
+            lag of busy event loop. Requests, that waited longer, are dropped with
+            RESOURCE_EXHAUSTED before decoding.
+        on_startup (Iterable[Callable[[], Any]]): Functions or coroutine functions, called
+            before server starts accepting requests, before `on_startup` of services.
+        on_shutdown (Iterable[Callable[[], Any]]): Functions or coroutine functions, called
+            after server is stopped, after `on_shutdown` of services.
+        shutdown_grace (float): Time in seconds, that in-flight requests are given to complete
+            on stop, before they are cancelled.
+        warmup (bool): Flag for warming up codecs and models after startup hooks, before
+            server starts accepting requests.
+        warmup_requests (bool): Flag for handling sample requests of methods in warm-up, opt-in,
+            since they run handlers with their side effects.
 
     Example:
         ```python
@@ -53,7 +357,7 @@ class FastGRPC:
         class ExampleService(FastGRPCService):
             ...
 
-        app = FastGRPC(ExampleService())
+        app = FastGRPC(ExampleService(), on_startup=(database.connect,))
         app.run()
         ```
     """
@@ -65,21 +369,57 @@ class FastGRPC:
             port: int = 50051,
             reflection: bool = False,
             middlewares: tuple[FastGRPCMiddleware | Callable] = (),
+            config: ServerConfig | None = None,
+            metrics: MetricsRegistry | bool = False,
+            metrics_port: int | None = None,
+            tracing: Tracing | None = None,
+            limiter: ConcurrencyLimiter | None = None,
+            max_queue_delay: float | None = None,
+            on_startup: Iterable[Callable[[], Any]] = (),
+            on_shutdown: Iterable[Callable[[], Any]] = (),
+            shutdown_grace: float = 10.0,
+            warmup: bool = True,
+            warmup_requests: bool = False,
     ):
         self._loop = loop
-        self._server = server(
-            interceptors=[_FastGRPCInterceptor(middlewares=middlewares)],
+        self._port = port
+        self._config = config or ServerConfig()
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self.metrics: MetricsRegistry | None = None if metrics is False else metrics
+        self._metrics_port = metrics_port
+        self._tracing = tracing
+        self._limiter = limiter
+        self._max_queue_delay = max_queue_delay
+        # Monitor is created and started only for methods with maximum queueing delay
+        self._lag_monitor: LoopLagMonitor | None = None
+        self._interceptor = _FastGRPCInterceptor(middlewares=middlewares, tracing=tracing)
+        # Pools are created on first request, so forked workers have their own ones
+        self.executors = Executors(
+            thread_workers=self._config.handler_thread_workers,
+            process_workers=self._config.handler_process_workers,
         )
-        self._server.add_insecure_port(f"[::]:{port}")
+        self._on_startup = tuple(on_startup)
+        self._on_shutdown = tuple(on_shutdown)
+        self._shutdown_grace = shutdown_grace
+        self._warmup = warmup
+        self._warmup_requests = warmup_requests
+        self._services: list[FastGRPCService] = []
+        self._is_started = False
+        self._stop_task: asyncio.Task | None = None
+        self._signal_tasks: set[asyncio.Task] = set()
+        self._metrics_server: http.server.ThreadingHTTPServer | None = None
+        # Server is created on run, so worker processes can be forked before gRPC starts
+        self._server: grpc.aio.Server | None = None
+        self._generic_handlers: list[grpc.GenericRpcHandler] = []
+        self._reflection_service_names: list[str] | None = [] if reflection else None
 
+        # Services are materialized lazily, build all of them before registration
+        for service in services:
+            type(service).materialize()
         for service in services:
             self.add_service(service)
 
-        if reflection:
-            service_names = [service.get_service_name() for service in services]
-            service_names.append(grpc_reflection.SERVICE_NAME)
-            grpc_reflection.enable_server_reflection(service_names, self._server)
-
     def add_service(self, service: FastGRPCService):
         """Add service to server.
 
@@ -93,20 +433,158 @@ class FastGRPC:
             ```
         """
 
-        register_function = getattr(service.pb2_grpc, f"add_{service.name}Servicer_to_server")
-        register_function(service, self._server)
+        service_name = service.get_service_name()
+        for grpc_method in type(service).grpc_methods.values():
+            self._check_message_sizes(service_name=service_name, grpc_method=grpc_method)
+        self._services.append(service)
+        method_handlers = {}
+        for grpc_method in type(service).grpc_methods.values():
+            method_metrics = None
+            if self.metrics is not None:
+                method_metrics = self.metrics.get_method(
+                    service_name=service_name,
+                    method_name=grpc_method.name,
+                )
+            handler = self._interceptor.compose(
+                method_name=f"/{service_name}/{grpc_method.name}",
+                method=grpc_method.bind(
+                    service=service,
+                    metrics=method_metrics,
+                    tracing=self._tracing,
+                    executors=self.executors,
+                ),
+                load_shedder=self._get_load_shedder(grpc_method=grpc_method),
+                metrics=method_metrics,
+            )
+            request_codec = service.codecs[grpc_method.request_model.__name__]
+            response_codec = service.codecs[grpc_method.response_model.__name__]
+            handler_factory = HANDLER_FACTORIES[
+                grpc_method.client_streaming,
+                grpc_method.server_streaming,
+            ]
+            request_deserializer = request_codec.message_class.FromString
+            response_serializer = response_codec.message_class.SerializeToString
+            if grpc_method.is_response_serialized:
+                response_serializer = serialize_response
+            if method_metrics is not None:
+                request_deserializer = method_metrics.time_deserializer(request_deserializer)
+                response_serializer = method_metrics.time_serializer(response_serializer)
+            method_handlers[grpc_method.name] = handler_factory(
+                handler,
+                request_deserializer=request_deserializer,
+                response_serializer=response_serializer,
+            )
 
-    def run(self):
-        """Run server."""
+        generic_handler = grpc.method_handlers_generic_handler(service_name, method_handlers)
+        self._generic_handlers.append(generic_handler)
+        if self._reflection_service_names is not None:
+            self._reflection_service_names.append(service_name)
+        if self._server is not None:
+            self._server.add_generic_rpc_handlers((generic_handler,))
+
+    def get_load_shedder(self, service_name: str, method_name: str) -> LoadShedder | None:
+        """Get load shedder of method, with counters of rejected and dropped requests.
+
+        Args:
+            service_name (str): Full name of service.
+            method_name (str): Name of method.
+
+        Returns:
+            Load shedder or None, if method has no limits.
+        """
+
+        return self._interceptor.get_load_shedder(method_name=f"/{service_name}/{method_name}")
+
+    def _check_message_sizes(self, service_name: str, grpc_method):
+        options = {**_MESSAGE_LENGTH_DEFAULTS, **dict(self._config.get_options())}
+        for size_name, option_name in (
+                ("max_request_size", "grpc.max_receive_message_length"),
+                ("max_response_size", "grpc.max_send_message_length"),
+        ):
+            size = getattr(grpc_method, size_name)
+            server_size = options[option_name]
+            if size is not None and 0 <= server_size < size:
+                # Larger messages are rejected by server before limit of method
+                raise ValueError(
+                    f"Method '{service_name}/{grpc_method.name}': {size_name} {size} is larger "
+                    f"than {option_name.removeprefix('grpc.')} {server_size} of server",
+                )
+
+    def _get_load_shedder(self, grpc_method) -> LoadShedder | None:
+        limiters = tuple(
+            limiter
+            for limiter in (self._limiter, grpc_method.limiter)
+            if limiter is not None
+        )
+        max_queue_delay = grpc_method.max_queue_delay
+        if max_queue_delay is None:
+            max_queue_delay = self._max_queue_delay
+        if not limiters and max_queue_delay is None:
+            return None
+        if max_queue_delay is not None and self._lag_monitor is None:
+            self._lag_monitor = LoopLagMonitor()
+        return LoadShedder(
+            limiters=limiters,
+            max_queue_delay=max_queue_delay,
+            lag_monitor=self._lag_monitor,
+        )
+
+    def run(
+            self,
+            workers: int = 1,
+            pin_workers: bool = False,
+            max_restarts: int = 10,
+            restart_window: float = 60.0,
+    ):
+        """Run server until SIGINT or SIGTERM.
+
+        With several workers, server is started in forked processes, that bind the same port
+        with `SO_REUSEPORT`. Main process restarts crashed workers and forwards SIGINT and
+        SIGTERM to them. Each worker runs lifespan hooks on its own. Restart is delayed
+        exponentially by number of recent crashes, and when workers crash too often, main
+        process stops the rest of them and raises `RuntimeError`, so it exits with non-zero
+        code.
+
+        Args:
+            workers (int): Number of worker processes.
+            pin_workers (bool): Flag for pinning each worker to its own CPU (Linux only).
+            max_restarts (int): Number of restarts of crashed workers in `restart_window`,
+                more crashes stop the server.
+            restart_window (float): Time in seconds, in which crashes are counted.
+
+        Example:
+            ```python
+            app = FastGRPC(ExampleService())
+            app.run(workers=4)
+            ```
+        """
+
+        if workers < 1:
+            raise ValueError(f"Number of workers must be positive, not {workers}")
+        if workers > 1:
+            self._run_workers(
+                workers=workers,
+                pin_workers=pin_workers,
+                max_restarts=max_restarts,
+                restart_window=restart_window,
+            )
+            return
 
         try:
-            self._loop.run_until_complete(self.run_async())
+            self._loop.run_until_complete(self.run_async(handle_signals=True))
         finally:
             self._loop.close()
 
-    async def run_async(self):
-        """Run server.
-        
+    async def run_async(self, handle_signals: bool = False):
+        """Run server until it is stopped or running task is cancelled.
+
+        Startup hooks of app and services are called before server starts, shutdown ones after
+        it is stopped and in-flight requests are drained.
+
+        Args:
+            handle_signals (bool): Flag for stopping server on SIGINT and SIGTERM, only in main
+                thread. Second signal cancels in-flight requests without waiting for them.
+
         Example:
             ```python
             app = FastGRPC()
@@ -114,5 +592,310 @@ class FastGRPC:
             ```
         """
 
-        await self._server.start()
-        await self._server.wait_for_termination()
+        await self._serve(handle_signals=handle_signals)
+
+    async def start(self):
+        """Call startup hooks, warm up and start accepting requests.
+
+        Server, started by this method, must be stopped by `stop`.
+
+        Example:
+            ```python
+            await app.start()
+            try:
+                ...
+            finally:
+                await app.stop()
+            ```
+        """
+
+        if self._server is None:
+            self._server = self._build_server()
+        self._stop_task = None
+        await self._startup()
+        try:
+            if self._warmup:
+                await self.warm_up()
+            if self.metrics is not None and self._metrics_port is not None:
+                self._metrics_server = self.metrics.serve(port=self._metrics_port)
+            if self._lag_monitor is not None:
+                self._lag_monitor.start()
+            await self._server.start()
+        except BaseException:
+            await self._shutdown()
+            raise
+        self._is_started = True
+
+    async def stop(self, grace: float | None = None):
+        """Stop server gracefully.
+
+        New requests are rejected at once, in-flight ones are given grace period to complete
+        and cancelled after it. Shutdown hooks are called after that. Repeated call waits for
+        the same stop, with zero grace it cancels in-flight requests at once.
+
+        Args:
+            grace (float | None): Grace period in seconds, `shutdown_grace` of app if not set.
+                In-flight requests are cancelled at once if zero.
+        """
+
+        if self._stop_task is None:
+            if not self._is_started:
+                return
+            self._stop_task = asyncio.ensure_future(self._stop(grace=grace))
+        elif grace == 0:
+            await self._server.stop(0)
+        # Stop is completed, even if waiting for it is cancelled
+        await asyncio.shield(self._stop_task)
+
+    async def warm_up(self) -> WarmupReport:
+        """Exercise lazily built parts of services before the first requests.
+
+        Round trip of empty message is run through codec of each message, so protobuf classes
+        and pydantic validators are built. With `warmup_requests` of app, sample requests of
+        methods are handled in process by the same pipeline, as requests from clients, except
+        metrics and tracing. Failed sample requests are logged and do not stop warm-up.
+
+        Returns:
+            Timings of warm-up.
+        """
+
+        start = time.perf_counter()
+        report = WarmupReport()
+        for service in self._services:
+            service_name = service.get_service_name()
+            report.codecs[service_name] = exercise_codecs(codecs=service.codecs.values())
+            if not self._warmup_requests:
+                continue
+            for grpc_method in type(service).grpc_methods.values():
+                if not grpc_method.warmup_requests:
+                    continue
+                method_name = f"/{service_name}/{grpc_method.name}"
+                handler = grpc_method.bind(service=service, executors=self.executors)
+                handler = self._interceptor.compose_middlewares(
+                    method=handler,
+                    streaming=grpc_method.server_streaming,
+                )
+                request_codec = service.codecs[grpc_method.request_model.__name__]
+                try:
+                    report.requests[method_name] = await replay_requests(
+                        handler=handler,
+                        messages=[
+                            request_codec.encode(request)
+                            for request in grpc_method.warmup_requests
+                        ],
+                        client_streaming=grpc_method.client_streaming,
+                        server_streaming=grpc_method.server_streaming,
+                    )
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.warning("Warm-up request of %s failed", method_name, exc_info=True)
+                    report.failed.append(method_name)
+        report.duration = time.perf_counter() - start
+        logger.info(
+            "Warm-up finished in %.3f s: codecs %.3f s, sample requests of %s methods %.3f s",
+            report.duration,
+            sum(report.codecs.values()),
+            len(report.requests),
+            sum(report.requests.values()),
+        )
+        return report
+
+    def _handle_signal(self, signum: signal.Signals):
+        if self._stop_task is None:
+            self._stop_task = asyncio.ensure_future(self._stop(grace=None))
+            return
+        logger.warning("Received %s again, cancelling in-flight requests", signum.name)
+        task = asyncio.ensure_future(self._server.stop(0))
+        self._signal_tasks.add(task)
+        task.add_done_callback(self._signal_tasks.discard)
+
+    async def _serve(
+            self,
+            on_start: Callable[[], Any] | None = None,
+            handle_signals: bool = False,
+    ):
+        await self.start()
+        loop = asyncio.get_running_loop()
+        handled_signals = []
+        try:
+            # Stopping of not started server does nothing, so signals are handled after start
+            if handle_signals:
+                for signum in _WORKER_SIGNALS:
+                    loop.add_signal_handler(signum, self._handle_signal, signum)
+                    handled_signals.append(signum)
+            if on_start is not None:
+                on_start()
+            # Cancelling of waiting must not cancel shutdown future of server, stop awaits it
+            await asyncio.shield(self._server.wait_for_termination())
+        finally:
+            for signum in handled_signals:
+                loop.remove_signal_handler(signum)
+            # Server is drained before shutdown hooks, also when serving is cancelled
+            await self.stop()
+
+    async def _stop(self, grace: float | None):
+        if grace is None:
+            grace = self._shutdown_grace
+        logger.info("Stopping server, waiting for in-flight requests up to %s seconds", grace)
+        try:
+            await self._server.stop(grace)
+        finally:
+            self._is_started = False
+            await self._shutdown()
+
+    async def _startup(self):
+        for hook in self._on_startup:
+            await _run_hook(hook=hook)
+        for service in self._services:
+            await _run_hook(hook=service.on_startup)
+
+    async def _shutdown(self):
+        try:
+            await asyncio.to_thread(self.executors.shutdown)
+            # Services are closed before app, since they may use its resources
+            for service in reversed(self._services):
+                await _run_hook(hook=service.on_shutdown)
+            for hook in self._on_shutdown:
+                await _run_hook(hook=hook)
+        finally:
+            if self._lag_monitor is not None:
+                self._lag_monitor.stop()
+            if self._metrics_server is not None:
+                self._metrics_server.shutdown()
+                self._metrics_server.server_close()
+                self._metrics_server = None
+
+    def _build_server(self, options: tuple[tuple[str, Any], ...] = ()) -> grpc.aio.Server:
+        migration_thread_pool = None
+        if self._config.migration_thread_pool_workers is not None:
+            migration_thread_pool = futures.ThreadPoolExecutor(
+                max_workers=self._config.migration_thread_pool_workers,
+            )
+        grpc_server = server(
+            migration_thread_pool=migration_thread_pool,
+            interceptors=[self._interceptor],
+            options=(*self._config.get_options(), *options),
+            maximum_concurrent_rpcs=self._config.maximum_concurrent_rpcs,
+            compression=self._config.compression,
+        )
+        grpc_server.add_insecure_port(f"[::]:{self._port}")
+        grpc_server.add_generic_rpc_handlers(tuple(self._generic_handlers))
+        if self._reflection_service_names is not None:
+            service_names = [*self._reflection_service_names, grpc_reflection.SERVICE_NAME]
+            grpc_reflection.enable_server_reflection(service_names, grpc_server)
+        return grpc_server
+
+    def _run_workers(
+            self,
+            workers: int,
+            pin_workers: bool,
+            max_restarts: int,
+            restart_window: float,
+    ):
+        context = multiprocessing.get_context("fork")
+        cpus = sorted(os.sched_getaffinity(0)) if pin_workers else None
+        processes: dict[int, multiprocessing.Process] = {}
+        restarts = _WorkerRestarts(max_restarts=max_restarts, restart_window=restart_window)
+        stopping = failed = False
+        # Signal handler wakes main loop, that may wait for delayed restart without workers
+        wakeup_reader, wakeup_writer = os.pipe()
+        os.set_blocking(wakeup_writer, False)
+
+        def start_worker(index: int):
+            cpu = cpus[index % len(cpus)] if cpus else None
+            process = context.Process(
+                target=self._run_worker,
+                kwargs={"index": index, "cpu": cpu},
+                name=f"fast-grpc-worker-{index}",
+            )
+            # Signals are blocked until worker sets its own handlers, and pending ones are
+            # forwarded only after worker is registered
+            signal.pthread_sigmask(signal.SIG_BLOCK, _WORKER_SIGNALS)
+            try:
+                process.start()
+                processes[index] = process
+            finally:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _WORKER_SIGNALS)
+
+        def forward_signal(signum: int, _frame):
+            nonlocal stopping
+            stopping = True
+            for process in processes.values():
+                if process.is_alive():
+                    os.kill(process.pid, signum)
+            try:
+                os.write(wakeup_writer, b"\0")
+            except BlockingIOError:
+                pass
+
+        previous_handlers = {
+            signum: signal.signal(signum, forward_signal)
+            for signum in _WORKER_SIGNALS
+        }
+        try:
+            for index in range(workers):
+                start_worker(index)
+            while not stopping:
+                multiprocessing.connection.wait(
+                    [wakeup_reader, *(process.sentinel for process in processes.values())],
+                    timeout=restarts.timeout(),
+                )
+                if stopping:
+                    break
+                for index, process in tuple(processes.items()):
+                    if process.exitcode is None:
+                        continue
+                    pid, exitcode = process.pid, process.exitcode
+                    del processes[index]
+                    process.close()
+                    delay = restarts.crash(index=index)
+                    if delay is None:
+                        logger.error(
+                            "Worker %s exited with code %s, more than %s workers exited in %s "
+                            "seconds, stopping",
+                            pid,
+                            exitcode,
+                            max_restarts,
+                            restart_window,
+                        )
+                        failed = True
+                        forward_signal(signal.SIGTERM, None)
+                        break
+                    logger.warning(
+                        "Worker %s exited with code %s, restarting in %.1f seconds",
+                        pid,
+                        exitcode,
+                        delay,
+                    )
+                if not stopping:
+                    for index in restarts.pop_due():
+                        start_worker(index)
+        finally:
+            for process in processes.values():
+                process.join()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            os.close(wakeup_reader)
+            os.close(wakeup_writer)
+        if failed:
+            raise RuntimeError(
+                f"Workers exited more than {max_restarts} times in {restart_window} seconds",
+            )
+
+    def _run_worker(self, index: int, cpu: int | None = None):
+        if self._metrics_port is not None:
+            # Each worker has its own metrics
+            self._metrics_port += index
+        for signum in _WORKER_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        if cpu is not None:
+            os.sched_setaffinity(0, {cpu})
+        # Forked process must not reuse event loop of parent one
+        asyncio.run(self._serve_worker())
+
+    async def _serve_worker(self):
+        self._server = self._build_server(options=(("grpc.so_reuseport", 1),))
+        # Signals are blocked since fork, pending ones are delivered after handlers are set
+        await self._serve(
+            on_start=functools.partial(signal.pthread_sigmask, signal.SIG_UNBLOCK, _WORKER_SIGNALS),
+            handle_signals=True,
+        )
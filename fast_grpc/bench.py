@@ -0,0 +1,459 @@
+"""Load generator for Fast-gRPC services.
+
+Service is imported from `module:Class` or built from `.proto` file, requests are read from JSON
+or JSONL file or generated randomly from request model. With fixed RPS (open loop) calls are
+started on schedule regardless of responses and latency is measured from scheduled time, so
+queueing on server is not hidden by coordinated omission. With fixed concurrency (closed loop)
+each worker starts next call after response.
+
+Run:
+    python -m fast_grpc.bench examples.greeter:Greeter --method say_hello --rps 1000
+    python -m fast_grpc.bench service.proto --method get_item --requests items.jsonl -c 32
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import decimal
+import enum
+import importlib
+import itertools
+import json
+import pathlib
+import random
+import string
+import sys
+import types
+import uuid
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import grpc
+from pydantic import BaseModel, ValidationError
+
+from .service import FastGRPCService
+
+PERCENTILES = (50, 90, 99, 99.9)
+_MAX_DEPTH = 4
+
+
+class LoadReport(BaseModel):
+    """Result of load test.
+
+    Args:
+        method (str): Name of called method.
+        mode (str): Description of load mode.
+        duration (float): Duration of measurement in seconds.
+        requests (int): Number of measured calls.
+        throughput (float): Number of measured calls per second.
+        latency (dict[str, float]): Percentiles, mean and maximum of latency in seconds.
+        codes (dict[str, int]): Number of calls by status code or by type of client error.
+    """
+
+    method: str
+    mode: str
+    duration: float
+    requests: int
+    throughput: float
+    latency: dict[str, float]
+    codes: dict[str, int]
+
+    def render(self) -> str:
+        lines = [
+            f"Method:     {self.method}",
+            f"Mode:       {self.mode}",
+            f"Requests:   {self.requests} in {self.duration:.1f}s, {self.throughput:.1f}/s",
+            "Latency:",
+        ]
+        lines.extend(f"  {name:<6}{value * 1e3:>10.2f} ms" for name, value in self.latency.items())
+        lines.append("Status codes:")
+        lines.extend(f"  {code:<20}{count:>8}" for code, count in self.codes.items())
+        return "\n".join(lines)
+
+
+class _Recorder:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.codes: collections.Counter[str] = collections.Counter()
+
+    async def record(
+            self,
+            call: Awaitable,
+            started_at: float,
+            measured: bool,
+            timeout: float | None,
+    ):
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(call, timeout=timeout)
+            code = grpc.StatusCode.OK.name
+        except grpc.aio.AioRpcError as error:
+            code = error.code().name
+        except asyncio.TimeoutError:
+            code = grpc.StatusCode.DEADLINE_EXCEEDED.name
+        except asyncio.CancelledError:
+            # Only cancellation of single call is recorded, load run itself is stopped
+            if asyncio.current_task().cancelling():
+                raise
+            code = grpc.StatusCode.CANCELLED.name
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # Errors of client, e.g. validation of response, are counted by their type
+            code = type(error).__name__
+        if measured:
+            self.latencies.append(loop.time() - started_at)
+            self.codes[code] += 1
+
+    def get_report(self, method: str, mode: str, duration: float) -> LoadReport:
+        latencies = sorted(self.latencies)
+        latency = {}
+        if latencies:
+            for percentile in PERCENTILES:
+                latency[f"p{percentile:g}"] = get_percentile(latencies, percentile=percentile)
+            latency["mean"] = sum(latencies) / len(latencies)
+            latency["max"] = latencies[-1]
+        return LoadReport(
+            method=method,
+            mode=mode,
+            duration=duration,
+            requests=len(latencies),
+            throughput=len(latencies) / duration,
+            latency=latency,
+            codes=dict(self.codes.most_common()),
+        )
+
+
+def get_percentile(latencies: list[float], percentile: float) -> float:
+    """Get percentile of sorted values with nearest-rank method."""
+
+    index = max(int(len(latencies) * percentile / 100 + 0.5) - 1, 0)
+    return latencies[min(index, len(latencies) - 1)]
+
+
+def load_service(target: str) -> type[FastGRPCService]:
+    """Import service class from `module:Class` or build it from `.proto` file.
+
+    Args:
+        target (str): Import path of service class or path to proto file.
+
+    Returns:
+        Service class.
+    """
+
+    if target.endswith(".proto"):
+        return FastGRPCService.from_proto(proto_file=target)
+
+    module_name, _, class_name = target.partition(":")
+    if not class_name:
+        raise ValueError(f"Service must be 'module:Class' or path to proto file, not '{target}'")
+    # Services are usually imported from current project
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+    try:
+        service = getattr(importlib.import_module(module_name), class_name)
+    finally:
+        sys.path.pop(0)
+    if not (isinstance(service, type) and issubclass(service, FastGRPCService)):
+        raise ValueError(f"'{target}' is not subclass of FastGRPCService")
+    return service
+
+
+def load_requests(path: str | pathlib.Path, model: type[BaseModel]) -> list[BaseModel]:
+    """Read requests from JSON file (object or list of them) or JSONL file.
+
+    Args:
+        path (str | pathlib.Path): Path to file.
+        model (type[BaseModel]): Model of requests.
+
+    Returns:
+        List of requests.
+    """
+
+    path = pathlib.Path(path)
+    content = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        items = [json.loads(line) for line in content.splitlines() if line.strip()]
+    else:
+        items = json.loads(content)
+        if not isinstance(items, list):
+            items = [items]
+    if not items:
+        raise ValueError(f"File {str(path)} has no requests")
+    return [model.model_validate(item) for item in items]
+
+
+def generate_request(model: type[BaseModel], rng: random.Random) -> BaseModel:
+    """Generate request with random values of model fields.
+
+    Args:
+        model (type[BaseModel]): Model of request.
+        rng (random.Random): Random generator.
+
+    Returns:
+        Request.
+    """
+
+    try:
+        return model.model_validate(_generate_model_data(model=model, rng=rng, depth=0))
+    except ValidationError as error:
+        raise ValueError(
+            f"Random request of {model.__name__} is not valid, use file with requests:\n{error}",
+        ) from error
+
+
+def _generate_model_data(model: type[BaseModel], rng: random.Random, depth: int) -> dict:
+    data = {}
+    for name, field in model.model_fields.items():
+        if depth >= _MAX_DEPTH and not field.is_required():
+            continue
+        value = _generate_value(annotation=field.annotation, rng=rng, depth=depth)
+        # Not supported types are left to defaults
+        if value is not None:
+            data[field.alias or name] = value
+    return data
+
+
+def _generate_value(annotation: Any, rng: random.Random, depth: int) -> Any:
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return _generate_value(annotation=args[0], rng=rng, depth=depth)
+    if origin in (Union, types.UnionType):
+        options = [arg for arg in args if arg is not types.NoneType]
+        return _generate_value(annotation=rng.choice(options), rng=rng, depth=depth)
+    if origin is Literal:
+        return rng.choice(args)
+    if origin in (list, tuple, set, frozenset) or _is_subclass(origin, (list, tuple, set)):
+        item = args[0] if args else str
+        size = 0 if depth >= _MAX_DEPTH else rng.randint(1, 3)
+        return [_generate_value(annotation=item, rng=rng, depth=depth + 1) for _ in range(size)]
+    if origin is dict or _is_subclass(origin, dict):
+        key, value = args if args else (str, str)
+        size = 0 if depth >= _MAX_DEPTH else rng.randint(1, 3)
+        return {
+            _generate_value(annotation=key, rng=rng, depth=depth + 1):
+                _generate_value(annotation=value, rng=rng, depth=depth + 1)
+            for _ in range(size)
+        }
+    if not isinstance(annotation, type):
+        return None
+
+    if issubclass(annotation, BaseModel):
+        return _generate_model_data(model=annotation, rng=rng, depth=depth + 1)
+    if issubclass(annotation, enum.Enum):
+        return rng.choice(list(annotation)).value
+    for types_, generate in _GENERATORS:
+        if issubclass(annotation, types_):
+            return generate(rng)
+    return None
+
+
+def _is_subclass(value: Any, classes: tuple[type, ...]) -> bool:
+    return isinstance(value, type) and issubclass(value, classes)
+
+
+def _generate_string(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_letters, k=rng.randint(1, 16)))
+
+
+_GENERATORS: tuple[tuple[type | tuple[type, ...], Callable[[random.Random], Any]], ...] = (
+    # Bool is checked before int, because it is subclass of int
+    (bool, lambda rng: rng.random() < 0.5),
+    (int, lambda rng: rng.randint(0, 1000)),
+    (float, lambda rng: rng.uniform(0, 1000)),
+    (decimal.Decimal, lambda rng: decimal.Decimal(rng.randint(0, 100000)) / 100),
+    (str, _generate_string),
+    (bytes, lambda rng: rng.randbytes(rng.randint(1, 16))),
+    (datetime.datetime, lambda rng: datetime.datetime.fromtimestamp(
+        rng.randint(0, 2 ** 31), tz=datetime.timezone.utc,
+    )),
+    (datetime.date, lambda rng: datetime.date.fromordinal(rng.randint(700000, 750000))),
+    (datetime.timedelta, lambda rng: datetime.timedelta(seconds=rng.randint(0, 86400))),
+    (uuid.UUID, lambda rng: uuid.UUID(int=rng.getrandbits(128))),
+)
+
+
+async def run_load(
+        client,
+        method_name: str,
+        requests: list[BaseModel],
+        duration: float,
+        rps: float | None = None,
+        concurrency: int = 10,
+        warmup: float = 0.0,
+        timeout: float | None = None,
+        client_streaming: bool = False,
+        server_streaming: bool = False,
+) -> LoadReport:
+    """Call method of client for duration with fixed RPS or fixed concurrency.
+
+    Args:
+        client (FastGRPCClient): Client of service.
+        method_name (str): Name of method.
+        requests (list[BaseModel]): Requests, used in turn.
+        duration (float): Duration of measurement in seconds.
+        rps (float | None): Rate of calls for open loop, fixed concurrency is used if not set.
+        concurrency (int): Number of concurrent calls for closed loop.
+        warmup (float): Duration of calls before measurement in seconds.
+        timeout (float | None): Timeout of call in seconds.
+        client_streaming (bool): Flag of method with stream of requests, each call sends one.
+        server_streaming (bool): Flag of method with stream of responses, call lasts until all
+            of them are received.
+
+    Returns:
+        Report of load test.
+    """
+
+    method = getattr(client, method_name)
+    requests_iterator = itertools.cycle(requests)
+
+    async def send_stream(request: BaseModel) -> AsyncIterator[BaseModel]:
+        yield request
+
+    async def call():
+        request = next(requests_iterator)
+        response = method(send_stream(request) if client_streaming else request)
+        if server_streaming:
+            async for _ in response:
+                pass
+        else:
+            await response
+
+    recorder = _Recorder()
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    measured_at = started_at + warmup
+    finished_at = measured_at + duration
+
+    if rps is not None:
+        mode = f"open loop, {rps:g} rps"
+        tasks = set()
+        for index in itertools.count():
+            scheduled_at = started_at + index / rps
+            if scheduled_at >= finished_at:
+                break
+            delay = scheduled_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Latency is counted from scheduled time, delays of generator are included
+            task = asyncio.ensure_future(recorder.record(
+                call=call(),
+                started_at=scheduled_at,
+                measured=scheduled_at >= measured_at,
+                timeout=timeout,
+            ))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    else:
+        mode = f"closed loop, {concurrency} concurrent calls"
+
+        async def worker():
+            while (call_started_at := loop.time()) < finished_at:
+                await recorder.record(
+                    call=call(),
+                    started_at=call_started_at,
+                    measured=call_started_at >= measured_at,
+                    timeout=timeout,
+                )
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return recorder.get_report(method=method_name, mode=mode, duration=duration)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m fast_grpc.bench",
+        description="Load generator for Fast-gRPC services.",
+    )
+    parser.add_argument("service", help="service class as 'module:Class' or path to proto file")
+    parser.add_argument("--method", help="name of method, required for several methods")
+    parser.add_argument("--host", default="127.0.0.1", help="server host")
+    parser.add_argument("--port", type=int, default=50051, help="server port")
+    parser.add_argument("--requests", help="JSON or JSONL file with requests")
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=100,
+        help="number of random requests, if file is not set",
+    )
+    parser.add_argument("--seed", type=int, help="seed of random requests")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, help="fixed rate of calls (open loop)")
+    load.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=10,
+        help="fixed number of concurrent calls (closed loop)",
+    )
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before measurement")
+    parser.add_argument("--timeout", type=float, help="timeout of call in seconds")
+    parser.add_argument("--channels", type=int, default=1, help="number of client channels")
+    parser.add_argument("--json", action="store_true", help="print report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    service = load_service(target=args.service)
+    grpc_methods = service.grpc_methods
+    if args.method is None:
+        if len(grpc_methods) != 1:
+            raise SystemExit(f"Set --method, one of: {', '.join(grpc_methods)}")
+        args.method = next(iter(grpc_methods))
+    method_name, grpc_method = next(
+        (
+            (name, grpc_method)
+            for name, grpc_method in grpc_methods.items()
+            if args.method in (name, grpc_method.name, *grpc_method.aliases)
+        ),
+        (None, None),
+    )
+    if grpc_method is None:
+        raise SystemExit(f"Unknown method '{args.method}', one of: {', '.join(grpc_methods)}")
+
+    if args.requests is not None:
+        requests = load_requests(path=args.requests, model=grpc_method.request_model)
+    else:
+        rng = random.Random(args.seed)
+        requests = [
+            generate_request(model=grpc_method.request_model, rng=rng)
+            for _ in range(args.samples)
+        ]
+
+    async def run() -> LoadReport:
+        async with service.Client(
+                host=args.host,
+                port=args.port,
+                channels=args.channels,
+        ) as client:
+            return await run_load(
+                client=client,
+                method_name=method_name,
+                requests=requests,
+                duration=args.duration,
+                rps=args.rps,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+                timeout=args.timeout,
+                client_streaming=grpc_method.client_streaming,
+                server_streaming=grpc_method.server_streaming,
+            )
+
+    report = asyncio.run(run())
+    print(report.model_dump_json(indent=2) if args.json else report.render())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import abc
+import collections
+import sys
+import time
+from typing import Callable, Hashable
+
+
+class ResponseCache(abc.ABC):
+    """Base class of response caches for gRPC methods.
+
+    Cache stores serialized response messages by keys, built from method name, serialized request
+    message and selected request metadata.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Get cached response or None, counting hits and misses."""
+
+        value = self._get(key=key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    @abc.abstractmethod
+    def set(self, key: Hashable, value: bytes):
+        """Store serialized response by key."""
+
+    @abc.abstractmethod
+    def invalidate(self, match: Callable[[Hashable], bool] | None = None):
+        """Remove cached responses.
+
+        Args:
+            match (Callable[[Hashable], bool] | None): Predicate for keys to remove, all responses
+                are removed if not provided.
+        """
+
+    @abc.abstractmethod
+    def _get(self, key: Hashable) -> bytes | None:
+        """Get cached response or None, without counting."""
+
+
+class LRUCache(ResponseCache):
+    """In-memory response cache with LRU eviction, TTL and memory cap.
+
+    Args:
+        max_size (int | None): Maximum number of responses.
+        ttl (float | None): Time to live of response in seconds.
+        max_memory (int | None): Maximum size of keys and responses in bytes.
+
+    Example:
+        ```python
+        class ExampleService(FastGRPCService):
+            @grpc_method(cache=LRUCache(max_size=10_000, ttl=60))
+            async def get_item(self, request: ItemRequest) -> ItemResponse:
+                ...
+        ```
+    """
+
+    def __init__(
+            self,
+            max_size: int | None = 1024,
+            ttl: float | None = None,
+            max_memory: int | None = None,
+    ):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self.memory = 0
+        self._items: collections.OrderedDict[Hashable, tuple[bytes, float | None, int]] = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def set(self, key: Hashable, value: bytes):
+        size = _get_size(key) + len(value)
+        if self.max_memory is not None and size > self.max_memory:
+            return
+
+        self._pop(key=key)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._items[key] = (value, expires_at, size)
+        self.memory += size
+        while (
+                (self.max_size is not None and len(self._items) > self.max_size) or
+                (self.max_memory is not None and self.memory > self.max_memory)
+        ):
+            self._pop(key=next(iter(self._items)))
+
+    def invalidate(self, match: Callable[[Hashable], bool] | None = None):
+        if match is None:
+            self._items.clear()
+            self.memory = 0
+            return
+
+        for key in [key for key in self._items if match(key)]:
+            self._pop(key=key)
+
+    def _get(self, key: Hashable) -> bytes | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        value, expires_at, _ = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._pop(key=key)
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def _pop(self, key: Hashable):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.memory -= item[2]
+
+
+def _get_size(key: Hashable) -> int:
+    if isinstance(key, tuple):
+        return sum(_get_size(part) for part in key)
+    if isinstance(key, bytes):
+        return len(key)
+    return sys.getsizeof(key)
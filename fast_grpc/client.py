@@ -0,0 +1,465 @@
+import asyncio
+import functools
+import itertools
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, NamedTuple, Self
+
+import grpc
+from pydantic import BaseModel, ConfigDict
+
+from .codec import MessageCodec
+from .deadline import get_timeout
+from .method import GRPCMethod
+from .tracing import Tracing
+
+
+class ChannelConfig(BaseModel):
+    """Options of client channels.
+
+    Args:
+        max_send_message_length (int | None): Maximum size of outgoing message in bytes.
+        max_receive_message_length (int | None): Maximum size of incoming message in bytes.
+        keepalive_time_ms (int | None): Period of keepalive pings in milliseconds.
+        keepalive_timeout_ms (int | None): Time to wait for keepalive ping ack in milliseconds.
+        keepalive_permit_without_calls (bool | None): Flag for sending keepalive pings without
+            active calls.
+        compression (grpc.Compression | None): Default compression of channel.
+        options (tuple[tuple[str, Any], ...]): Any other gRPC channel arguments.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    max_send_message_length: int | None = None
+    max_receive_message_length: int | None = None
+    keepalive_time_ms: int | None = None
+    keepalive_timeout_ms: int | None = None
+    keepalive_permit_without_calls: bool | None = None
+    compression: grpc.Compression | None = None
+    options: tuple[tuple[str, Any], ...] = ()
+
+    def get_options(self) -> tuple[tuple[str, Any], ...]:
+        options = []
+        for name in (
+                "max_send_message_length",
+                "max_receive_message_length",
+                "keepalive_time_ms",
+                "keepalive_timeout_ms",
+                "keepalive_permit_without_calls",
+        ):
+            value = getattr(self, name)
+            if value is not None:
+                options.append((f"grpc.{name}", int(value)))
+        return (*options, *self.options)
+
+
+class ChannelPool:
+    """Set of channels to one target, used by clients round-robin.
+
+    Each channel opens its own HTTP/2 connection, so several of them are not limited by stream
+    concurrency of single one. Shared pools are reference counted and closed, when last client
+    is closed.
+
+    Args:
+        target (str): Server address.
+        config (ChannelConfig | None): Options of channels.
+        size (int): Number of channels.
+        shared (bool): Flag for pool, that is registered for reuse by `acquire`.
+    """
+
+    _shared: dict[tuple[str, ChannelConfig, int], "ChannelPool"] = {}
+
+    def __init__(
+            self,
+            target: str,
+            config: ChannelConfig | None = None,
+            size: int = 1,
+            shared: bool = False,
+    ):
+        if size < 1:
+            raise ValueError(f"Size of channel pool must be positive, not {size}")
+
+        self.target = target
+        self.config = config or ChannelConfig()
+        # Channels with equal options share subchannels, local pools give own connections
+        options = (*self.config.get_options(), ("grpc.use_local_subchannel_pool", 1))
+        self.channels = tuple(
+            grpc.aio.insecure_channel(
+                target,
+                options=options,
+                compression=self.config.compression,
+            )
+            for _ in range(size)
+        )
+        self._stubs: dict[type, tuple] = {}
+        self._references = 0
+        self._key = (target, self.config, size) if shared else None
+        if self._key is not None:
+            self._shared[self._key] = self
+
+    @classmethod
+    def acquire(
+            cls,
+            target: str,
+            config: ChannelConfig | None = None,
+            size: int = 1,
+            shared: bool = False,
+    ) -> Self:
+        """Get channel pool for client.
+
+        Args:
+            target (str): Server address.
+            config (ChannelConfig | None): Options of channels.
+            size (int): Number of channels.
+            shared (bool): Flag for reusing pool with the same target and options.
+
+        Returns:
+            New or shared channel pool.
+        """
+
+        config = config or ChannelConfig()
+        key = (target, config, size)
+        pool = cls._shared.get(key) if shared else None
+        if pool is None:
+            pool = cls(target=target, config=config, size=size, shared=shared)
+        pool._references += 1
+        return pool
+
+    def get_stubs(self, stub_class: type) -> tuple:
+        stubs = self._stubs.get(stub_class)
+        if stubs is None:
+            stubs = self._stubs[stub_class] = tuple(
+                stub_class(channel) for channel in self.channels
+            )
+        return stubs
+
+    async def release(self):
+        """Release pool by client, channels are closed when pool is not used anymore."""
+
+        if self._references <= 0:
+            return
+        self._references -= 1
+        if self._references > 0:
+            return
+
+        if self._key is not None and self._shared.get(self._key) is self:
+            del self._shared[self._key]
+        for channel in self.channels:
+            await channel.close()
+
+
+class MapResult(NamedTuple):
+    """Result of single call, made by `map` of client method."""
+
+    index: int
+    request: Any
+    response: Any = None
+    error: Exception | None = None
+
+
+class ClientMethod:
+    """Method of generated client, that also provides `map` for concurrent calls.
+
+    Bound method is cached in client instance on first access.
+    """
+
+    def __init__(self, function: Callable, streaming: bool = False):
+        self._function = function
+        self._streaming = streaming
+        self._name = function.__name__
+        functools.update_wrapper(self, function)
+
+    def __set_name__(self, owner: type, name: str):
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self._function
+        bound_method = BoundClientMethod(client=instance, method=self)
+        instance.__dict__[self._name] = bound_method
+        return bound_method
+
+
+class BoundClientMethod:
+    """Method of generated client, bound to client instance."""
+
+    def __init__(self, client: "FastGRPCClient", method: ClientMethod):
+        self._client = client
+        self._method = method
+        self._call = method._function.__get__(client)  # pylint: disable=protected-access
+        self.__name__ = method.__name__
+        self.__doc__ = method.__doc__
+
+    def __call__(self, request: Any, timeout: float | None = None) -> Any:
+        return self._call(request, timeout=timeout)
+
+    async def map(
+            self,
+            requests: Iterable | AsyncIterable,
+            concurrency: int = 10,
+            ordered: bool = False,
+            timeout: float | None = None,
+    ) -> AsyncIterator[MapResult]:
+        """Call method for each request concurrently.
+
+        Errors are collected per request and do not stop other calls.
+
+        Args:
+            requests (Iterable | AsyncIterable): Requests to send.
+            concurrency (int): Maximum number of calls in flight.
+            ordered (bool): Flag for yielding results in order of requests, instead of order of
+                completion.
+            timeout (float | None): Timeout of each call in seconds.
+
+        Returns:
+            Async iterator of call results.
+
+        Example:
+            ```python
+            async for result in client.say_hello.map(requests, concurrency=100):
+                if result.error is None:
+                    print(result.index, result.response)
+            ```
+        """
+
+        if self._method._streaming:  # pylint: disable=protected-access
+            raise TypeError(f"Method '{self.__name__}' is streaming, 'map' is not supported")
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be positive, not {concurrency}")
+
+        items = _enumerate_async(requests)
+        items_lock = asyncio.Lock()
+        results: asyncio.Queue[MapResult | None] = asyncio.Queue()
+
+        async def worker():
+            while True:
+                async with items_lock:
+                    item = await anext(items, None)
+                if item is None:
+                    return
+                index, request = item
+                try:
+                    response = await self._call(request, timeout=timeout)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    results.put_nowait(MapResult(index=index, request=request, error=error))
+                else:
+                    results.put_nowait(MapResult(index=index, request=request, response=response))
+
+        workers_task = asyncio.ensure_future(
+            asyncio.gather(*(worker() for _ in range(concurrency))),
+        )
+        workers_task.add_done_callback(lambda _: results.put_nowait(None))
+        pending = {}
+        next_index = 0
+        try:
+            while (result := await results.get()) is not None:
+                if not ordered:
+                    yield result
+                    continue
+                pending[result.index] = result
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+            # Errors of requests iteration are raised here
+            workers_task.result()
+        finally:
+            workers_task.cancel()
+
+
+async def _enumerate_async(items: Iterable | AsyncIterable) -> AsyncIterator[tuple[int, Any]]:
+    if hasattr(items, "__aiter__"):
+        index = 0
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for index, item in enumerate(items):
+            yield index, item
+
+
+class FastGRPCClient:
+    """Base class of generated service clients.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        config (ChannelConfig | None): Options of channels.
+        channels (int): Number of channels, used round-robin.
+        shared (bool): Flag for sharing channels with other clients of the same target and
+            options.
+        trusted (bool): Flag for building responses without validation, as they are already
+            validated by service.
+        tracing (Tracing | None): Tracing of calls, trace context is passed to server in
+            request metadata.
+
+    Methods take optional `timeout` in seconds. Inside request handler it is limited by
+    remaining deadline of request, that is also used if timeout is not set. Service methods
+    take precedence over public attributes of client with the same names, e.g. `close`, such
+    client is closed by `async with` or `FastGRPCClient.close(client)`.
+
+    Example:
+        ```python
+        async with Greeter.Client(host="localhost", port=50051, channels=4) as client:
+            response = await client.say_hello(HelloRequest(name="world"), timeout=1.0)
+        ```
+    """
+
+    stub_class: type
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            config: ChannelConfig | None = None,
+            channels: int = 1,
+            shared: bool = False,
+            trusted: bool = False,
+            tracing: Tracing | None = None,
+    ):
+        self._trusted = trusted
+        self._tracing = tracing
+        self._pool = ChannelPool.acquire(
+            target=f"{host}:{port}",
+            config=config,
+            size=channels,
+            shared=shared,
+        )
+        self._stubs = itertools.cycle(self._pool.get_stubs(self.stub_class))
+        self._closed = False
+
+    @property
+    def trusted(self) -> bool:
+        return self._trusted
+
+    @property
+    def tracing(self) -> Tracing | None:
+        return self._tracing
+
+    @property
+    def stub(self):
+        return self._get_stub()
+
+    def _get_stub(self):
+        return next(self._stubs)
+
+    async def close(self):
+        """Close client and release its channels."""
+
+        if self._closed:
+            return
+        self._closed = True
+        await self._pool.release()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args):
+        # Service method may be named close
+        await FastGRPCClient.close(self)
+
+
+async def _encode_stream(
+        models: AsyncIterator[BaseModel] | Iterable[BaseModel],
+        codec: MessageCodec,
+) -> AsyncIterator:
+    if hasattr(models, "__aiter__"):
+        async for model in models:
+            yield codec.encode(model)
+    else:
+        for model in models:
+            yield codec.encode(model)
+
+
+def generate_client(
+        name: str,
+        grpc_methods: dict[str, GRPCMethod],
+        pb2_grpc,
+        codecs: dict[str, MessageCodec],
+        service_name: str | None = None,
+) -> type:
+    """Build client class of service with method for each gRPC method.
+
+    Args:
+        name (str): Name of service.
+        grpc_methods (dict[str, GRPCMethod]): Methods of service by names.
+        pb2_grpc: Module of gRPC stubs of service.
+        codecs (dict[str, MessageCodec]): Codecs of service messages by model names.
+        service_name (str | None): Full name of service with package, `name` if not provided.
+
+    Returns:
+        Subclass of `FastGRPCClient`.
+    """
+
+    class_name = f"{name}Client"
+    attributes = {}
+    # Methods use only protected attributes of client, service methods may hide public ones
+    # pylint: disable=protected-access
+    for grpc_method_name, grpc_method in grpc_methods.items():
+        method_path = f"/{service_name or name}/{grpc_method.name}"
+        request_codec = codecs[grpc_method.request_model.__name__]
+        if grpc_method.client_streaming:
+            encode_request = functools.partial(_encode_stream, codec=request_codec)
+        else:
+            encode_request = request_codec.encode
+
+        response_codec = codecs[grpc_method.response_model.__name__]
+        if grpc_method.trusted:
+            decode_response = decode_trusted_response = response_codec.decode_trusted
+        else:
+            decode_response = response_codec.decode
+            decode_trusted_response = response_codec.decode_trusted
+
+        if grpc_method.server_streaming:
+            async def wrapper(
+                    self,
+                    request,
+                    timeout: float | None = None,
+                    _grpc_method: GRPCMethod = grpc_method,
+                    _encode_request: Callable = encode_request,
+                    _decode_response: Callable = decode_response,
+                    _decode_trusted_response: Callable = decode_trusted_response,
+            ) -> AsyncIterator[BaseModel]:
+                call_rpc = getattr(self._get_stub(), _grpc_method.name)
+                decode = _decode_trusted_response if self._trusted else _decode_response
+                # Streaming calls are not wrapped into span, only current context is passed
+                metadata = self._tracing.get_metadata() if self._tracing is not None else None
+                responses = call_rpc(
+                    _encode_request(request),
+                    timeout=get_timeout(timeout),
+                    metadata=metadata,
+                )
+                async for grpc_response_message in responses:
+                    yield decode(grpc_response_message)
+        else:
+            async def wrapper(
+                    self,
+                    request,
+                    timeout: float | None = None,
+                    _grpc_method: GRPCMethod = grpc_method,
+                    _encode_request: Callable = encode_request,
+                    _decode_response: Callable = decode_response,
+                    _decode_trusted_response: Callable = decode_trusted_response,
+                    _method_path: str = method_path,
+            ) -> BaseModel:
+                call_rpc = getattr(self._get_stub(), _grpc_method.name)
+                request_message = _encode_request(request)
+                # Nested calls of request handler inherit its remaining deadline
+                timeout = get_timeout(timeout)
+                if self._tracing is None:
+                    grpc_response_message = await call_rpc(request_message, timeout=timeout)
+                else:
+                    grpc_response_message = await self._tracing.call(
+                        method_name=_method_path,
+                        call_rpc=call_rpc,
+                        request=request_message,
+                        timeout=timeout,
+                    )
+                if self._trusted:
+                    return _decode_trusted_response(grpc_response_message)
+                return _decode_response(grpc_response_message)
+
+        streaming = grpc_method.client_streaming or grpc_method.server_streaming
+        for method_name in (grpc_method_name, *grpc_method.aliases):
+            attributes[method_name] = ClientMethod(function=wrapper, streaming=streaming)
+
+    attributes["stub_class"] = getattr(pb2_grpc, f"{name}Stub")
+
+    return type(class_name, (FastGRPCClient,), attributes)
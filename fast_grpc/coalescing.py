@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalescing of concurrent calls with equal keys into single one.
+
+    The first call runs function, others with the same key wait for its result. Shared call is
+    cancelled only when all its waiters are cancelled.
+
+    Example:
+        ```python
+        flights = SingleFlight()
+        result = await flights.do(key, functools.partial(load, key))
+        ```
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable]) -> Any:
+        """Run function or join to running call with the same key.
+
+        Args:
+            key (Hashable): Key of call.
+            function (Callable[[], Awaitable]): Function for running call.
+
+        Returns:
+            Result of shared call.
+        """
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(task=asyncio.ensure_future(function()))
+            flight.task.add_done_callback(lambda _: self._forget(key=key, flight=flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody waits for result, next calls must not join cancelled one
+                self._forget(key=key, flight=flight)
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,389 @@
+import enum
+import inspect
+import pathlib
+import uuid
+from types import NoneType
+from typing import Any, Callable, get_origin
+
+from google.protobuf.message import Message as ProtoMessage
+from pydantic import BaseModel
+
+from . import proto
+
+
+SCALAR_TYPES = frozenset((
+    "double",
+    "float",
+    "int32",
+    "int64",
+    "uint32",
+    "uint64",
+    "sint32",
+    "sint64",
+    "fixed32",
+    "fixed64",
+    "sfixed32",
+    "sfixed64",
+    "bool",
+    "string",
+    "bytes",
+))
+
+# Types, that pydantic builds from protobuf strings on validation
+TRUSTED_CONSTRUCTORS = (uuid.UUID, pathlib.PurePath)
+
+_MISSING = object()
+_object_setattr = object.__setattr__
+
+
+class MessageCodec:
+    """Converter between pydantic model and protobuf message without intermediate dicts.
+
+    Decoding reads protobuf message attributes straight into model constructor, encoding writes
+    model attributes straight into protobuf message. Field converters are compiled once from
+    service description by `build_codecs`.
+
+    Trusted decoding builds models with `model_construct`, without validation, for messages from
+    trusted peers, that have already validated them.
+    """
+
+    def __init__(self, model: type[BaseModel], message_class: type[ProtoMessage]):
+        self.model = model
+        self.message_class = message_class
+        self._decoders: tuple[tuple[str, Callable[[ProtoMessage], Any]], ...] = ()
+        self._trusted_decoders: tuple[tuple[str, Callable[[ProtoMessage], Any]], ...] = ()
+        self._encoders: tuple[tuple[str, Callable[[ProtoMessage, Any], None]], ...] = ()
+        self._fast_construct = not (
+            model.__pydantic_root_model__ or
+            model.__pydantic_post_init__ or
+            model.__private_attributes__ or
+            model.model_config.get("extra") == "allow"
+        )
+
+    def decode(self, message: ProtoMessage) -> BaseModel:
+        data = {}
+        for name, decoder in self._decoders:
+            value = decoder(message)
+            if value is not _MISSING:
+                data[name] = value
+        return self.model(**data)
+
+    def decode_trusted(self, message: ProtoMessage) -> BaseModel:
+        data = {}
+        missing = None
+        for name, decoder in self._trusted_decoders:
+            value = decoder(message)
+            if value is _MISSING:
+                missing = missing or []
+                missing.append(name)
+                value = self._get_default(name=name, data=data)
+            data[name] = value
+
+        if not self._fast_construct:
+            for name in missing or ():
+                del data[name]
+            return self.model.model_construct(**data)
+
+        # The same as `model_construct` does, without lookup of aliases for each field
+        model = self.model.__new__(self.model)
+        _object_setattr(model, "__dict__", data)
+        _object_setattr(
+            model,
+            "__pydantic_fields_set__",
+            set(data) if missing is None else set(data).difference(missing),
+        )
+        _object_setattr(model, "__pydantic_extra__", None)
+        _object_setattr(model, "__pydantic_private__", None)
+        return model
+
+    def _get_default(self, name: str, data: dict[str, Any]) -> Any:
+        field = self.model.model_fields[name]
+        if field.is_required():
+            # Unset optional field of message
+            return None
+        return field.get_default(call_default_factory=True, validated_data=data)
+
+    def encode(self, model: BaseModel) -> ProtoMessage:
+        message = self.message_class()
+        self.encode_into(model=model, message=message)
+        return message
+
+    def encode_into(self, model: BaseModel, message: ProtoMessage):
+        data = model.__dict__
+        for name, encoder in self._encoders:
+            value = data.get(name)
+            if value is not None:
+                encoder(message, value)
+
+    def compile(
+            self,
+            message: proto.Message,
+            codecs: dict[str, "MessageCodec"],
+            enums: dict[str, type[enum.Enum]],
+    ):
+        decoders = []
+        trusted_decoders = []
+        encoders = []
+        descriptor = self.message_class.DESCRIPTOR
+        for name, field in message.fields.items():
+            field_descriptor = descriptor.fields_by_name[name]
+            annotation = self.model.model_fields[name].annotation
+            if isinstance(field, proto.MapField):
+                value_descriptor = field_descriptor.message_type.fields_by_name["value"]
+                decoder, trusted_decoder, encoder = _compile_map(
+                    name=name,
+                    key_type=field.key,
+                    key_constructor=_get_trusted_constructor(annotation=annotation, map_key=True),
+                    value_converters=_compile_value(
+                        type_=field.value,
+                        field_descriptor=value_descriptor,
+                        codecs=codecs,
+                        enums=enums,
+                        annotation=annotation,
+                    ),
+                )
+            else:
+                decoder, trusted_decoder, encoder = _compile_field(
+                    name=name,
+                    field=field,
+                    converters=_compile_value(
+                        type_=field.type,
+                        field_descriptor=field_descriptor,
+                        codecs=codecs,
+                        enums=enums,
+                        annotation=annotation,
+                    ),
+                )
+            decoders.append((name, decoder))
+            trusted_decoders.append((name, trusted_decoder))
+            encoders.append((name, encoder))
+
+        self._decoders = tuple(decoders)
+        self._trusted_decoders = tuple(trusted_decoders)
+        self._encoders = tuple(encoders)
+
+
+class _ValueConverters:
+    """Converters of single value for scalar, enum and message field types."""
+
+    def __init__(
+            self,
+            load: Callable[[Any], Any] | None = None,
+            dump: Callable[[Any], Any] | None = None,
+            codec: MessageCodec | None = None,
+            trusted_load: Callable[[Any], Any] | None = None,
+    ):
+        self.load = load
+        self.dump = dump
+        self.codec = codec
+        self.trusted_load = trusted_load or load
+
+
+def build_codecs(service: proto.Service, pb2) -> dict[str, MessageCodec]:
+    """Build codecs for all messages of service.
+
+    Args:
+        service (proto.Service): Service description.
+        pb2: Module (or namespace) with generated protobuf message classes.
+
+    Returns:
+        Dictionary of message codecs by message name.
+    """
+
+    codecs = {
+        name: MessageCodec(model=service.models[name], message_class=getattr(pb2, name))
+        for name in service.messages
+    }
+    for name, message in service.messages.items():
+        codecs[name].compile(message=message, codecs=codecs, enums=service.enums)
+    return codecs
+
+
+def _compile_value(
+        type_: str,
+        field_descriptor,
+        codecs: dict[str, MessageCodec],
+        enums: dict[str, type[enum.Enum]],
+        annotation: Any = None,
+) -> _ValueConverters:
+    if type_ == "string":
+        return _ValueConverters(
+            dump=_dump_string,
+            trusted_load=_get_trusted_constructor(annotation=annotation),
+        )
+    if type_ in SCALAR_TYPES:
+        return _ValueConverters()
+    if type_ in enums:
+        return _compile_enum(python_enum=enums[type_], enum_descriptor=field_descriptor.enum_type)
+    if type_ in codecs:
+        return _ValueConverters(codec=codecs[type_])
+    raise TypeError(f"Field '{field_descriptor.name}': unsupported type '{type_}'.")
+
+
+def _compile_enum(python_enum: type[enum.Enum], enum_descriptor) -> _ValueConverters:
+    members_by_number = {}
+    numbers_by_member = {}
+    for value in enum_descriptor.values:
+        member = python_enum.__members__.get(value.name)
+        if member is None:
+            try:
+                member = python_enum(value.number)
+            except ValueError:
+                continue
+        members_by_number[value.number] = member
+        numbers_by_member[member] = value.number
+        numbers_by_member.setdefault(member.value, value.number)
+
+    return _ValueConverters(
+        load=members_by_number.get,
+        dump=numbers_by_member.__getitem__,
+    )
+
+
+def _get_trusted_constructor(annotation: Any, map_key: bool = False) -> Callable | None:
+    while (origin := get_origin(annotation)) is not None:
+        args = [arg for arg in annotation.__args__ if arg is not NoneType]
+        if inspect.isclass(origin) and issubclass(origin, dict):
+            annotation = args[0] if map_key else args[1]
+        else:
+            annotation = args[0]
+
+    if inspect.isclass(annotation) and issubclass(annotation, TRUSTED_CONSTRUCTORS):
+        return annotation
+    return None
+
+
+def _compile_field(
+        name: str,
+        field: proto.Field,
+        converters: _ValueConverters,
+) -> tuple[Callable, Callable, Callable]:
+    dump, codec = converters.dump, converters.codec
+
+    if field.repeated:
+        if codec is not None:
+            def encode(message, value):
+                container = getattr(message, name)
+                for item in value:
+                    codec.encode_into(model=item, message=container.add())
+        else:
+            def encode(message, value):
+                getattr(message, name).extend(map(dump, value) if dump else value)
+    elif codec is not None:
+        def encode(message, value):
+            sub_message = getattr(message, name)
+            sub_message.SetInParent()
+            codec.encode_into(model=value, message=sub_message)
+    else:
+        def encode(message, value):
+            setattr(message, name, dump(value) if dump else value)
+
+    return (
+        _compile_field_decoder(
+            name=name,
+            field=field,
+            load=converters.load,
+            decode_message=codec.decode if codec is not None else None,
+        ),
+        _compile_field_decoder(
+            name=name,
+            field=field,
+            load=converters.trusted_load,
+            decode_message=codec.decode_trusted if codec is not None else None,
+        ),
+        encode,
+    )
+
+
+def _compile_field_decoder(
+        name: str,
+        field: proto.Field,
+        load: Callable[[Any], Any] | None,
+        decode_message: Callable[[ProtoMessage], BaseModel] | None,
+) -> Callable:
+    if field.repeated:
+        if decode_message is not None:
+            def decode(message):
+                return [decode_message(item) for item in getattr(message, name)]
+        else:
+            def decode(message):
+                items = getattr(message, name)
+                return [load(item) for item in items] if load else list(items)
+    elif decode_message is not None:
+        def decode(message):
+            if not message.HasField(name):
+                return _MISSING
+            return decode_message(getattr(message, name))
+    else:
+        optional = field.optional
+
+        def decode(message):
+            if optional and not message.HasField(name):
+                return _MISSING
+            value = getattr(message, name)
+            return load(value) if load else value
+
+    return decode
+
+
+def _compile_map(
+        name: str,
+        key_type: str,
+        value_converters: _ValueConverters,
+        key_constructor: Callable | None = None,
+) -> tuple[Callable, Callable, Callable]:
+    dump, codec = value_converters.dump, value_converters.codec
+    dump_key = _dump_string if key_type == "string" else None
+
+    if codec is not None:
+        def encode(message, value):
+            container = getattr(message, name)
+            for key, item in value.items():
+                codec.encode_into(model=item, message=container[dump_key(key) if dump_key else key])
+    else:
+        def encode(message, value):
+            container = getattr(message, name)
+            for key, item in value.items():
+                container[dump_key(key) if dump_key else key] = dump(item) if dump else item
+
+    return (
+        _compile_map_decoder(
+            name=name,
+            load=value_converters.load,
+            decode_message=codec.decode if codec is not None else None,
+        ),
+        _compile_map_decoder(
+            name=name,
+            load=value_converters.trusted_load,
+            decode_message=codec.decode_trusted if codec is not None else None,
+            load_key=key_constructor,
+        ),
+        encode,
+    )
+
+
+def _compile_map_decoder(
+        name: str,
+        load: Callable[[Any], Any] | None,
+        decode_message: Callable[[ProtoMessage], BaseModel] | None,
+        load_key: Callable[[Any], Any] | None = None,
+) -> Callable:
+    load = decode_message or load
+    if load_key is not None:
+        def decode(message):
+            items = getattr(message, name)
+            if load:
+                return {load_key(key): load(value) for key, value in items.items()}
+            return {load_key(key): value for key, value in items.items()}
+    elif load is not None:
+        def decode(message):
+            return {key: load(value) for key, value in getattr(message, name).items()}
+    else:
+        def decode(message):
+            return dict(getattr(message, name))
+
+    return decode
+
+
+def _dump_string(value: Any) -> str:
+    return value if value.__class__ is str else str(value)
@@ -1,7 +1,8 @@
 import enum
+import functools
 import inspect
-from types import UnionType
-from typing import Annotated, Any, Iterable, Union, get_origin
+from types import NoneType, UnionType
+from typing import Annotated, Any, Callable, Iterable, Union, get_origin
 
 from pydantic import BaseModel
 
@@ -13,64 +14,109 @@ class TypeProcessor:
         return data
 
 
+class ConversionPlan:
+    """Flat table of field converters for one model.
+
+    Plan contains only fields, that need processing, so models without such fields have empty
+    plan and their data is returned as is.
+    """
+
+    def __init__(self, steps: tuple[tuple[str, Callable[[Any], Any]], ...] = ()):
+        self.steps = steps
+
+    def __bool__(self) -> bool:
+        return bool(self.steps)
+
+    def __call__(self, data: dict[str, Any]) -> dict[str, Any]:
+        if not self.steps:
+            return data
+
+        result_data = data.copy()
+        for key, converter in self.steps:
+            value = result_data.get(key)
+            if value is not None:
+                result_data[key] = converter(value)
+        return result_data
+
+
 class DataProcessor:
     def __init__(self, *type_processors: TypeProcessor):
         self._type_processors = type_processors
+        self._plans: dict[type[BaseModel], ConversionPlan] = {}
+        self._compiling: set[type[BaseModel]] = set()
 
     def __call__(self, data: dict[str, Any], model: type[BaseModel], **extra) -> dict[str, Any]:
-        return self.process_model(data=data, annotation=model, **extra)
-
-    def process(self, data: Any, annotation: type, **extra) -> Any:
+        return self.compile_model(model=model)(data)
+
+    def compile_model(self, model: type[BaseModel]) -> ConversionPlan:
+        if (plan := self._plans.get(model)) is not None:
+            return plan
+
+        # Plan is registered before compiling fields for supporting recursive models
+        plan = self._plans[model] = ConversionPlan()
+        self._compiling.add(model)
+        try:
+            steps = []
+            for key, field in model.model_fields.items():
+                converter = self.compile(annotation=field.annotation)
+                if converter is not None:
+                    steps.append((key, converter))
+            plan.steps = tuple(steps)
+        finally:
+            self._compiling.discard(model)
+        return plan
+
+    def compile(self, annotation: type) -> Callable[[Any], Any] | None:
         if (origin := get_origin(annotation)) is not None:
             if origin in (Annotated, Union, UnionType):
-                return self.process(data=data, annotation=annotation.__args__[0], **extra)
+                args = [arg for arg in annotation.__args__ if arg is not NoneType]
+                return self.compile(annotation=args[0]) if args else None
             if issubclass(origin, dict):
-                return self.process_dict(data=data, annotation=annotation, **extra)
+                return self.compile_dict(annotation=annotation)
             if issubclass(origin, Iterable):
-                return self.process_list(data=data, annotation=annotation, **extra)
+                return self.compile_list(annotation=annotation)
         if inspect.isclass(annotation):
             if issubclass(annotation, BaseModel):
-                return self.process_model(data=data, annotation=annotation, **extra)
+                plan = self.compile_model(model=annotation)
+                return plan if plan or annotation in self._compiling else None
             for type_processor in self._type_processors:
                 if issubclass(annotation, type_processor.type_):
-                    return type_processor.process(data=data, annotation=annotation)
-        return data
+                    return functools.partial(type_processor.process, annotation=annotation)
+        return None
 
-    def process_dict(self, data: dict, annotation: type, **extra) -> dict:
+    def compile_dict(self, annotation: type) -> Callable[[dict], dict] | None:
         if not hasattr(annotation, "__args__") or len(annotation.__args__) != 2:
-            return data
+            return None
 
         key_annotation, value_annotation = annotation.__args__
-        result_dict = {}
-        for key, value in data.items():
-            result_key = self.process(data=key, annotation=key_annotation, **extra)
-            result_value = self.process(data=value, annotation=value_annotation, **extra)
-            result_dict[result_key] = result_value
-        return result_dict
-
-    def process_list(self, data: Iterable, annotation: type, **extra) -> list:
+        key_converter = self.compile(annotation=key_annotation)
+        value_converter = self.compile(annotation=value_annotation)
+        if key_converter is None and value_converter is None:
+            return None
+        key_converter = key_converter or _identity
+        value_converter = value_converter or _identity
+
+        def convert_dict(data: dict) -> dict:
+            return {key_converter(key): value_converter(value) for key, value in data.items()}
+
+        return convert_dict
+
+    def compile_list(self, annotation: type) -> Callable[[Iterable], list] | None:
         if not hasattr(annotation, "__args__"):
-            return data
+            return None
 
-        item_annotation = annotation.__args__[0]
-        return [
-            self.process(data=item, annotation=item_annotation, **extra)
-            for item in data
-        ]
-
-    def process_model(
-            self,
-            data: dict[str, Any],
-            annotation: type[BaseModel],
-            **extra,
-    ) -> dict[str, Any]:
-        result_data = data.copy()
-        for key, value in data.items():
-            result_data[key] = self.process(
-                data=value,
-                annotation=annotation.model_fields[key].annotation,
-            )
-        return result_data
+        item_converter = self.compile(annotation=annotation.__args__[0])
+        if item_converter is None:
+            return None
+
+        def convert_list(data: Iterable) -> list:
+            return [item_converter(item) for item in data]
+
+        return convert_list
+
+
+def _identity(data: Any) -> Any:
+    return data
 
 
 class EnumNameByValueTypeProcessor(TypeProcessor):
@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import time
+from typing import Callable
+
+import grpc
+
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("deadline", default=None)
+
+
+def get_time_remaining() -> float | None:
+    """Get time in seconds until deadline of request, that is handled in current context.
+
+    Returns:
+        Remaining time, not less than zero, or None if request has no deadline.
+    """
+
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def get_timeout(timeout: float | None = None) -> float | None:
+    """Get timeout of client call, limited by remaining time of current request.
+
+    Args:
+        timeout (float | None): Timeout of call in seconds.
+
+    Returns:
+        Timeout or None, if neither it nor deadline of current request are set.
+    """
+
+    time_remaining = get_time_remaining()
+    if time_remaining is None:
+        return timeout
+    if timeout is None:
+        return time_remaining
+    return min(timeout, time_remaining)
+
+
+def apply_deadline(handler: Callable, server_streaming: bool = False) -> Callable:
+    """Wrap handler, aborting requests with expired deadline before any work.
+
+    Deadline of request is available for nested client calls by `get_time_remaining`. Unary
+    handlers are cancelled, when deadline expires, streaming ones are cancelled by gRPC.
+    """
+
+    if server_streaming:
+        async def deadline_stream_handler(request, context: grpc.ServicerContext):
+            time_remaining = context.time_remaining() if context is not None else None
+            if time_remaining is None:
+                async for response in handler(request, context):
+                    yield response
+                return
+
+            if time_remaining <= 0:
+                await _abort(context=context)
+            token = _deadline.set(time.monotonic() + time_remaining)
+            try:
+                async for response in handler(request, context):
+                    yield response
+            finally:
+                _deadline.reset(token)
+
+        return deadline_stream_handler
+
+    async def deadline_handler(request, context: grpc.ServicerContext):
+        time_remaining = context.time_remaining() if context is not None else None
+        if time_remaining is None:
+            return await handler(request, context)
+
+        if time_remaining <= 0:
+            await _abort(context=context)
+        token = _deadline.set(time.monotonic() + time_remaining)
+        timeout = asyncio.timeout(time_remaining)
+        try:
+            async with timeout:
+                return await handler(request, context)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            await _abort(context=context)
+        finally:
+            _deadline.reset(token)
+
+    return deadline_handler
+
+
+async def _abort(context: grpc.ServicerContext):
+    await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline exceeded")
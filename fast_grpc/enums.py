@@ -21,3 +21,14 @@ class StatusCode(enum.IntEnum):
     UNAVAILABLE = 14
     DATA_LOSS = 15
     UNAUTHENTICATED = 16
+
+
+class ProtoEngine(enum.StrEnum):
+    """Engines for generating protobuf classes of services.
+
+    `DESCRIPTOR` builds file descriptor and classes in memory, `PROTOC` renders `.proto` file and
+    compiles it with `grpc_tools.protoc`.
+    """
+
+    DESCRIPTOR = "descriptor"
+    PROTOC = "protoc"
@@ -0,0 +1,122 @@
+import multiprocessing
+import pickle
+import threading
+from concurrent import futures
+from typing import Any, Literal
+
+HandlerExecutor = Literal["thread", "process"] | futures.Executor
+
+_EXECUTOR_NAMES = ("thread", "process")
+
+# Services of worker of process pool by their keys
+_process_services: dict[int, Any] = {}
+
+
+def is_process_executor(executor: HandlerExecutor) -> bool:
+    """Check if handlers of executor run in other process, so their arguments are serialized."""
+
+    return executor == "process"
+
+
+def check_executor(executor: HandlerExecutor):
+    if isinstance(executor, futures.ProcessPoolExecutor):
+        raise ValueError(
+            "Process pool must be 'process' pool of server, sized by 'handler_process_workers', "
+            "as its workers are started with services",
+        )
+    if not isinstance(executor, futures.Executor) and executor not in _EXECUTOR_NAMES:
+        raise ValueError(
+            f"Executor must be one of {', '.join(_EXECUTOR_NAMES)} or Executor, not {executor!r}",
+        )
+
+
+def get_process_service(key: int) -> Any:
+    """Get service in worker of process pool by key, that `Executors.register_service`
+    returned."""
+
+    return _process_services[key]
+
+
+def _init_process_worker(services: dict[int, bytes]):
+    for key, data in services.items():
+        _process_services[key] = pickle.loads(data)
+
+
+class Executors:
+    """Pools of synchronous handlers, created on first request to them.
+
+    Process pool starts workers with `spawn`, since forking of process with running gRPC
+    server is not safe. Services of its handlers are pickled once, on registration, and
+    unpickled by each worker at its start.
+
+    Args:
+        thread_workers (int | None): Number of threads in pool, default of
+            `ThreadPoolExecutor` if not set.
+        process_workers (int | None): Number of processes in pool, number of CPUs if not set.
+    """
+
+    def __init__(self, thread_workers: int | None = None, process_workers: int | None = None):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._pools: dict[str, futures.Executor] = {}
+        self._services: dict[int, tuple[Any, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, executor: HandlerExecutor) -> futures.Executor:
+        """Get pool by its name, custom executor is returned as is."""
+
+        if isinstance(executor, futures.Executor):
+            return executor
+        pool = self._pools.get(executor)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(executor)
+                if pool is None:
+                    pool = self._pools[executor] = self._create_pool(name=executor)
+        return pool
+
+    def register_service(self, service: Any) -> int:
+        """Register service for handlers in process pool.
+
+        Already started pool is replaced by new one with the service, its running handlers are
+        finished in old workers.
+
+        Returns:
+            Key of service, see `get_process_service`.
+        """
+
+        key = id(service)
+        with self._lock:
+            if key in self._services:
+                return key
+            # Service is kept, so its id is not reused by other one
+            self._services[key] = (service, pickle.dumps(service))
+            pool = self._pools.pop("process", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+        return key
+
+    def _create_pool(self, name: str) -> futures.Executor:
+        check_executor(executor=name)
+        if name == "thread":
+            return futures.ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="fast-grpc-handler",
+            )
+        return futures.ProcessPoolExecutor(
+            max_workers=self.process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+            initargs=({key: data for key, (_, data) in self._services.items()},),
+        )
+
+    def shutdown(self, wait: bool = True):
+        """Shut down created pools, not started handlers are cancelled."""
+
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+default_executors = Executors()
@@ -0,0 +1,362 @@
+import asyncio
+import math
+import time
+from typing import AsyncIterator, Callable, Iterable
+
+import grpc
+
+
+class ConcurrencyLimiter:
+    """Static limit of concurrent requests, base class of adaptive limiters.
+
+    Args:
+        limit (int): Maximum number of concurrent requests.
+
+    Example:
+        ```python
+        class ExampleService(FastGRPCService):
+            @grpc_method(limiter=ConcurrencyLimiter(limit=100))
+            async def get_item(self, request: ItemRequest) -> ItemResponse:
+                ...
+        ```
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError(f"Limit must be positive, not {limit}")
+        self.limit = limit
+        self.in_flight = 0
+
+    def is_available(self) -> bool:
+        return self.in_flight < self.limit
+
+    def try_acquire(self) -> bool:
+        """Take place for request, False if limit is reached."""
+
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float | None = None, dropped: bool = False):
+        """Free place of request.
+
+        Args:
+            latency (float | None): Duration of request handling in seconds, limit is not
+                updated if not provided.
+            dropped (bool): Flag of request, that was cancelled before completion.
+        """
+
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if latency is not None:
+            self._update(latency=latency, in_flight=in_flight, dropped=dropped)
+
+    def _update(self, latency: float, in_flight: int, dropped: bool):
+        pass
+
+
+class AdaptiveLimiter(ConcurrencyLimiter):
+    """Base class of limiters, that adjust limit by observed latency.
+
+    Args:
+        initial_limit (int): Limit before any observations.
+        min_limit (int): Minimum limit.
+        max_limit (int): Maximum limit.
+        smoothing (float): Weight of new estimation of limit.
+    """
+
+    def __init__(
+            self,
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            smoothing: float = 1.0,
+    ):
+        super().__init__(limit=initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self._estimate = float(initial_limit)
+
+    def _set_estimate(self, estimate: float):
+        estimate = min(max(estimate, self.min_limit), self.max_limit)
+        self._estimate = (1 - self.smoothing) * self._estimate + self.smoothing * estimate
+        self.limit = max(int(self._estimate), self.min_limit)
+
+
+class VegasLimiter(AdaptiveLimiter):
+    """Adaptive limiter in TCP Vegas style.
+
+    Queue size is estimated from ratio of minimum latency without load to observed one. Limit
+    grows while queue is small and decreases when queue is large or requests are dropped.
+
+    Args:
+        initial_limit (int): Limit before any observations.
+        min_limit (int): Minimum limit.
+        max_limit (int): Maximum limit.
+        smoothing (float): Weight of new estimation of limit.
+        probe_interval (int): Number of observations, after that minimum latency is measured
+            again, so it follows changes of service.
+
+    Example:
+        ```python
+        app = FastGRPC(ExampleService(), limiter=VegasLimiter(max_limit=500))
+        ```
+    """
+
+    def __init__(
+            self,
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            smoothing: float = 1.0,
+            probe_interval: int = 1000,
+    ):
+        super().__init__(
+            initial_limit=initial_limit,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            smoothing=smoothing,
+        )
+        self.probe_interval = probe_interval
+        self.min_latency: float | None = None
+        self._samples = 0
+
+    def _update(self, latency: float, in_flight: int, dropped: bool):
+        self._samples += 1
+        if self._samples >= self.probe_interval:
+            self._samples = 0
+            self.min_latency = None
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+            return
+
+        limit = self.limit
+        step = max(math.log10(limit), 1.0)
+        if dropped:
+            self._set_estimate(limit - step)
+            return
+        # Limit is not reached, latency tells nothing about it
+        if in_flight * 2 < limit:
+            return
+
+        queue = math.ceil(limit * (1 - self.min_latency / latency))
+        if queue <= step:
+            self._set_estimate(limit + 3 * step)
+        elif queue < 3 * step:
+            self._set_estimate(limit + step)
+        elif queue > 6 * step:
+            self._set_estimate(limit - step)
+
+
+class GradientLimiter(AdaptiveLimiter):
+    """Adaptive limiter, that follows gradient of long-term latency to observed one.
+
+    Limit is multiplied by ratio of long-term average latency to current one (from 0.5 to 1)
+    and increased by square root of itself, so it grows while latency is stable.
+
+    Args:
+        initial_limit (int): Limit before any observations.
+        min_limit (int): Minimum limit.
+        max_limit (int): Maximum limit.
+        smoothing (float): Weight of new estimation of limit.
+        tolerance (float): Allowed growth of latency over long-term average one.
+        window (int): Number of observations in long-term average latency.
+
+    Example:
+        ```python
+        app = FastGRPC(ExampleService(), limiter=GradientLimiter(tolerance=2.0))
+        ```
+    """
+
+    def __init__(
+            self,
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            smoothing: float = 0.2,
+            tolerance: float = 1.5,
+            window: int = 600,
+    ):
+        super().__init__(
+            initial_limit=initial_limit,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            smoothing=smoothing,
+        )
+        self.tolerance = tolerance
+        self.window = window
+        self.long_latency: float | None = None
+
+    def _update(self, latency: float, in_flight: int, dropped: bool):
+        if self.long_latency is None:
+            self.long_latency = latency
+        else:
+            self.long_latency += (latency - self.long_latency) * 2 / (self.window + 1)
+        # Long-term latency recovers faster after overload
+        if self.long_latency > latency * 2:
+            self.long_latency *= 0.95
+        if in_flight * 2 < self.limit:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / latency))
+        self._set_estimate(self._estimate * gradient + math.sqrt(self._estimate))
+
+
+class LoopLagMonitor:
+    """Monitor of event loop lag, that is delay of timer callbacks behind their schedule.
+
+    Requests, that gRPC receives while event loop is busy, wait for it before interception, so
+    lag is their queueing delay. Lag is measured by callback, scheduled each interval, and
+    decreases by time passed since measurement, so requests, that are queued during a stall and
+    intercepted after next measurement, still see it.
+
+    Args:
+        interval (float): Interval of measurements in seconds.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self._lag = 0.0
+        self._measured_at = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+
+    @property
+    def lag(self) -> float:
+        return max(self._lag - (time.monotonic() - self._measured_at), 0.0)
+
+    def start(self):
+        """Start measurements in running event loop."""
+
+        if self._handle is None:
+            self._schedule(loop=asyncio.get_running_loop())
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._lag = 0.0
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop):
+        expected_at = time.monotonic() + self.interval
+        self._handle = loop.call_later(self.interval, self._measure, loop, expected_at)
+
+    def _measure(self, loop: asyncio.AbstractEventLoop, expected_at: float):
+        now = time.monotonic()
+        lag = now - expected_at
+        if lag > self.lag:
+            self._lag, self._measured_at = lag, now
+        self._schedule(loop=loop)
+
+
+class LoadShedder:
+    """Admission of requests to method by concurrency limiters and queueing delay.
+
+    Queueing delay is current lag of event loop, that requests wait for before interception.
+    Requests over limits or queued too long are rejected before decoding.
+
+    Args:
+        limiters (Iterable[ConcurrencyLimiter]): Limiters of server and method, request must
+            get place in all of them.
+        max_queue_delay (float | None): Maximum queueing delay in seconds, requests, that
+            waited longer, are dropped.
+        lag_monitor (LoopLagMonitor | None): Running monitor of event loop lag, queueing delay
+            is not checked without it.
+    """
+
+    def __init__(
+            self,
+            limiters: Iterable[ConcurrencyLimiter] = (),
+            max_queue_delay: float | None = None,
+            lag_monitor: LoopLagMonitor | None = None,
+    ):
+        self.limiters = tuple(limiters)
+        self.max_queue_delay = max_queue_delay
+        self.lag_monitor = lag_monitor
+        self.rejected = 0
+        self.dropped = 0
+
+    def is_available(self) -> bool:
+        return all(limiter.is_available() for limiter in self.limiters)
+
+    def is_queued_too_long(self) -> bool:
+        return (
+            self.max_queue_delay is not None and
+            self.lag_monitor is not None and
+            self.lag_monitor.lag > self.max_queue_delay
+        )
+
+    async def reject(self, request_or_iterator, context: grpc.ServicerContext):
+        """Handler of request over concurrency limits, rejected before decoding."""
+
+        self.rejected += 1
+        await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Concurrency limit exceeded")
+
+    async def drop(self, request_or_iterator, context: grpc.ServicerContext):
+        """Handler of request, queued too long and dropped before decoding."""
+
+        self.dropped += 1
+        await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Request queued too long")
+
+    def get_rejecting_method(self, streaming: bool = False, dropping: bool = False) -> Callable:
+        """Get handler of rejected or dropped requests, async generator one for server
+        streaming method."""
+
+        method = self.drop if dropping else self.reject
+        if not streaming:
+            return method
+
+        async def reject_stream(request_or_iterator, context) -> AsyncIterator:
+            await method(request_or_iterator, context)
+            # Never reached, makes function async generator like handlers of streaming methods
+            yield
+
+        return reject_stream
+
+    def wrap(self, method: Callable, streaming: bool = False) -> Callable:
+        """Wrap method, rejecting requests over limits."""
+
+        limiters = self.limiters
+
+        async def admit(context: grpc.ServicerContext):
+            for index, limiter in enumerate(limiters):
+                if not limiter.try_acquire():
+                    for acquired_limiter in limiters[:index]:
+                        acquired_limiter.release()
+                    await self.reject(None, context)
+
+        def release(start: float, dropped: bool):
+            latency = time.perf_counter() - start
+            for limiter in limiters:
+                limiter.release(latency=latency, dropped=dropped)
+
+        if streaming:
+            async def limited_stream_method(request_or_iterator, context) -> AsyncIterator:
+                await admit(context=context)
+                start = time.perf_counter()
+                dropped = False
+                try:
+                    async for response in method(request_or_iterator, context):
+                        yield response
+                except asyncio.CancelledError:
+                    dropped = True
+                    raise
+                finally:
+                    release(start=start, dropped=dropped)
+
+            return limited_stream_method
+
+        async def limited_method(request_or_iterator, context):
+            await admit(context=context)
+            start = time.perf_counter()
+            dropped = False
+            try:
+                return await method(request_or_iterator, context)
+            except asyncio.CancelledError:
+                dropped = True
+                raise
+            finally:
+                release(start=start, dropped=dropped)
+
+        return limited_method
@@ -0,0 +1,822 @@
+import asyncio
+import collections.abc
+import contextvars
+import functools
+import inspect
+import weakref
+from typing import Annotated, Any, AsyncIterator, Callable, Iterable, get_origin
+
+import grpc
+from pydantic import BaseModel
+
+from .cache import LRUCache, ResponseCache
+from .coalescing import SingleFlight
+from .codec import MessageCodec
+from .deadline import apply_deadline
+from .executor import (
+    Executors,
+    HandlerExecutor,
+    check_executor,
+    default_executors,
+    get_process_service,
+    is_process_executor,
+)
+from .limiter import ConcurrencyLimiter
+from .metrics import MethodMetrics
+from .middleware import FastGRPCMiddleware
+from .tracing import Tracing
+
+
+STREAM_ORIGINS = (
+    collections.abc.AsyncIterator,
+    collections.abc.AsyncIterable,
+    collections.abc.AsyncGenerator,
+)
+
+
+async def _do_nothing(request):
+    pass
+
+
+class RawRequest:
+    """Annotation of request parameter, that receives protobuf message instead of model.
+
+    Model still describes message in proto file, but handler skips decoding of request.
+
+    Example:
+        ```python
+        class ExampleService(FastGRPCService):
+            @grpc_method
+            async def forward(self, request: RawRequest[HelloRequest]) -> HelloResponse:
+                return await client.stub.say_hello(request)
+        ```
+    """
+
+    def __class_getitem__(cls, model: type[BaseModel]) -> Any:
+        return Annotated[model, cls]
+
+
+def _is_raw_annotation(annotation: Any) -> bool:
+    return get_origin(annotation) is Annotated and RawRequest in annotation.__metadata__
+
+
+def _get_stream_item_annotation(annotation: Any) -> Any | None:
+    if get_origin(annotation) in STREAM_ORIGINS:
+        return annotation.__args__[0]
+    return None
+
+
+async def _decode_stream(
+        messages: AsyncIterator,
+        decode: Callable[[Any], BaseModel],
+) -> AsyncIterator[BaseModel]:
+    async for message in messages:
+        yield decode(message)
+
+
+def _pass_through(value: Any) -> Any:
+    return value
+
+
+def _encode_raw(response: Any, codec: MessageCodec) -> Any:
+    if response.__class__ is codec.message_class:
+        return response
+    return codec.encode(response)
+
+
+class _SharedAbortError(Exception):
+    def __init__(self, code: grpc.StatusCode, details: str):
+        super().__init__(code, details)
+        self.code = code
+        self.details = details
+
+
+def serialize_response(response) -> bytes:
+    """Serialize protobuf response message, already serialized responses are returned as is."""
+
+    if response.__class__ is bytes:
+        return response
+    return response.SerializeToString()
+
+
+async def _call_serialized(
+        function: Callable,
+        encode_response: Callable,
+        request,
+        context: grpc.ServicerContext,
+) -> bytes:
+    return encode_response(await function(request, context)).SerializeToString()
+
+
+async def _check_size(message, max_size: int, context: grpc.ServicerContext, kind: str):
+    size = len(message) if message.__class__ is bytes else message.ByteSize()
+    if size > max_size:
+        await context.abort(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            f"{kind} message is larger than {max_size} bytes",
+        )
+
+
+async def _limit_stream(
+        messages: AsyncIterator,
+        max_size: int,
+        context: grpc.ServicerContext,
+        kind: str,
+) -> AsyncIterator:
+    async for message in messages:
+        await _check_size(message=message, max_size=max_size, context=context, kind=kind)
+        yield message
+
+
+class GRPCMethod:
+    def __init__(
+            self,
+            function: Callable = _do_nothing,
+            name: str | None = None,
+            request_model: type[BaseModel] | None = None,
+            response_model: type[BaseModel] | None = None,
+            middlewares: tuple[FastGRPCMiddleware | Callable] = (),
+            enabled: bool = True,
+            client_streaming: bool | None = None,
+            server_streaming: bool | None = None,
+            raw: bool = False,
+            trusted: bool = False,
+            compression: grpc.Compression | None = None,
+            max_request_size: int | None = None,
+            max_response_size: int | None = None,
+            cache: ResponseCache | bool = False,
+            cache_metadata: Iterable[str] = (),
+            coalesce: bool = False,
+            limiter: ConcurrencyLimiter | None = None,
+            max_queue_delay: float | None = None,
+            executor: HandlerExecutor | None = None,
+            warmup_requests: Iterable[BaseModel] = (),
+    ):
+        self._function = function
+
+        names = (name, function.__name__)
+        names = [
+            name for name in names
+            if name and name != "_do_nothing"
+        ]
+        if not names:
+            raise ValueError("Parameter 'name' must be provided")
+        self._name = names[0]
+        self._aliases = tuple(set(names) - {self._name})
+
+        self._request_model = (
+            request_model or self._get_request_model_from_function(function=function)
+        )
+        self._response_model = (
+            response_model or self._get_response_model_from_function(function=function)
+        )
+        signature = inspect.signature(function)
+        request_parameter = signature.parameters.get("request")
+        request_annotation = (
+            request_parameter.annotation if request_parameter is not None else None
+        )
+        if (item_annotation := _get_stream_item_annotation(request_annotation)) is not None:
+            request_annotation = item_annotation
+        if client_streaming is None:
+            client_streaming = item_annotation is not None
+        if server_streaming is None:
+            server_streaming = (
+                inspect.isasyncgenfunction(function) or
+                _get_stream_item_annotation(signature.return_annotation) is not None
+            )
+        self._client_streaming = client_streaming
+        self._server_streaming = server_streaming
+        self._raw_request = raw or _is_raw_annotation(request_annotation)
+        self._raw_response = raw
+        self._trusted = trusted
+        self._compression = compression
+        self._max_request_size = max_request_size
+        self._max_response_size = max_response_size
+        if cache is True:
+            cache = LRUCache()
+        self._cache = None if cache is False else cache
+        self._cache_metadata = tuple(cache_metadata)
+        self._coalesce = coalesce
+        if (
+                (self._cache is not None or self._coalesce) and
+                (self._client_streaming or self._server_streaming)
+        ):
+            raise ValueError(
+                f"Method '{self._name}': response cache and coalescing support only unary methods",
+            )
+        self._limiter = limiter
+        self._max_queue_delay = max_queue_delay
+        if executor is not None:
+            self._check_executor(executor=executor, function=function, signature=signature)
+        self._executor = executor
+        self._warmup_requests = tuple(warmup_requests)
+        self._middlewares = middlewares
+        self._is_enabled = enabled
+        self._parameters = frozenset(signature.parameters)
+        self._handlers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def aliases(self) -> tuple[str]:
+        return self._aliases
+
+    @property
+    def request_model(self) -> type[BaseModel]:
+        return self._request_model
+
+    @property
+    def response_model(self) -> type[BaseModel]:
+        return self._response_model
+
+    @property
+    def client_streaming(self) -> bool:
+        return self._client_streaming
+
+    @property
+    def server_streaming(self) -> bool:
+        return self._server_streaming
+
+    @property
+    def raw_request(self) -> bool:
+        return self._raw_request
+
+    @property
+    def raw_response(self) -> bool:
+        return self._raw_response
+
+    @property
+    def trusted(self) -> bool:
+        return self._trusted
+
+    @property
+    def compression(self) -> grpc.Compression | None:
+        return self._compression
+
+    @property
+    def max_request_size(self) -> int | None:
+        return self._max_request_size
+
+    @property
+    def max_response_size(self) -> int | None:
+        return self._max_response_size
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        return self._cache
+
+    @property
+    def coalesce(self) -> bool:
+        return self._coalesce
+
+    @property
+    def limiter(self) -> ConcurrencyLimiter | None:
+        return self._limiter
+
+    @property
+    def max_queue_delay(self) -> float | None:
+        return self._max_queue_delay
+
+    @property
+    def executor(self) -> HandlerExecutor | None:
+        return self._executor
+
+    @property
+    def warmup_requests(self) -> tuple[BaseModel, ...]:
+        return self._warmup_requests
+
+    @property
+    def middlewares(self) -> tuple[FastGRPCMiddleware | Callable]:
+        return self._middlewares
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    @staticmethod
+    def _get_request_model_from_function(function: Callable) -> type[BaseModel]:
+        signature = inspect.signature(function)
+        if "request" not in signature.parameters:
+            raise TypeError("GRPC method should have 'request' parameter")
+
+        request_annotation = signature.parameters["request"].annotation
+        if request_annotation is inspect.Parameter.empty:
+            raise TypeError("GRPC method argument 'request' must have pydantic model annotation")
+        if (item_annotation := _get_stream_item_annotation(request_annotation)) is not None:
+            request_annotation = item_annotation
+        if _is_raw_annotation(request_annotation):
+            request_annotation = request_annotation.__origin__
+        if not inspect.isclass(request_annotation) or not issubclass(request_annotation, BaseModel):
+            raise TypeError("GRPC method parameter 'request' should be pydantic model")
+
+        return request_annotation
+
+    @staticmethod
+    def _get_response_model_from_function(function: Callable) -> type[BaseModel]:
+        signature = inspect.signature(function)
+        return_annotation = signature.return_annotation
+        if return_annotation is inspect.Parameter.empty:
+            raise TypeError("GRPC method must have pydantic model return annotation")
+        if (item_annotation := _get_stream_item_annotation(return_annotation)) is not None:
+            return_annotation = item_annotation
+        if not inspect.isclass(return_annotation) or not issubclass(return_annotation, BaseModel):
+            raise TypeError("GRPC method should have pydantic model in return annotation")
+
+        return return_annotation
+
+    def _check_executor(
+            self,
+            executor: HandlerExecutor,
+            function: Callable,
+            signature: inspect.Signature,
+    ):
+        check_executor(executor=executor)
+        if inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function):
+            raise ValueError(f"Method '{self._name}': executor runs only synchronous handlers")
+        if self._client_streaming or self._server_streaming:
+            raise ValueError(f"Method '{self._name}': executor supports only unary methods")
+        if is_process_executor(executor=executor) and "context" in signature.parameters:
+            raise ValueError(
+                f"Method '{self._name}': context can not be passed to handler in other process",
+            )
+
+    def __get__(self, instance: object | None, cls: type):
+        if instance is None:
+            return self
+        return functools.partial(self.__call__, instance)
+
+    async def __call__(self, service: "FastGRPCService", request, context):
+        handler = self._handlers.get(service)
+        if handler is None:
+            handler = self._handlers[service] = self.bind(service=service)
+        return await handler(request, context)
+
+    def bind(
+            self,
+            service: "FastGRPCService",
+            metrics: MethodMetrics | None = None,
+            tracing: Tracing | None = None,
+            executors: Executors | None = None,
+    ) -> Callable:
+        """Build request handler for service instance.
+
+        Codecs, handler parameters and middlewares chain are resolved once here, so calling
+        returned handler is a single coroutine invocation per request. Requests with expired
+        deadline are aborted before decoding.
+
+        Args:
+            service (FastGRPCService): Service instance, that handles requests.
+            metrics (MethodMetrics | None): Metrics of method, stages of handling are measured
+                only if provided.
+            tracing (Tracing | None): Tracing, stages of handling sampled requests are traced
+                only if provided.
+            executors (Executors | None): Pools of synchronous handlers, shared default ones
+                if not provided.
+
+        Returns:
+            Coroutine function, that takes protobuf request message (or async iterator of them
+            for client streaming) with context and returns protobuf response message (or async
+            generator of them for server streaming).
+        """
+
+        request_codec = service.codecs[self._request_model.__name__]
+        response_codec = service.codecs[self._response_model.__name__]
+        decode = request_codec.decode
+        if self._raw_response:
+            encode_response = functools.partial(_encode_raw, codec=response_codec)
+        else:
+            encode_response = response_codec.encode
+        if metrics is not None:
+            decode = metrics.time_stage(stage="decode", function=decode)
+            encode_response = metrics.time_stage(stage="encode", function=encode_response)
+        if tracing is not None:
+            decode = tracing.trace_stage(name="decode", function=decode)
+            encode_response = tracing.trace_stage(name="encode", function=encode_response)
+
+        function = self._bind_function(service=service, executors=executors or default_executors)
+        is_response_serialized = self.is_response_serialized
+        if is_response_serialized:
+            get_request_key = functools.partial(self._get_request_key, codec=request_codec)
+            function = self._apply_coalescing(
+                function=functools.partial(_call_serialized, function, encode_response),
+                get_request_key=get_request_key,
+            )
+        if metrics is not None:
+            function = metrics.time_handler(function=function)
+        if tracing is not None:
+            function = tracing.trace_async_stage(name="handler", function=function)
+        if is_response_serialized:
+            # Middlewares run around cache, so they see every request, including hits
+            function = self._apply_cache(function=function, get_request_key=get_request_key)
+        function = self._apply_middlewares_to_function(
+            function=function,
+            middlewares=service.middlewares + self._middlewares,
+        )
+        if metrics is not None:
+            function = metrics.time_middlewares(function=function)
+        if tracing is not None:
+            function = tracing.trace_async_stage(name="middlewares", function=function)
+
+        if self._raw_request:
+            decode_request = _pass_through
+        elif self._client_streaming:
+            decode_request = functools.partial(_decode_stream, decode=decode)
+        else:
+            decode_request = decode
+
+        if self._server_streaming:
+            async def stream_handler(request, context: grpc.ServicerContext):
+                responses = await function(decode_request(request), context)
+                async for response in responses:
+                    yield encode_response(response)
+
+            return apply_deadline(
+                handler=self._apply_limits(handler=stream_handler),
+                server_streaming=True,
+            )
+
+        if is_response_serialized:
+            async def serialized_handler(request, context: grpc.ServicerContext) -> bytes:
+                return await function(decode_request(request), context)
+
+            return apply_deadline(handler=self._apply_limits(handler=serialized_handler))
+
+        async def handler(request, context: grpc.ServicerContext):
+            response = await function(decode_request(request), context)
+            return encode_response(response)
+
+        return apply_deadline(handler=self._apply_limits(handler=handler))
+
+    @property
+    def is_response_serialized(self) -> bool:
+        """Flag of handlers, that return already serialized response messages."""
+
+        return self._cache is not None or self._coalesce
+
+    def _get_request_key(
+            self,
+            request,
+            context: grpc.ServicerContext,
+            codec: MessageCodec,
+    ) -> tuple:
+        # Key is built from request, that middlewares pass to handler
+        message = request if self._raw_request else codec.encode(request)
+        key = (self._name, message.SerializeToString(deterministic=True))
+        if self._cache_metadata:
+            metadata = dict(context.invocation_metadata() or ())
+            key += tuple(metadata.get(metadata_key) for metadata_key in self._cache_metadata)
+        return key
+
+    def _apply_cache(self, function: Callable, get_request_key: Callable) -> Callable:
+        """Wrap handler function into response cache, if it is set.
+
+        Cached function returns serialized response message, hits skip handler and encoding.
+        """
+
+        cache = self._cache
+        if cache is None:
+            return function
+
+        async def cached_function(request, context: grpc.ServicerContext) -> bytes:
+            key = get_request_key(request, context)
+            response = cache.get(key)
+            if response is None:
+                response = await function(request, context)
+                cache.set(key, response)
+            return response
+
+        return cached_function
+
+    def _apply_coalescing(self, function: Callable, get_request_key: Callable) -> Callable:
+        """Wrap handler function into coalescing of concurrent equal requests, if it is enabled.
+
+        Function runs once for all equal requests in flight, its serialized response is returned
+        to each of them.
+        """
+
+        if not self._coalesce:
+            return function
+
+        flights = SingleFlight()
+
+        async def run(request, context: grpc.ServicerContext) -> bytes:
+            try:
+                return await function(request, context)
+            except grpc.aio.AbortError as error:
+                # Status is set in context of the first request only, pass it to others
+                raise _SharedAbortError(code=context.code(), details=context.details()) from error
+
+        async def coalesced_function(request, context: grpc.ServicerContext) -> bytes:
+            try:
+                return await flights.do(
+                    key=get_request_key(request, context),
+                    function=functools.partial(run, request, context),
+                )
+            except _SharedAbortError as error:
+                await context.abort(error.code, error.details)
+
+        return coalesced_function
+
+    def _apply_limits(self, handler: Callable) -> Callable:
+        """Wrap handler into compression and message size checks, if they are set."""
+
+        compression = self._compression
+        max_request_size = self._max_request_size
+        max_response_size = self._max_response_size
+        if compression is None and max_request_size is None and max_response_size is None:
+            return handler
+
+        async def prepare_request(request, context: grpc.ServicerContext):
+            if compression is not None:
+                context.set_compression(compression)
+            if max_request_size is None:
+                return request
+            if self._client_streaming:
+                return _limit_stream(
+                    messages=request,
+                    max_size=max_request_size,
+                    context=context,
+                    kind="Request",
+                )
+            await _check_size(
+                message=request,
+                max_size=max_request_size,
+                context=context,
+                kind="Request",
+            )
+            return request
+
+        if self._server_streaming:
+            async def limited_stream_handler(request, context: grpc.ServicerContext):
+                request = await prepare_request(request, context)
+                responses = handler(request, context)
+                if max_response_size is not None:
+                    responses = _limit_stream(
+                        messages=responses,
+                        max_size=max_response_size,
+                        context=context,
+                        kind="Response",
+                    )
+                async for response in responses:
+                    yield response
+
+            return limited_stream_handler
+
+        async def limited_handler(request, context: grpc.ServicerContext):
+            response = await handler(await prepare_request(request, context), context)
+            if max_response_size is not None:
+                await _check_size(
+                    message=response,
+                    max_size=max_response_size,
+                    context=context,
+                    kind="Response",
+                )
+            return response
+
+        return limited_handler
+
+    def _bind_function(self, service: "FastGRPCService", executors: Executors) -> Callable:
+        function = self._function
+        if self._executor is not None and is_process_executor(executor=self._executor):
+            return self._bind_process_function(service=service, executors=executors)
+        if "self" in self._parameters:
+            function = functools.partial(function, self=service)
+        if self._executor is not None:
+            return self._bind_thread_function(function=function, executors=executors)
+
+        if inspect.isasyncgenfunction(self._function):
+            # Streaming functions return iterator without awaiting, middlewares can wrap it
+            if "context" in self._parameters:
+                async def stream_wrapper(request, context: grpc.ServicerContext) -> AsyncIterator:
+                    return function(request=request, context=context)
+            else:
+                async def stream_wrapper(request, context: grpc.ServicerContext) -> AsyncIterator:
+                    return function(request=request)
+
+            return stream_wrapper
+
+        if "context" in self._parameters:
+            async def wrapper(request, context: grpc.ServicerContext) -> BaseModel:
+                return await function(request=request, context=context)
+        else:
+            async def wrapper(request, context: grpc.ServicerContext) -> BaseModel:
+                return await function(request=request)
+
+        return wrapper
+
+    def _bind_thread_function(self, function: Callable, executors: Executors) -> Callable:
+        executor = self._executor
+        if "context" in self._parameters:
+            def call(request, context: grpc.ServicerContext) -> BaseModel:
+                return function(request=request, context=context)
+        else:
+            def call(request, context: grpc.ServicerContext) -> BaseModel:
+                return function(request=request)
+
+        async def thread_wrapper(request, context: grpc.ServicerContext) -> BaseModel:
+            # Handler sees context variables of request, e.g. its deadline
+            return await asyncio.get_running_loop().run_in_executor(
+                executors.get(executor),
+                contextvars.copy_context().run,
+                call,
+                request,
+                context,
+            )
+
+        return thread_wrapper
+
+    def _bind_process_function(
+            self,
+            service: "FastGRPCService",
+            executors: Executors,
+    ) -> Callable:
+        executor = self._executor
+        request_codec = service.codecs[self._request_model.__name__]
+        response_codec = service.codecs[self._response_model.__name__]
+        raw_request = self._raw_request
+        raw_response = self._raw_response
+        # Workers get service at start, only serialized request and response are passed
+        call = functools.partial(_call_in_process, executors.register_service(service), self._name)
+
+        async def process_wrapper(request, context: grpc.ServicerContext) -> BaseModel:
+            message = request if raw_request else request_codec.encode(request)
+            response_data = await asyncio.get_running_loop().run_in_executor(
+                executors.get(executor),
+                call,
+                message.SerializeToString(),
+            )
+            response = response_codec.message_class.FromString(response_data)
+            # Response is already validated in worker
+            return response if raw_response else response_codec.decode_trusted(response)
+
+        return process_wrapper
+
+    def handle_serialized(self, service: "FastGRPCService", request_data: bytes) -> bytes:
+        """Handle serialized request message by synchronous handler, in worker of process pool.
+
+        Returns:
+            Serialized response message.
+        """
+
+        request_codec = service.codecs[self._request_model.__name__]
+        response_codec = service.codecs[self._response_model.__name__]
+        request = request_codec.message_class.FromString(request_data)
+        if not self._raw_request:
+            # Request is already validated by server
+            request = request_codec.decode_trusted(request)
+        if "self" in self._parameters:
+            response = self._function(self=service, request=request)
+        else:
+            response = self._function(request=request)
+        if self._raw_response:
+            return _encode_raw(response, codec=response_codec).SerializeToString()
+        return response_codec.encode(response).SerializeToString()
+
+    @staticmethod
+    def _apply_middlewares_to_function(
+            function: Callable,
+            middlewares: tuple[FastGRPCMiddleware | Callable] = (),
+    ) -> Callable:
+        for middleware in middlewares[::-1]:
+            function = functools.partial(middleware, function)
+
+        return function
+
+
+def grpc_method(
+        function: Callable | None = None,
+        /,
+        name: str | None = None,
+        request_model: type[BaseModel] | None = None,
+        response_model: type[BaseModel] | None = None,
+        middlewares: Iterable[FastGRPCMiddleware | Callable] = (),
+        disable: bool = False,
+        raw: bool = False,
+        trusted: bool = False,
+        compression: grpc.Compression | None = None,
+        max_request_size: int | None = None,
+        max_response_size: int | None = None,
+        cache: ResponseCache | bool = False,
+        cache_metadata: Iterable[str] = (),
+        coalesce: bool = False,
+        limiter: ConcurrencyLimiter | None = None,
+        max_queue_delay: float | None = None,
+        executor: HandlerExecutor | None = None,
+        warmup_requests: Iterable[BaseModel] = (),
+):
+    """Decorator for setting method as gRPC.
+    
+    Args:
+        function (Callable | None): Original request handler.
+        name (str | None): Name for gRPC method.
+        request_model (type[pydantic.BaseModel] | None): Model for describe request data.
+        response_model (type[pydantic.BaseModel] | None): Model for describe response data.
+        middlewares (Iterable[FastGRPCMiddleware | Callable]): Iterable of middlewares.
+        disable (bool): Flag for enable/disable gRPC method.
+        raw (bool): Flag for passing protobuf request message to handler as is. Handler may
+            return protobuf response message, that is sent without encoding.
+        trusted (bool): Flag for building responses in client without validation, as they are
+            already validated by service.
+        compression (grpc.Compression | None): Compression of responses, overrides server one.
+        max_request_size (int | None): Maximum size of request message in bytes, larger ones
+            are rejected with RESOURCE_EXHAUSTED. It can not exceed `max_receive_message_length`
+            of server, 4 MiB by default.
+        max_response_size (int | None): Maximum size of response message in bytes, larger ones
+            are rejected with RESOURCE_EXHAUSTED. It can not exceed `max_send_message_length`
+            of server.
+        cache (ResponseCache | bool): Cache of serialized responses by serialized requests for
+            unary methods, `LRUCache` with default options if True. Middlewares run for every
+            request, including hits, and get serialized response message (bytes) from
+            `next_call` of cached method. Key is built from request, that middlewares pass to
+            handler, so response must depend on caller only through it and `cache_metadata`.
+        cache_metadata (Iterable[str]): Keys of request metadata, that are part of cache and
+            coalescing keys.
+        coalesce (bool): Flag for running handler once for equal concurrent requests of unary
+            method, cancelled only when all of them are cancelled. Middlewares run for each
+            request before it joins running call and get serialized response message (bytes)
+            from `next_call` of coalescing method.
+        limiter (ConcurrencyLimiter | None): Limiter of concurrent requests, requests over
+            limit are rejected with RESOURCE_EXHAUSTED.
+        max_queue_delay (float | None): Maximum queueing delay of requests in seconds, that is
+            lag of busy event loop, overrides server one. Requests, that waited longer, are
+            dropped with RESOURCE_EXHAUSTED before decoding.
+        executor (HandlerExecutor | None): Pool for synchronous handler of unary method, so it
+            does not block event loop: "thread", "process" (pools of server) or any Executor,
+            except of process pools. Handler in other process gets no context, its service is
+            pickled once for workers of pool, request and response are passed as serialized
+            messages. Cancelled requests do not interrupt already running handlers.
+        warmup_requests (Iterable[BaseModel]): Sample requests, that server with
+            `warmup_requests=True` handles in process before start, one stream of them for
+            client streaming method.
+
+    Example:
+        ```python
+        from fast_grpc import FastGRPCService, grpc_method
+        from pydantic import BaseModel
+
+        class ExampleService(FastGRPCService):
+            @grpc_method
+            async def ping(self, request: BaseModel) -> BaseModel:
+                ...
+
+            @grpc_method(
+                name="isHealth",
+                request_model=BaseModel,
+                response_model=BaseModel,
+                middlewares=(),
+                disable=False,
+            )
+            async def is_health(self, request, context):
+                ...
+
+            @grpc_method
+            async def list_items(self, request: BaseModel) -> AsyncIterator[BaseModel]:
+                yield ...
+
+            @grpc_method(raw=True)
+            async def forward(self, request: BaseModel) -> BaseModel:
+                return self.pb2.BaseModel(...)
+
+            @grpc_method(executor="process")
+            def render(self, request: BaseModel) -> BaseModel:
+                ...
+        ```
+    """
+
+    def decorator(function: Callable) -> GRPCMethod:
+        return GRPCMethod(
+            function=function,
+            name=name,
+            request_model=request_model,
+            response_model=response_model,
+            middlewares=tuple(middlewares),
+            enabled=not disable,
+            raw=raw,
+            trusted=trusted,
+            compression=compression,
+            max_request_size=max_request_size,
+            max_response_size=max_response_size,
+            cache=cache,
+            cache_metadata=cache_metadata,
+            coalesce=coalesce,
+            limiter=limiter,
+            max_queue_delay=max_queue_delay,
+            executor=executor,
+            warmup_requests=warmup_requests,
+        )
+
+    if function is not None:
+        return decorator(function=function)
+    return decorator
+
+
+def _call_in_process(service_key: int, method_name: str, request_data: bytes) -> bytes:
+    """Run synchronous handler in worker of process pool."""
+
+    service = get_process_service(key=service_key)
+    return type(service).grpc_methods[method_name].handle_serialized(
+        service=service,
+        request_data=request_data,
+    )
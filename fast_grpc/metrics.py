@@ -0,0 +1,311 @@
+import asyncio
+import bisect
+import collections
+import contextvars
+import functools
+import http.server
+import threading
+import time
+from typing import Any, Callable
+
+import grpc
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+    5.0, 10.0,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STAGES = ("deserialize", "decode", "middlewares", "handler", "encode", "serialize")
+
+_handler_duration: contextvars.ContextVar[float] = contextvars.ContextVar("handler_duration")
+
+
+class Histogram:
+    """Histogram with fixed buckets, compatible with Prometheus one."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        result = []
+        total = 0
+        for bucket, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append(("+Inf" if bucket == float("inf") else repr(bucket), total))
+        return result
+
+
+class MethodMetrics:
+    """Metrics of single gRPC method.
+
+    Args:
+        service_name (str): Full name of service.
+        method_name (str): Name of method.
+    """
+
+    def __init__(self, service_name: str, method_name: str):
+        self.service_name = service_name
+        self.method_name = method_name
+        self.latency = Histogram()
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.in_flight = 0
+        self.status_codes: collections.Counter[str] = collections.Counter()
+        self.request_bytes = Histogram(buckets=SIZE_BUCKETS)
+        self.response_bytes = Histogram(buckets=SIZE_BUCKETS)
+
+    def time_stage(self, stage: str, function: Callable) -> Callable:
+        """Wrap function, observing duration of its calls in stage histogram."""
+
+        histogram = self.stages[stage]
+
+        @functools.wraps(function)
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    def time_deserializer(self, deserializer: Callable[[bytes], Any]) -> Callable[[bytes], Any]:
+        histogram = self.stages["deserialize"]
+        request_bytes = self.request_bytes
+
+        def wrapper(data: bytes):
+            start = time.perf_counter()
+            message = deserializer(data)
+            histogram.observe(time.perf_counter() - start)
+            request_bytes.observe(len(data))
+            return message
+
+        return wrapper
+
+    def time_serializer(self, serializer: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+        histogram = self.stages["serialize"]
+        response_bytes = self.response_bytes
+
+        def wrapper(message) -> bytes:
+            start = time.perf_counter()
+            data = serializer(message)
+            histogram.observe(time.perf_counter() - start)
+            response_bytes.observe(len(data))
+            return data
+
+        return wrapper
+
+    def time_handler(self, function: Callable) -> Callable:
+        """Wrap innermost handler function, its duration is excluded from middlewares stage."""
+
+        histogram = self.stages["handler"]
+
+        async def wrapper(request, context):
+            start = time.perf_counter()
+            try:
+                return await function(request, context)
+            finally:
+                duration = time.perf_counter() - start
+                histogram.observe(duration)
+                _handler_duration.set(duration)
+
+        return wrapper
+
+    def time_middlewares(self, function: Callable) -> Callable:
+        """Wrap middlewares chain, observing its duration without handler one."""
+
+        histogram = self.stages["middlewares"]
+
+        async def wrapper(request, context):
+            _handler_duration.set(0.0)
+            start = time.perf_counter()
+            try:
+                return await function(request, context)
+            finally:
+                duration = time.perf_counter() - start
+                histogram.observe(max(duration - _handler_duration.get(), 0.0))
+
+        return wrapper
+
+    def instrument(self, handler: Callable, server_streaming: bool = False) -> Callable:
+        """Wrap request handler, tracking latency, requests in flight and status codes."""
+
+        if server_streaming:
+            async def stream_wrapper(request, context):
+                start = self._start()
+                code = grpc.StatusCode.UNKNOWN
+                try:
+                    async for response in handler(request, context):
+                        yield response
+                    code = _get_code(context=context)
+                except grpc.aio.AbortError:
+                    code = _get_code(context=context)
+                    raise
+                except asyncio.CancelledError:
+                    code = grpc.StatusCode.CANCELLED
+                    raise
+                finally:
+                    self._finish(start=start, code=code)
+
+            return stream_wrapper
+
+        async def wrapper(request, context):
+            start = self._start()
+            code = grpc.StatusCode.UNKNOWN
+            try:
+                response = await handler(request, context)
+                code = _get_code(context=context)
+                return response
+            except grpc.aio.AbortError:
+                code = _get_code(context=context)
+                raise
+            except asyncio.CancelledError:
+                code = grpc.StatusCode.CANCELLED
+                raise
+            finally:
+                self._finish(start=start, code=code)
+
+        return wrapper
+
+    def _start(self) -> float:
+        self.in_flight += 1
+        return time.perf_counter()
+
+    def _finish(self, start: float, code: grpc.StatusCode):
+        self.latency.observe(time.perf_counter() - start)
+        self.in_flight -= 1
+        self.status_codes[code.name] += 1
+
+
+class MetricsRegistry:
+    """Registry of gRPC methods metrics with Prometheus text export.
+
+    Example:
+        ```python
+        metrics = MetricsRegistry()
+        app = FastGRPC(ExampleService(), metrics=metrics, metrics_port=9090)
+        ...
+        print(metrics.get_method("example.ExampleService", "ping").latency.count)
+        ```
+    """
+
+    def __init__(self):
+        self._methods: dict[tuple[str, str], MethodMetrics] = {}
+
+    def get_method(self, service_name: str, method_name: str) -> MethodMetrics:
+        key = (service_name, method_name)
+        method_metrics = self._methods.get(key)
+        if method_metrics is None:
+            method_metrics = self._methods[key] = MethodMetrics(
+                service_name=service_name,
+                method_name=method_name,
+            )
+        return method_metrics
+
+    def render(self) -> str:
+        """Render metrics in Prometheus text format."""
+
+        lines = []
+        methods = tuple(self._methods.values())
+
+        def add_histograms(name: str, help_text: str, histograms: list[tuple[str, Histogram]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in histograms:
+                for bucket, count in histogram.get_cumulative_counts():
+                    lines.append(f'{name}_bucket{{{labels},le="{bucket}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        add_histograms(
+            name="fast_grpc_request_duration_seconds",
+            help_text="Duration of gRPC requests handling.",
+            histograms=[(_get_labels(method), method.latency) for method in methods],
+        )
+        add_histograms(
+            name="fast_grpc_stage_duration_seconds",
+            help_text="Duration of gRPC request handling stages.",
+            histograms=[
+                (f'{_get_labels(method)},stage="{stage}"', histogram)
+                for method in methods
+                for stage, histogram in method.stages.items()
+            ],
+        )
+        add_histograms(
+            name="fast_grpc_request_bytes",
+            help_text="Size of gRPC request messages.",
+            histograms=[(_get_labels(method), method.request_bytes) for method in methods],
+        )
+        add_histograms(
+            name="fast_grpc_response_bytes",
+            help_text="Size of gRPC response messages.",
+            histograms=[(_get_labels(method), method.response_bytes) for method in methods],
+        )
+
+        lines.append("# HELP fast_grpc_requests_in_flight Number of gRPC requests in flight.")
+        lines.append("# TYPE fast_grpc_requests_in_flight gauge")
+        for method in methods:
+            labels = _get_labels(method)
+            lines.append(f"fast_grpc_requests_in_flight{{{labels}}} {method.in_flight}")
+
+        lines.append("# HELP fast_grpc_responses_total Number of gRPC responses by status code.")
+        lines.append("# TYPE fast_grpc_responses_total counter")
+        for method in methods:
+            for code, count in tuple(method.status_codes.items()):
+                lines.append(
+                    f'fast_grpc_responses_total{{{_get_labels(method)},code="{code}"}} {count}',
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> http.server.ThreadingHTTPServer:
+        """Start HTTP server with metrics in Prometheus text format in background thread.
+
+        Args:
+            port (int): Port of HTTP server.
+            host (str): Host of HTTP server.
+
+        Returns:
+            Started HTTP server, `shutdown` stops it.
+        """
+
+        registry = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        metrics_server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=metrics_server.serve_forever, daemon=True).start()
+        return metrics_server
+
+
+def _get_labels(method: MethodMetrics) -> str:
+    return f'service="{method.service_name}",method="{method.method_name}"'
+
+
+def _get_code(context) -> grpc.StatusCode:
+    code = context.code() if context is not None else None
+    if code is None:
+        return grpc.StatusCode.OK
+    if isinstance(code, grpc.StatusCode):
+        return code
+    return _STATUS_CODES.get(code, grpc.StatusCode.UNKNOWN)
+
+
+_STATUS_CODES = {code.value[0]: code for code in grpc.StatusCode}
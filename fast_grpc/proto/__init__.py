@@ -1,15 +1,37 @@
-from .models import Field, Message, Method, Service
+from .descriptor import (
+    HANDLER_FACTORIES,
+    build_file_descriptor,
+    build_pb2,
+    build_pb2_grpc,
+)
+from .models import Field, MapField, Message, Method, Service
 from .parse import gather_enums_from_model, gather_models, get_message_from_model
-from .utils import compile_proto, render_proto
+from .utils import (
+    DEFAULT_CACHE_PATH,
+    compile_proto,
+    compile_proto_cached,
+    get_proto_hash,
+    import_pb2,
+    render_proto,
+)
 
 __all__ = (
+    "DEFAULT_CACHE_PATH",
+    "HANDLER_FACTORIES",
     "Field",
+    "MapField",
     "Message",
     "Method",
     "Service",
+    "build_file_descriptor",
+    "build_pb2",
+    "build_pb2_grpc",
     "compile_proto",
+    "compile_proto_cached",
     "gather_enums_from_model",
     "gather_models",
     "get_message_from_model",
+    "get_proto_hash",
+    "import_pb2",
     "render_proto",
 )
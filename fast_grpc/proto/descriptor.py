@@ -0,0 +1,237 @@
+import types
+
+import grpc
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from google.protobuf.internal import enum_type_wrapper
+
+from .models import Field, MapField, Message, Service
+
+FieldDescriptorProto = descriptor_pb2.FieldDescriptorProto
+
+SCALAR_FIELD_TYPES = {
+    "double": FieldDescriptorProto.TYPE_DOUBLE,
+    "float": FieldDescriptorProto.TYPE_FLOAT,
+    "int32": FieldDescriptorProto.TYPE_INT32,
+    "int64": FieldDescriptorProto.TYPE_INT64,
+    "uint32": FieldDescriptorProto.TYPE_UINT32,
+    "uint64": FieldDescriptorProto.TYPE_UINT64,
+    "sint32": FieldDescriptorProto.TYPE_SINT32,
+    "sint64": FieldDescriptorProto.TYPE_SINT64,
+    "fixed32": FieldDescriptorProto.TYPE_FIXED32,
+    "fixed64": FieldDescriptorProto.TYPE_FIXED64,
+    "sfixed32": FieldDescriptorProto.TYPE_SFIXED32,
+    "sfixed64": FieldDescriptorProto.TYPE_SFIXED64,
+    "bool": FieldDescriptorProto.TYPE_BOOL,
+    "string": FieldDescriptorProto.TYPE_STRING,
+    "bytes": FieldDescriptorProto.TYPE_BYTES,
+}
+
+_MULTICALLABLES = {
+    (False, False): "unary_unary",
+    (False, True): "unary_stream",
+    (True, False): "stream_unary",
+    (True, True): "stream_stream",
+}
+HANDLER_FACTORIES = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+def get_file_name(service: Service) -> str:
+    return f"{service.package_name.replace('.', '/')}/{service.name.lower()}.proto"
+
+
+def build_file_descriptor(service: Service) -> descriptor_pb2.FileDescriptorProto:
+    """Build file descriptor for service, equal to compiled result of `render_proto`.
+
+    Args:
+        service (Service): Service description.
+
+    Returns:
+        File descriptor proto.
+    """
+
+    file_descriptor = descriptor_pb2.FileDescriptorProto(
+        name=get_file_name(service=service),
+        package=service.package_name,
+        syntax="proto3",
+    )
+
+    service_descriptor = file_descriptor.service.add(name=service.name)
+    for method in service.methods.values():
+        method_descriptor = service_descriptor.method.add(
+            name=method.name,
+            input_type=_get_type_name(service=service, name=method.request.name),
+            output_type=_get_type_name(service=service, name=method.response.name),
+        )
+        # Streaming flags are set only when enabled, like protoc does
+        if method.client_streaming:
+            method_descriptor.client_streaming = True
+        if method.server_streaming:
+            method_descriptor.server_streaming = True
+
+    for name, enum in service.enums.items():
+        enum_descriptor = file_descriptor.enum_type.add(name=name)
+        for number, value in enumerate(enum):
+            enum_descriptor.value.add(name=value.name, number=number)
+
+    for message in service.messages.values():
+        _add_message(
+            service=service,
+            message=message,
+            message_descriptor=file_descriptor.message_type.add(),
+        )
+
+    return file_descriptor
+
+
+def build_pb2(service: Service, pool: descriptor_pool.DescriptorPool | None = None):
+    """Register service file descriptor in pool and create protobuf classes in memory.
+
+    Args:
+        service (Service): Service description.
+        pool (DescriptorPool | None): Descriptor pool, default pool if not provided.
+
+    Returns:
+        Module with message classes, enums and `DESCRIPTOR`, like generated by protoc `_pb2` one.
+    """
+
+    pool = pool or descriptor_pool.Default()
+    file_descriptor_proto = build_file_descriptor(service=service)
+    serialized = file_descriptor_proto.SerializeToString()
+    try:
+        file_descriptor = pool.FindFileByName(file_descriptor_proto.name)
+    except KeyError:
+        file_descriptor = pool.AddSerializedFile(serialized)
+    else:
+        if file_descriptor.serialized_pb != serialized:
+            raise ValueError(
+                f"Proto file '{file_descriptor_proto.name}' already registered with "
+                "different content",
+            )
+
+    pb2 = types.ModuleType(f"{service.name.lower()}_pb2")
+    pb2.DESCRIPTOR = file_descriptor
+    for name, message_descriptor in file_descriptor.message_types_by_name.items():
+        setattr(pb2, name, message_factory.GetMessageClass(message_descriptor))
+    for name, enum_descriptor in file_descriptor.enum_types_by_name.items():
+        setattr(pb2, name, enum_type_wrapper.EnumTypeWrapper(enum_descriptor))
+    return pb2
+
+
+def build_pb2_grpc(service: Service, pb2):
+    """Create gRPC stub and servicer registration function in memory.
+
+    Args:
+        service (Service): Service description.
+        pb2: Module with message classes, created by `build_pb2`.
+
+    Returns:
+        Module with `<Service>Stub` class and `add_<Service>Servicer_to_server` function, like
+        generated by protoc `_pb2_grpc` one.
+    """
+
+    service_descriptor = pb2.DESCRIPTOR.services_by_name[service.name]
+    methods = {
+        method.name: (
+            f"/{service_descriptor.full_name}/{method.name}",
+            (method.client_streaming, method.server_streaming),
+            getattr(pb2, method.request.name),
+            getattr(pb2, method.response.name),
+        )
+        for method in service.methods.values()
+    }
+
+    def __init__(self, channel: grpc.aio.Channel):
+        for name, (path, streaming, request_class, response_class) in methods.items():
+            multicallable = getattr(channel, _MULTICALLABLES[streaming])
+            setattr(self, name, multicallable(
+                path,
+                request_serializer=request_class.SerializeToString,
+                response_deserializer=response_class.FromString,
+            ))
+
+    def add_servicer_to_server(servicer, server: grpc.aio.Server):
+        method_handlers = {
+            name: HANDLER_FACTORIES[streaming](
+                getattr(servicer, name),
+                request_deserializer=request_class.FromString,
+                response_serializer=response_class.SerializeToString,
+            )
+            for name, (_, streaming, request_class, response_class) in methods.items()
+        }
+        generic_handler = grpc.method_handlers_generic_handler(
+            service_descriptor.full_name,
+            method_handlers,
+        )
+        server.add_generic_rpc_handlers((generic_handler,))
+
+    pb2_grpc = types.ModuleType(f"{service.name.lower()}_pb2_grpc")
+    setattr(pb2_grpc, f"{service.name}Stub", type(f"{service.name}Stub", (), {
+        "__init__": __init__,
+    }))
+    setattr(pb2_grpc, f"add_{service.name}Servicer_to_server", add_servicer_to_server)
+    return pb2_grpc
+
+
+def _add_message(
+        service: Service,
+        message: Message,
+        message_descriptor: descriptor_pb2.DescriptorProto,
+):
+    message_descriptor.name = message.name
+    for number, field in enumerate(message.fields.values(), start=1):
+        field_descriptor = message_descriptor.field.add(name=field.name, number=number)
+        if isinstance(field, MapField):
+            entry_name = "".join(part.capitalize() for part in field.name.split("_")) + "Entry"
+            entry_descriptor = message_descriptor.nested_type.add(name=entry_name)
+            entry_descriptor.options.map_entry = True
+            for entry_number, (entry_field_name, type_) in enumerate(
+                    (("key", field.key), ("value", field.value)),
+                    start=1,
+            ):
+                _set_field_type(
+                    service=service,
+                    field=Field(name=entry_field_name, type=type_),
+                    field_descriptor=entry_descriptor.field.add(
+                        name=entry_field_name,
+                        number=entry_number,
+                    ),
+                )
+            field_descriptor.label = FieldDescriptorProto.LABEL_REPEATED
+            field_descriptor.type = FieldDescriptorProto.TYPE_MESSAGE
+            field_descriptor.type_name = f".{service.package_name}.{message.name}.{entry_name}"
+            continue
+
+        _set_field_type(service=service, field=field, field_descriptor=field_descriptor)
+        if field.repeated:
+            field_descriptor.label = FieldDescriptorProto.LABEL_REPEATED
+        elif field.optional:
+            field_descriptor.proto3_optional = True
+            field_descriptor.oneof_index = len(message_descriptor.oneof_decl)
+            message_descriptor.oneof_decl.add(name=f"_{field.name}")
+
+
+def _set_field_type(
+        service: Service,
+        field: Field,
+        field_descriptor: descriptor_pb2.FieldDescriptorProto,
+):
+    field_descriptor.label = FieldDescriptorProto.LABEL_OPTIONAL
+    if field.type in SCALAR_FIELD_TYPES:
+        field_descriptor.type = SCALAR_FIELD_TYPES[field.type]
+    elif field.type in service.enums:
+        field_descriptor.type = FieldDescriptorProto.TYPE_ENUM
+        field_descriptor.type_name = _get_type_name(service=service, name=field.type)
+    elif field.type in service.messages:
+        field_descriptor.type = FieldDescriptorProto.TYPE_MESSAGE
+        field_descriptor.type_name = _get_type_name(service=service, name=field.type)
+    else:
+        raise TypeError(f"Field '{field.name}': unsupported type '{field.type}'.")
+
+
+def _get_type_name(service: Service, name: str) -> str:
+    return f".{service.package_name}.{name}"
@@ -41,6 +41,8 @@ class Method(BaseModel):
     name: str
     request: Message
     response: Message
+    client_streaming: bool = False
+    server_streaming: bool = False
 
 
 class Service(BaseModel):
@@ -49,3 +51,4 @@ class Service(BaseModel):
     methods: dict[str, Method]
     messages: dict[str, Message]
     enums: dict[str, type[enum.Enum]]
+    models: dict[str, type[BaseModel]] = {}
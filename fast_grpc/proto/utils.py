@@ -1,12 +1,23 @@
+import hashlib
+import importlib.util
+import os
 import pathlib
+import shutil
+import sys
+import tempfile
+from types import ModuleType
 
+import google.protobuf
 import jinja2
-from grpc_tools import protoc
+from grpc_tools import grpc_version, protoc
 
 from .models import Service
 
 TEMPLATE_DIR_PATH = pathlib.Path(__file__).parent / "templates"
 JINJA_ENV = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATE_DIR_PATH), trim_blocks=True)
+DEFAULT_CACHE_PATH = pathlib.Path(
+    os.environ.get("FAST_GRPC_CACHE_PATH", pathlib.Path.home() / ".cache" / "fast_grpc"),
+)
 
 
 def render_proto(service: Service):
@@ -27,3 +38,90 @@ def compile_proto(proto_file: pathlib.Path, proto_path: pathlib.Path, grpc_path:
 
     if status_code != 0:
         raise RuntimeError("Protobuf compilation failed")
+
+
+def get_proto_hash(content: str) -> str:
+    """Get hash of proto content, protobuf and grpcio-tools versions.
+
+    Args:
+        content (str): Proto file content.
+
+    Returns:
+        Hex digest, that identifies compilation result.
+    """
+
+    digest = hashlib.sha256()
+    for part in (content, google.protobuf.__version__, grpc_version.VERSION):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def compile_proto_cached(content: str, file_prefix: str, cache_path: pathlib.Path) -> pathlib.Path:
+    """Compile proto content into content-addressed directory of cache.
+
+    Compilation is skipped if cache already has result for the same content and versions.
+    Result is compiled into temporary directory and atomically renamed, so concurrent writers
+    never see partial output.
+
+    Args:
+        content (str): Proto file content.
+        file_prefix (str): Name of proto file without extension.
+        cache_path (pathlib.Path): Path to cache directory.
+
+    Returns:
+        Path to directory with `.proto`, `_pb2.py` and `_pb2_grpc.py` files.
+    """
+
+    output_path = cache_path / f"{file_prefix}-{get_proto_hash(content=content)[:32]}"
+    if output_path.is_dir():
+        return output_path
+
+    cache_path.mkdir(parents=True, exist_ok=True)
+    temp_path = pathlib.Path(tempfile.mkdtemp(prefix=f".{file_prefix}-", dir=cache_path))
+    try:
+        proto_file = temp_path / f"{file_prefix}.proto"
+        proto_file.write_text(data=content)
+        compile_proto(proto_file=proto_file, proto_path=temp_path, grpc_path=temp_path)
+        try:
+            temp_path.rename(output_path)
+        except OSError:
+            # Another process has already written the same result
+            if not output_path.is_dir():
+                raise
+    finally:
+        if temp_path.exists():
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    return output_path
+
+
+def import_pb2(grpc_path: pathlib.Path, file_prefix: str) -> tuple[ModuleType, ModuleType]:
+    """Import `_pb2` and `_pb2_grpc` modules from directory.
+
+    Args:
+        grpc_path (pathlib.Path): Directory with generated modules.
+        file_prefix (str): Name of proto file without extension.
+
+    Returns:
+        Tuple of `_pb2` and `_pb2_grpc` modules.
+    """
+
+    return (
+        _import_module(path=grpc_path / f"{file_prefix}_pb2.py"),
+        _import_module(path=grpc_path / f"{file_prefix}_pb2_grpc.py"),
+    )
+
+
+def _import_module(path: pathlib.Path) -> ModuleType:
+    name = path.stem
+    module = sys.modules.get(name)
+    if module is not None and getattr(module, "__file__", None) == str(path):
+        return module
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # `_pb2_grpc` module imports `_pb2` one by name
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -1,269 +1,132 @@
 import functools
 import inspect
 import pathlib
-import sys
+import threading
 import weakref
-from typing import Any, Callable, Iterable, Self
+from typing import Any, Self
 
-import grpc
 from google._upb._message import MessageMeta  # pylint: disable=no-name-in-module
-from google.protobuf.json_format import MessageToDict, ParseDict
 from protobuf_to_pydantic import msg_to_pydantic_model
 from pydantic import BaseModel
 
 from . import proto
-from .data_processor import (
-    DataProcessor,
-    EnumByNameTypeProcessor,
-    EnumNameByValueTypeProcessor,
-)
-from .middleware import FastGRPCMiddleware
-
-
-async def _do_nothing(request):
-    pass
-
-
-class GRPCMethod:
-    def __init__(
-            self,
-            function: Callable = _do_nothing,
-            name: str | None = None,
-            request_model: type[BaseModel] | None = None,
-            response_model: type[BaseModel] | None = None,
-            middlewares: tuple[FastGRPCMiddleware | Callable] = (),
-            enabled: bool = True,
-    ):
-        self._function = function
-
-        names = (name, function.__name__)
-        names = [
-            name for name in names
-            if name and name != "_do_nothing"
-        ]
-        if not names:
-            raise ValueError("Parameter 'name' must be provided")
-        self._name = names[0]
-        self._aliases = tuple(set(names) - {self._name})
-
-        self._request_model = (
-            request_model or self._get_request_model_from_function(function=function)
-        )
-        self._response_model = (
-            response_model or self._get_response_model_from_function(function=function)
-        )
-        self._middlewares = middlewares
-        self._is_enabled = enabled
+from .client import generate_client
+from .codec import MessageCodec, build_codecs
+from .enums import ProtoEngine
+# Decorator is also imported from this module, where it was before
+from .method import GRPCMethod, grpc_method  # pylint: disable=unused-import
 
-    @property
-    def name(self) -> str:
-        return self._name
-
-    @property
-    def aliases(self) -> tuple[str]:
-        return self._aliases
-
-    @property
-    def request_model(self) -> type[BaseModel]:
-        return self._request_model
-
-    @property
-    def response_model(self) -> type[BaseModel]:
-        return self._response_model
+_LAZY_ATTRIBUTES = ("pb2", "pb2_grpc", "codecs", "Client")
+_MATERIALIZE_LOCK = threading.RLock()
 
-    @property
-    def middlewares(self) -> tuple[FastGRPCMiddleware | Callable]:
-        return self._middlewares
 
-    @property
-    def is_enabled(self) -> bool:
-        return self._is_enabled
+class _LazyServiceAttribute:
+    """Placeholder of service attribute, that materializes service on first access."""
 
-    @staticmethod
-    def _get_request_model_from_function(function: Callable) -> type[BaseModel]:
-        signature = inspect.signature(function)
-        if "request" not in signature.parameters:
-            raise TypeError("GRPC method should have 'request' parameter")
+    def __init__(self, service_class: type, name: str):
+        self._service_class = service_class
+        self._name = name
 
-        request_parameter = signature.parameters["request"]
-        if request_parameter.annotation is inspect.Parameter.empty:
-            raise TypeError("GRPC method argument 'request' must have pydantic model annotation")
-        if not issubclass(request_parameter.annotation, BaseModel):
-            raise TypeError("GRPC method parameter 'request' should be pydantic model")
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        self._service_class.materialize()
+        return getattr(instance if instance is not None else self._service_class, self._name)
 
-        return request_parameter.annotation
 
-    @staticmethod
-    def _get_response_model_from_function(function: Callable) -> type[BaseModel]:
-        signature = inspect.signature(function)
-        if signature.return_annotation is inspect.Parameter.empty:
-            raise TypeError("GRPC method must have pydantic model return annotation")
-        if not issubclass(signature.return_annotation, BaseModel):
-            raise TypeError("GRPC method should have pydantic model in return annotation")
-
-        return signature.return_annotation
-
-    def __get__(self, instance: object | None, cls: type):
-        if instance is None:
-            return self
-        return functools.partial(self.__call__, instance)
-
-    async def __call__(self, service: "FastGRPCService", request, context):
-        request_data = MessageToDict(
-            request,
-            always_print_fields_with_no_presence=True,
-            preserving_proto_field_name=True,
-        )
-        request_data = DataProcessor(
-            EnumByNameTypeProcessor(),
-        )(data=request_data, model=self._request_model)
-        inner_request = self._request_model.model_validate(request_data)
-        function = self._apply_middlewares_to_function(
-            function=self._function,
-            service=service,
-            middlewares=service.middlewares + self._middlewares,
-        )
-
-        response = await function(request=inner_request, context=context)
-
-        response_data = response.model_dump(mode="json")
-        response_data = DataProcessor(
-            EnumNameByValueTypeProcessor(),
-        )(data=response_data, model=self._response_model)
-        grpc_model = getattr(service.pb2, self._response_model.__name__)
-        return ParseDict(
-            response_data,
-            grpc_model(),
-            ignore_unknown_fields=True,
-        )
-
-    @staticmethod
-    def _apply_middlewares_to_function(
-            function: Callable,
-            service: "FastGRPCService",
-            middlewares: tuple[FastGRPCMiddleware | Callable] = (),
-    ) -> Callable:
-        signature = inspect.signature(function)
-
-        async def wrapper(request, context: grpc.ServicerContext) -> BaseModel:
-            args = {"request": request}
-            if "self" in signature.parameters:
-                args["self"] = service
-            if "context" in signature.parameters:
-                args["context"] = context
-            return await function(**args)
-
-        for middleware in middlewares[::-1]:
-            wrapper = functools.partial(middleware, wrapper)
-
-        return wrapper
-
-
-def grpc_method(
-        function: Callable | None = None,
-        /,
-        name: str | None = None,
-        request_model: type[BaseModel] | None = None,
-        response_model: type[BaseModel] | None = None,
-        middlewares: Iterable[FastGRPCMiddleware | Callable] = (),
-        disable: bool = False,
-):
-    """Decorator for setting method as gRPC.
-    
-    Args:
-        function (Callable | None): Original request handler.
-        name (str | None): Name for gRPC method.
-        request_model (type[pydantic.BaseModel] | None): Model for describe request data.
-        response_model (type[pydantic.BaseModel] | None): Model for describe response data.
-        middlewares (Iterable[FastGRPCMiddleware | Callable]): Iterable of middlewares.
-        disable (bool): Flag for enable/disable gRPC method.
-
-    Example:
-        ```python
-        from fast_grpc import FastGRPCService, grpc_method
-        from pydantic import BaseModel
-
-        class ExampleService(FastGRPCService):
-            @grpc_method
-            async def ping(self, request: BaseModel) -> BaseModel:
-                ...
-
-            @grpc_method(
-                name="isHealth",
-                request_model=BaseModel,
-                response_model=BaseModel,
-                middlewares=(),
-                disable=False,
-            )
-            async def is_health(self, request, context):
-                ...
-        ```
-    """
-
-    def decorator(function: Callable) -> GRPCMethod:
-        return GRPCMethod(
-            function=function,
-            name=name,
-            request_model=request_model,
-            response_model=response_model,
-            middlewares=tuple(middlewares),
-            enabled=not disable,
-        )
-
-    if function is not None:
-        return decorator(function=function)
-    return decorator
+def _is_materialized(service_class: type) -> bool:
+    # Client is set last by materialization
+    return not isinstance(service_class.__dict__.get("Client"), _LazyServiceAttribute)
 
 
 class FastGRPCServiceMeta(type):
+    _services: "weakref.WeakSet[FastGRPCServiceMeta]" = weakref.WeakSet()
+
     def __init__(cls, name: str, bases: tuple[type], attributes: dict[str, Any]):
         cls.is_enabled = not attributes.get("disabled", False)
         cls.is_proxy = attributes.get("is_proxy", False)
         cls.name = attributes.pop("name", name)
         cls.package_name = attributes.pop("package_name", name.lower())
         cls.proto_path = pathlib.Path(attributes.pop("proto_path", pathlib.Path.cwd()))
-        cls.grpc_path = pathlib.Path(attributes.pop("grpc_path", pathlib.Path.cwd()))
+        cls.grpc_path = pathlib.Path(attributes.pop("grpc_path", proto.DEFAULT_CACHE_PATH))
         cls.save_proto = attributes.pop("save_proto", False)
+        cls.engine = ProtoEngine(attributes.pop("engine", ProtoEngine.DESCRIPTOR))
         cls.middlewares = tuple(attributes.pop("middlewares", ()))
 
         cls._grpc_methods = cls._gather_grpc_methods()  # pylint: disable=no-value-for-parameter
-        cls._proto_service = cls.get_proto_service(
-            name=cls.name,
-            grpc_methods=cls._grpc_methods,
-        )
+        cls._proto_service = None
         if cls.is_enabled and not cls.is_proxy:
-            cls.pb2, cls.pb2_grpc = cls.generate_pb2(
-                proto_service=cls._proto_service,
-                proto_path=cls.proto_path,
-                grpc_path=cls.grpc_path,
-                save_proto=cls.save_proto,
-            )
-            cls.Client: type = cls.generate_client(
+            cls._pb2_modules = (attributes.get("pb2"), attributes.get("pb2_grpc"))
+            for attribute_name in _LAZY_ATTRIBUTES:
+                lazy_attribute = _LazyServiceAttribute(service_class=cls, name=attribute_name)
+                setattr(cls, attribute_name, lazy_attribute)
+            FastGRPCServiceMeta._services.add(cls)
+
+        super().__init__(name, bases, attributes)
+
+    @property
+    def grpc_methods(cls) -> dict[str, GRPCMethod]:
+        return cls._grpc_methods
+
+    @property
+    def proto_service(cls) -> proto.Service:
+        proto_service = cls.__dict__.get("_proto_service")
+        if proto_service is None:
+            proto_service = cls.get_proto_service(
                 name=cls.name,
                 grpc_methods=cls._grpc_methods,
-                pb2=cls.pb2,
-                pb2_grpc=cls.pb2_grpc,
+                package_name=cls.package_name,
             )
-        weakref.finalize(cls, cls.__del__)
+            cls._proto_service = proto_service
+        return proto_service
 
-        super().__init__(name, bases, attributes)
+    @property
+    def is_materialized(cls) -> bool:
+        return _is_materialized(service_class=cls)
 
-    def __del__(cls):
-        if not cls.is_enabled or cls.is_proxy:
-            return
+    def materialize(cls):
+        """Build pb2 modules, codecs and client of service, deferred since class creation.
 
-        service_name = cls._proto_service.name.lower()
-        pb2_file = cls.grpc_path / f"{service_name}_pb2.py"
-        if pb2_file.is_file():
-            pb2_file.unlink()
-        pb2_grpc_file = cls.grpc_path / f"{service_name}_pb2_grpc.py"
-        if pb2_grpc_file.is_file():
-            pb2_grpc_file.unlink()
+        Called implicitly on first access to `pb2`, `pb2_grpc`, `codecs` or `Client`, does
+        nothing for already materialized, disabled and proxy services.
+        """
+
+        with _MATERIALIZE_LOCK:
+            if _is_materialized(service_class=cls):
+                return
+
+            proto_service = cls.proto_service
+            pb2, pb2_grpc = cls._pb2_modules
+            if pb2 is None or pb2_grpc is None:
+                pb2, pb2_grpc = cls.generate_pb2(
+                    proto_service=proto_service,
+                    proto_path=cls.proto_path,
+                    grpc_path=cls.grpc_path,
+                    save_proto=cls.save_proto,
+                    engine=cls.engine,
+                )
+            codecs = build_codecs(service=proto_service, pb2=pb2)
+            client = cls.generate_client(
+                name=cls.name,
+                grpc_methods=cls._grpc_methods,
+                pb2_grpc=pb2_grpc,
+                codecs=codecs,
+                service_name=pb2.DESCRIPTOR.services_by_name[cls.name].full_name,
+            )
+            cls.pb2, cls.pb2_grpc, cls.codecs = pb2, pb2_grpc, codecs
+            # Client is set last, it marks service as materialized
+            cls.Client = client
+
+    @classmethod
+    def materialize_all(cls):
+        """Materialize all created services at once, e.g. before server start."""
+
+        for service_class in tuple(cls._services):
+            service_class.materialize()
 
     def _gather_grpc_methods(cls) -> dict[str, GRPCMethod]:
         grpc_methods = {}
         for attribute_name in dir(cls):
-            attribute = getattr(cls, attribute_name)
+            # Static lookup does not materialize parent services
+            attribute = inspect.getattr_static(cls, attribute_name)
             if not isinstance(attribute, GRPCMethod) or not attribute.is_enabled:
                 continue
 
@@ -294,6 +157,8 @@ class FastGRPCServiceMeta(type):
                 name=grpc_method_name,
                 request=request_message,
                 response=response_message,
+                client_streaming=grpc_method.client_streaming,
+                server_streaming=grpc_method.server_streaming,
             )
             for model in models.values():
                 message = proto.get_message_from_model(model)
@@ -306,6 +171,7 @@ class FastGRPCServiceMeta(type):
             methods=methods,
             messages=messages,
             enums=enums,
+            models=models,
         )
 
     @staticmethod
@@ -314,68 +180,44 @@ class FastGRPCServiceMeta(type):
             proto_path: pathlib.Path,
             grpc_path: pathlib.Path,
             save_proto: bool = False,
+            engine: ProtoEngine = ProtoEngine.DESCRIPTOR,
     ) -> tuple:
         file_prefix = proto_service.name.lower()
-        proto_file = proto_path / f"{file_prefix}.proto"
-        try:
-            content = proto.render_proto(service=proto_service)
-            proto_file.write_text(data=content)
-            proto.compile_proto(proto_file=proto_file, proto_path=proto_path,
-                                grpc_path=grpc_path)
-        finally:
-            if proto_file.is_file() and not save_proto:
-                proto_file.unlink()
-
-        grpc_path = str(grpc_path)
-        if grpc_path not in sys.path:
-            sys.path.append(grpc_path)
-        pb2 = __import__(f"{file_prefix}_pb2")
-        pb2_grpc = __import__(f"{file_prefix}_pb2_grpc")
-
-        return pb2, pb2_grpc
+        content = proto.render_proto(service=proto_service)
+        if save_proto:
+            (proto_path / f"{file_prefix}.proto").write_text(data=content)
+
+        if engine == ProtoEngine.DESCRIPTOR:
+            pb2 = proto.build_pb2(service=proto_service)
+            pb2_grpc = proto.build_pb2_grpc(service=proto_service, pb2=pb2)
+            return pb2, pb2_grpc
+
+        output_path = proto.compile_proto_cached(
+            content=content,
+            file_prefix=file_prefix,
+            cache_path=grpc_path,
+        )
+        return proto.import_pb2(grpc_path=output_path, file_prefix=file_prefix)
 
     @staticmethod
-    def generate_client(name: str, grpc_methods: dict[str, Any], pb2, pb2_grpc) -> type:
-        class_name = f"{name}Client"
-        attributes = {}
-        for grpc_method_name, grpc_method in grpc_methods.items():
-            async def wrapper(
-                    self,
-                    request,
-                    _grpc_method: GRPCMethod = grpc_method,
-            ) -> BaseModel:
-                call_rpc = getattr(self.stub, _grpc_method.name)
-                grpc_request_message_class = getattr(pb2, _grpc_method.request_model.__name__)
-                grpc_request_message_data = request.model_dump(mode="json")
-                grpc_request_message_data = DataProcessor(
-                    EnumNameByValueTypeProcessor(),
-                )(data=grpc_request_message_data, model=_grpc_method.request_model)
-                grpc_request_message = ParseDict(
-                    grpc_request_message_data,
-                    grpc_request_message_class(),
-                )
-                grpc_response_message = await call_rpc(request=grpc_request_message)
-                grpc_response_message_data = MessageToDict(
-                    grpc_response_message,
-                    always_print_fields_with_no_presence=True,
-                    preserving_proto_field_name=True,
-                )
-                grpc_response_message_data = DataProcessor(
-                    EnumByNameTypeProcessor(),
-                )(data=grpc_response_message_data, model=_grpc_method.response_model)
-                return _grpc_method.response_model.model_validate(grpc_response_message_data)
-
-            attributes[grpc_method_name] = wrapper
-            for alias in grpc_method.aliases:
-                attributes[alias] = wrapper
-
-        def __init__(self, host: str, port: int):
-            channel = grpc.aio.insecure_channel(f"{host}:{port}")
-            self.stub = getattr(pb2_grpc, f"{name}Stub")(channel)
+    def generate_client(
+            name: str,
+            grpc_methods: dict[str, GRPCMethod],
+            pb2_grpc,
+            codecs: dict[str, MessageCodec],
+            service_name: str | None = None,
+    ) -> type:
+        return generate_client(
+            name=name,
+            grpc_methods=grpc_methods,
+            pb2_grpc=pb2_grpc,
+            codecs=codecs,
+            service_name=service_name,
+        )
 
-        attributes["__init__"] = __init__
 
-        return type(class_name, (), attributes)
+def _match_cache_key(key: tuple, name: str, request_data: bytes | None) -> bool:
+    return key[0] == name and (request_data is None or key[1] == request_data)
 
 
 class FastGRPCService(metaclass=FastGRPCServiceMeta):
@@ -398,6 +240,43 @@ class FastGRPCService(metaclass=FastGRPCServiceMeta):
 
         return self.pb2.DESCRIPTOR.services_by_name[self.name].full_name
 
+    async def on_startup(self):
+        """Hook, called by server before it starts accepting requests, e.g. for opening
+        connections and warming caches.
+        """
+
+    async def on_shutdown(self):
+        """Hook, called by server after it is stopped and in-flight requests are drained, e.g.
+        for closing connections.
+        """
+
+    @classmethod
+    def invalidate_cache(cls, method_name: str | None = None, request: BaseModel | None = None):
+        """Remove cached responses of service methods.
+
+        Args:
+            method_name (str | None): Name of gRPC method, all methods if not provided.
+            request (BaseModel | None): Request, which responses should be removed, all responses
+                if not provided.
+        """
+
+        for grpc_method in cls.grpc_methods.values():
+            if grpc_method.cache is None:
+                continue
+            method_names = (grpc_method.name, *grpc_method.aliases)
+            if method_name is not None and method_name not in method_names:
+                continue
+
+            request_data = None
+            if request is not None:
+                request_codec = cls.codecs[grpc_method.request_model.__name__]
+                request_data = request_codec.encode(request).SerializeToString(deterministic=True)
+            grpc_method.cache.invalidate(match=functools.partial(
+                _match_cache_key,
+                name=grpc_method.name,
+                request_data=request_data,
+            ))
+
     @classmethod
     def get_proto(cls) -> str:
         """Render and return content of proto file for this gRPC service.
@@ -406,17 +285,24 @@ class FastGRPCService(metaclass=FastGRPCServiceMeta):
             Protobuf file content string.
         """
 
-        content = proto.render_proto(service=cls._proto_service)
+        content = proto.render_proto(service=cls.proto_service)
         return content
 
     @classmethod
     def from_proto(
             cls,
             proto_file: str | pathlib.Path,
-            grpc_path: str | pathlib.Path = pathlib.Path.cwd(),
+            grpc_path: str | pathlib.Path = proto.DEFAULT_CACHE_PATH,
     ) -> type[Self]:
         """Create gRPC service interface from proto file.
 
+        Compiled modules are stored in content-addressed cache directory and reused, while proto
+        file content, protobuf and grpcio-tools versions are the same.
+
+        Args:
+            proto_file (str | pathlib.Path): Path to proto file.
+            grpc_path (str | pathlib.Path): Path to cache directory for compiled modules.
+
         Returns:
             New service class, based on FastGRPCService.
         """
@@ -431,15 +317,13 @@ class FastGRPCService(metaclass=FastGRPCServiceMeta):
                 f"Proto file must have '.proto' extension, not '{proto_file.suffix}'",
             )
 
-        proto.compile_proto(
-            proto_file=proto_file,
-            proto_path=proto_path,
-            grpc_path=grpc_path,
-        )
-        if (grpc_path_str := str(grpc_path)) not in sys.path:
-            sys.path.append(grpc_path_str)
         file_prefix = proto_file.stem
-        pb2 = __import__(f"{file_prefix}_pb2")
+        output_path = proto.compile_proto_cached(
+            content=proto_file.read_text(encoding="utf-8"),
+            file_prefix=file_prefix,
+            cache_path=grpc_path,
+        )
+        pb2, pb2_grpc = proto.import_pb2(grpc_path=output_path, file_prefix=file_prefix)
 
         methods = {}
         messages = {}
@@ -458,15 +342,19 @@ class FastGRPCService(metaclass=FastGRPCServiceMeta):
                 name=method.name,
                 request_model=messages[method.input_type.name],
                 response_model=messages[method.output_type.name],
+                client_streaming=method.client_streaming,
+                server_streaming=method.server_streaming,
             )
             methods[grpc_method.name] = grpc_method
 
         cls_name = service_name
-        bases = ()
+        bases = (cls,)
         attributes = methods | {
             "name": service_name,
             "package_name": pb2.DESCRIPTOR.package,
             "proto_path": proto_path,
             "grpc_path": grpc_path,
+            "pb2": pb2,
+            "pb2_grpc": pb2_grpc,
         }
         return FastGRPCServiceMeta(cls_name, bases, attributes)
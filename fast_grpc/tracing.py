@@ -0,0 +1,252 @@
+import contextlib
+import contextvars
+import random
+from typing import Any, AsyncIterator, Callable, ContextManager, Iterator, Mapping
+
+# Sampling decision of current request, None outside of requests
+_sampled: contextvars.ContextVar[bool | None] = contextvars.ContextVar("sampled", default=None)
+# Metadata key of sampling decision, passed to called services with trace context
+_SAMPLED_METADATA_KEY = "fast-grpc-sampled"
+
+
+class Tracer:
+    """Tracing hooks, that do nothing.
+
+    Subclasses adapt tracing libraries, see `OpenTelemetryTracer`.
+    """
+
+    def start_span(
+            self,
+            name: str,
+            attributes: dict[str, Any] | None = None,
+            parent: Any = None,
+    ) -> ContextManager:
+        """Start span and make it current.
+
+        Args:
+            name (str): Name of span.
+            attributes (dict[str, Any] | None): Attributes of span.
+            parent (Any): Parent context, extracted from request metadata, current span is
+                parent if not provided.
+
+        Returns:
+            Context manager, that ends span on exit.
+        """
+
+        return contextlib.nullcontext()
+
+    def attach(self, parent: Any) -> ContextManager:
+        """Make parent context current without starting span, so it is propagated further.
+
+        Returns:
+            Context manager, that restores previous context on exit.
+        """
+
+        return contextlib.nullcontext()
+
+    def inject(self, metadata: dict[str, str]):
+        """Write context of current span into outgoing request metadata."""
+
+    def extract(self, metadata: Mapping[str, str]) -> Any:
+        """Read parent context from incoming request metadata."""
+
+        return None
+
+    def is_sampled(self, parent: Any) -> bool | None:
+        """Get sampling decision of parent context, None if it is unknown."""
+
+        return None
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracing hooks with OpenTelemetry API, requires `opentelemetry-api` package.
+
+    Args:
+        tracer_provider: OpenTelemetry tracer provider, global one if not provided.
+    """
+
+    def __init__(self, tracer_provider: Any = None):
+        try:
+            # pylint: disable=import-outside-toplevel
+            from opentelemetry import context, propagate, trace
+        except ImportError as error:
+            raise ImportError(
+                "OpenTelemetry tracing requires 'opentelemetry-api' package, install "
+                "'py-fast-grpc[opentelemetry]'",
+            ) from error
+
+        self._context = context
+        self._propagate = propagate
+        self._trace = trace
+        self._tracer = trace.get_tracer("fast_grpc", tracer_provider=tracer_provider)
+
+    def start_span(
+            self,
+            name: str,
+            attributes: dict[str, Any] | None = None,
+            parent: Any = None,
+    ) -> ContextManager:
+        return self._tracer.start_as_current_span(name, context=parent, attributes=attributes)
+
+    @contextlib.contextmanager
+    def attach(self, parent: Any) -> Iterator[None]:
+        token = self._context.attach(parent)
+        try:
+            yield
+        finally:
+            self._context.detach(token)
+
+    def inject(self, metadata: dict[str, str]):
+        self._propagate.inject(metadata)
+
+    def extract(self, metadata: Mapping[str, str]) -> Any:
+        return self._propagate.extract(metadata)
+
+    def is_sampled(self, parent: Any) -> bool | None:
+        span_context = self._trace.get_current_span(parent).get_span_context()
+        if not span_context.is_valid:
+            return None
+        return span_context.trace_flags.sampled
+
+
+class Tracing:
+    """Tracing of server requests, their handling stages and client calls.
+
+    Requests follow sampling decision of their parent context or of calling service, passed in
+    metadata, others are traced with probability of sample rate. Stages and client calls of not
+    traced requests are not traced too, and their decision is passed to called services.
+
+    Args:
+        tracer (Tracer): Tracing hooks.
+        sample_rate (float): Probability of tracing request without parent context.
+
+    Example:
+        ```python
+        tracing = Tracing(tracer=OpenTelemetryTracer(), sample_rate=0.01)
+        app = FastGRPC(ExampleService(), tracing=tracing)
+        client = ExampleService.Client(host="localhost", port=50051, tracing=tracing)
+        ```
+    """
+
+    def __init__(self, tracer: Tracer, sample_rate: float = 1.0):
+        self.tracer = tracer
+        self.sample_rate = sample_rate
+
+    def should_sample(self, parent: Any = None, metadata: Mapping[str, str] | None = None) -> bool:
+        """Decide on tracing of request by sampling decision of parent context, then by one of
+        calling service in request metadata, then randomly by sample rate."""
+
+        sampled = self.tracer.is_sampled(parent) if parent is not None else None
+        if sampled is None and metadata:
+            flag = metadata.get(_SAMPLED_METADATA_KEY)
+            if flag is not None:
+                sampled = flag == "1"
+        if sampled is None:
+            return random.random() < self.sample_rate
+        return sampled
+
+    def trace_request(
+            self,
+            method_name: str,
+            method: Callable,
+            streaming: bool = False,
+    ) -> Callable:
+        """Wrap request handler into server span, with parent context from request metadata."""
+
+        tracer = self.tracer
+        service_name, _, rpc_method = method_name.lstrip("/").partition("/")
+        attributes = {"rpc.system": "grpc", "rpc.service": service_name, "rpc.method": rpc_method}
+
+        def start(context) -> tuple[bool, ContextManager]:
+            metadata = dict(context.invocation_metadata() or ())
+            parent = tracer.extract(metadata)
+            if self.should_sample(parent=parent, metadata=metadata):
+                span = tracer.start_span(name=method_name, attributes=attributes, parent=parent)
+                return True, span
+            # Not traced request keeps parent context, so client calls propagate its decision
+            return False, tracer.attach(parent)
+
+        if streaming:
+            async def traced_stream_method(request_or_iterator, context) -> AsyncIterator:
+                sampled, scope = start(context)
+                token = _sampled.set(sampled)
+                try:
+                    with scope:
+                        async for response in method(request_or_iterator, context):
+                            yield response
+                finally:
+                    _sampled.reset(token)
+
+            return traced_stream_method
+
+        async def traced_method(request_or_iterator, context):
+            sampled, scope = start(context)
+            token = _sampled.set(sampled)
+            try:
+                with scope:
+                    return await method(request_or_iterator, context)
+            finally:
+                _sampled.reset(token)
+
+        return traced_method
+
+    def trace_stage(self, name: str, function: Callable) -> Callable:
+        """Wrap function of request handling stage into span, if request is traced."""
+
+        tracer = self.tracer
+
+        def wrapper(*args):
+            if not _sampled.get():
+                return function(*args)
+            with tracer.start_span(name=name):
+                return function(*args)
+
+        return wrapper
+
+    def trace_async_stage(self, name: str, function: Callable) -> Callable:
+        """Wrap coroutine function of request handling stage into span, if request is traced."""
+
+        tracer = self.tracer
+
+        async def wrapper(*args):
+            if not _sampled.get():
+                return await function(*args)
+            with tracer.start_span(name=name):
+                return await function(*args)
+
+        return wrapper
+
+    async def call(
+            self,
+            method_name: str,
+            call_rpc: Callable,
+            request: Any,
+            timeout: float | None = None,
+    ) -> Any:
+        """Make unary response client call in span, passing its context in request metadata.
+
+        Call inside of request follows its sampling decision, others are sampled by sample rate.
+        """
+
+        sampled = _sampled.get()
+        if sampled is None:
+            sampled = self.should_sample()
+        token = _sampled.set(sampled)
+        try:
+            if not sampled:
+                return await call_rpc(request, timeout=timeout, metadata=self.get_metadata())
+            with self.tracer.start_span(name=method_name, attributes={"rpc.system": "grpc"}):
+                return await call_rpc(request, timeout=timeout, metadata=self.get_metadata())
+        finally:
+            _sampled.reset(token)
+
+    def get_metadata(self) -> tuple[tuple[str, str], ...] | None:
+        """Get metadata with current trace context and sampling decision for client call, None
+        if there is no one."""
+
+        metadata = {}
+        self.tracer.inject(metadata)
+        sampled = _sampled.get()
+        if sampled is not None:
+            metadata[_SAMPLED_METADATA_KEY] = "1" if sampled else "0"
+        return tuple(metadata.items()) or None
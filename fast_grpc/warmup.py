@@ -0,0 +1,121 @@
+import time
+from typing import AsyncIterator, Callable, Iterable
+
+import grpc
+from pydantic import BaseModel
+
+from .codec import MessageCodec
+
+
+class WarmupReport(BaseModel):
+    """Timings of warm-up before server start.
+
+    Args:
+        codecs (dict[str, float]): Time in seconds of exercising codecs and models by service.
+        requests (dict[str, float]): Time in seconds of replaying sample requests by method.
+        failed (list[str]): Methods, that failed to handle sample requests.
+        duration (float): Total time in seconds.
+    """
+
+    codecs: dict[str, float] = {}
+    requests: dict[str, float] = {}
+    failed: list[str] = []
+    duration: float = 0.0
+
+
+class WarmupContext:
+    """Servicer context of sample requests, that are handled in process without gRPC call."""
+
+    def __init__(self):
+        self._code: grpc.StatusCode | None = None
+        self._details: str | None = None
+
+    def invocation_metadata(self) -> tuple:
+        return ()
+
+    def time_remaining(self) -> float | None:
+        return None
+
+    def peer(self) -> str:
+        return "warmup"
+
+    def code(self) -> grpc.StatusCode | None:
+        return self._code
+
+    def details(self) -> str | None:
+        return self._details
+
+    def set_code(self, code: grpc.StatusCode):
+        self._code = code
+
+    def set_details(self, details: str):
+        self._details = details
+
+    def set_compression(self, compression: grpc.Compression):
+        pass
+
+    def set_trailing_metadata(self, trailing_metadata: tuple):
+        pass
+
+    async def send_initial_metadata(self, initial_metadata: tuple):
+        pass
+
+    async def abort(self, code: grpc.StatusCode, details: str = "", trailing_metadata=()):
+        self._code, self._details = code, details
+        raise grpc.aio.AbortError(f"{code.name}: {details}")
+
+
+def exercise_codecs(codecs: Iterable[MessageCodec]) -> float:
+    """Run round trip of empty message through each codec, so lazy parts of protobuf classes
+    and pydantic models are built.
+
+    Returns:
+        Time in seconds.
+    """
+
+    start = time.perf_counter()
+    for codec in codecs:
+        message = codec.encode(codec.model.model_construct())
+        message = codec.message_class.FromString(message.SerializeToString())
+        for decode in (codec.decode, codec.decode_trusted):
+            try:
+                decode(message)
+            except ValueError:
+                # Empty message is not valid for every model, converters are exercised anyway
+                pass
+    return time.perf_counter() - start
+
+
+async def replay_requests(
+        handler: Callable,
+        messages: Iterable,
+        client_streaming: bool = False,
+        server_streaming: bool = False,
+) -> float:
+    """Handle sample request messages by bound handler of method.
+
+    Args:
+        handler (Callable): Handler, returned by `GRPCMethod.bind`.
+        messages (Iterable): Protobuf request messages, one stream of them for client
+            streaming.
+        client_streaming (bool): Flag of method with stream of requests.
+        server_streaming (bool): Flag of method with stream of responses.
+
+    Returns:
+        Time in seconds.
+    """
+
+    start = time.perf_counter()
+    requests = (_iterate(messages=messages),) if client_streaming else messages
+    for request in requests:
+        if server_streaming:
+            async for _ in handler(request, WarmupContext()):
+                pass
+        else:
+            await handler(request, WarmupContext())
+    return time.perf_counter() - start
+
+
+async def _iterate(messages: Iterable) -> AsyncIterator:
+    for message in messages:
+        yield message
@@ -1,8 +1,59 @@
+import contextlib
 import random
+import socket
+from typing import AsyncContextManager, AsyncIterator, Callable
 
 import pytest
 
+from fast_grpc import FastGRPC
+from fast_grpc.warmup import WarmupContext
+
 
 @pytest.fixture(scope="session", autouse=True)
 def faker_seed():
     return random.seed()
+
+
+@pytest.fixture
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def _serve(app: FastGRPC) -> AsyncIterator[FastGRPC]:
+    await app.start()
+    try:
+        yield app
+    finally:
+        await app.stop(grace=0)
+
+
+@pytest.fixture
+def serve() -> Callable[[FastGRPC], AsyncContextManager[FastGRPC]]:
+    """Runner of app in event loop of test, used as `async with serve(app):`."""
+
+    return _serve
+
+
+class PyTestServicerContext(WarmupContext):
+    """Servicer context of requests, that tests pass to handlers without gRPC call."""
+
+    def __init__(self, metadata: tuple = (), time_remaining: float | None = None):
+        super().__init__()
+        self._metadata = metadata
+        self._time_remaining = time_remaining
+
+    def invocation_metadata(self) -> tuple:
+        return self._metadata
+
+    def time_remaining(self) -> float | None:
+        return self._time_remaining
+
+
+@pytest.fixture
+def make_context() -> Callable[..., PyTestServicerContext]:
+    """Factory of servicer contexts, used as `make_context(metadata=..., time_remaining=...)`."""
+
+    return PyTestServicerContext
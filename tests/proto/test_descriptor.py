@@ -0,0 +1,106 @@
+import enum
+import pathlib
+
+from google.protobuf import descriptor_pb2, descriptor_pool
+from grpc_tools import protoc
+from pydantic import BaseModel
+
+from fast_grpc.proto import build_file_descriptor, build_pb2, build_pb2_grpc, render_proto
+from fast_grpc.service import FastGRPCServiceMeta, GRPCMethod
+
+
+class DescriptorEnum(enum.Enum):
+    FIRST = "first"
+    SECOND = "second"
+
+
+class DescriptorItem(BaseModel):
+    name: str
+    kind: DescriptorEnum
+
+
+class DescriptorRequest(BaseModel):
+    number: int
+    ratio: float | None = None
+    items: list[DescriptorItem]
+    item: DescriptorItem | None = None
+    by_name: dict[str, DescriptorItem]
+    scores: dict[int, float]
+    kinds: list[DescriptorEnum]
+
+
+class DescriptorResponse(BaseModel):
+    ok: bool
+    payload: bytes
+
+
+def make_service(package_name: str):
+    grpc_methods = {
+        "unary": GRPCMethod(
+            name="unary",
+            request_model=DescriptorRequest,
+            response_model=DescriptorResponse,
+        ),
+        "bidi": GRPCMethod(
+            name="bidi",
+            request_model=DescriptorRequest,
+            response_model=DescriptorResponse,
+            client_streaming=True,
+            server_streaming=True,
+        ),
+    }
+    return FastGRPCServiceMeta.get_proto_service(
+        name="DescriptorService",
+        grpc_methods=grpc_methods,
+        package_name=package_name,
+    )
+
+
+def test_build_file_descriptor_matches_protoc(tmp_path: pathlib.Path):
+    service = make_service(package_name="descriptor.test")
+    proto_file = tmp_path / "descriptor.proto"
+    proto_file.write_text(data=render_proto(service=service))
+    descriptor_set_file = tmp_path / "descriptor.pb"
+
+    status_code = protoc.main([
+        "protoc",
+        f"--proto_path={tmp_path}",
+        f"--descriptor_set_out={descriptor_set_file}",
+        str(proto_file),
+    ])
+    descriptor_set = descriptor_pb2.FileDescriptorSet.FromString(descriptor_set_file.read_bytes())
+    expected_file_descriptor = descriptor_set.file[0]
+    # Descriptor set keeps json names and empty method options, which are not part of schema
+    for message_type in expected_file_descriptor.message_type:
+        for field in (
+                *message_type.field,
+                *(field for nested in message_type.nested_type for field in nested.field),
+        ):
+            field.ClearField("json_name")
+    for method in expected_file_descriptor.service[0].method:
+        method.ClearField("options")
+    file_descriptor = build_file_descriptor(service=service)
+    file_descriptor.name = expected_file_descriptor.name
+
+    assert status_code == 0
+    assert file_descriptor == expected_file_descriptor
+
+
+def test_build_pb2():
+    # Messages of pb2 module, built in memory, are unknown to pylint
+    # pylint: disable=no-member
+    service = make_service(package_name="descriptor.pb2")
+    pool = descriptor_pool.DescriptorPool()
+
+    pb2 = build_pb2(service=service, pool=pool)
+    pb2_grpc = build_pb2_grpc(service=service, pb2=pb2)
+    message = pb2.DescriptorRequest(number=1, kinds=[pb2.DescriptorEnum.Value("SECOND")])
+    message.by_name["test"].name = "test"
+
+    assert pb2.DESCRIPTOR.services_by_name["DescriptorService"].full_name == (
+        "descriptor.pb2.DescriptorService"
+    )
+    assert pb2.DescriptorRequest.FromString(message.SerializeToString()) == message
+    assert hasattr(pb2_grpc, "DescriptorServiceStub")
+    assert hasattr(pb2_grpc, "add_DescriptorServiceServicer_to_server")
+    assert build_pb2(service=service, pool=pool).DESCRIPTOR is pb2.DESCRIPTOR
@@ -1,8 +1,16 @@
 import pathlib
 
+import pytest
 from faker import Faker
 
-from fast_grpc.proto import Service, compile_proto, render_proto
+from fast_grpc.proto import (
+    Service,
+    compile_proto,
+    compile_proto_cached,
+    get_proto_hash,
+    render_proto,
+    utils,
+)
 
 
 def test_render_proto(faker: Faker):
@@ -37,3 +45,61 @@ def test_compile_proto(tmp_path: pathlib.Path):
     compile_proto(proto_file=proto_file, proto_path=tmp_path, grpc_path=tmp_path)
 
     assert expected_pb2_file.is_file() and expected_pb2_grpc_file.is_file()
+
+
+PROTO_CONTENT = """
+syntax = "proto3";
+package cached;
+
+service Cached {}
+"""
+
+
+def test_get_proto_hash():
+    assert get_proto_hash(content=PROTO_CONTENT) == get_proto_hash(content=PROTO_CONTENT)
+    assert get_proto_hash(content=PROTO_CONTENT) != get_proto_hash(content=PROTO_CONTENT + " ")
+
+
+def test_compile_proto_cached(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    output_path = compile_proto_cached(
+        content=PROTO_CONTENT,
+        file_prefix="cached",
+        cache_path=tmp_path,
+    )
+    monkeypatch.setattr(utils, "compile_proto", lambda **kwargs: pytest.fail("Not cached"))
+
+    cached_output_path = compile_proto_cached(
+        content=PROTO_CONTENT,
+        file_prefix="cached",
+        cache_path=tmp_path,
+    )
+
+    assert cached_output_path == output_path
+    assert (output_path / "cached_pb2.py").is_file()
+    assert (output_path / "cached_pb2_grpc.py").is_file()
+    assert [path.name for path in tmp_path.iterdir()] == [output_path.name]
+
+
+def test_compile_proto_cached_concurrent_writer(
+        tmp_path: pathlib.Path,
+        monkeypatch: pytest.MonkeyPatch,
+):
+    compile_proto_original = utils.compile_proto
+    expected_output_path = tmp_path / f"cached-{get_proto_hash(content=PROTO_CONTENT)[:32]}"
+
+    def compile_proto_with_race(**kwargs):
+        compile_proto_original(**kwargs)
+        expected_output_path.mkdir()
+        (expected_output_path / "marker").touch()
+
+    monkeypatch.setattr(utils, "compile_proto", compile_proto_with_race)
+
+    output_path = compile_proto_cached(
+        content=PROTO_CONTENT,
+        file_prefix="cached",
+        cache_path=tmp_path,
+    )
+
+    assert output_path == expected_output_path
+    assert (output_path / "marker").is_file()
+    assert [path.name for path in tmp_path.iterdir()] == [output_path.name]
@@ -0,0 +1,290 @@
+import asyncio
+import os
+import pathlib
+import signal
+import subprocess
+import sys
+import textwrap
+from concurrent import futures
+
+import grpc
+import pydantic
+import pytest
+
+from fast_grpc import (
+    ChannelConfig,
+    FastGRPC,
+    FastGRPCService,
+    ServerConfig,
+    grpc_method,
+)
+
+ROOT_PATH = pathlib.Path(__file__).parent.parent
+
+WORKERS_SCRIPT = """
+import os
+import sys
+
+import pydantic
+
+from fast_grpc import FastGRPC, FastGRPCService, grpc_method
+
+
+class WorkerRequest(pydantic.BaseModel):
+    crash: bool = False
+
+
+class WorkerResponse(pydantic.BaseModel):
+    pid: int
+
+
+class WorkerService(FastGRPCService):
+    @grpc_method
+    async def pid(self, request: WorkerRequest) -> WorkerResponse:
+        if request.crash:
+            os._exit(1)
+        return WorkerResponse(pid=os.getpid())
+
+
+def fail_startup():
+    raise RuntimeError("Startup failed")
+
+
+if __name__ == "__main__":
+    if "--fail" in sys.argv:
+        FastGRPC(WorkerService(), port={port}, on_startup=(fail_startup,)).run(
+            workers=2,
+            max_restarts=3,
+        )
+    else:
+        FastGRPC(WorkerService(), port={port}).run(workers=2)
+"""
+
+
+def test_run_validates_workers():
+    with pytest.raises(ValueError):
+        FastGRPC().run(workers=0)
+
+
+def test_run_workers(tmp_path: pathlib.Path, free_port: int):
+    script = tmp_path / "workers.py"
+    script.write_text(data=textwrap.dedent(WORKERS_SCRIPT).replace("{port}", str(free_port)))
+    sys.path.insert(0, str(tmp_path))
+    try:
+        import workers  # pylint: disable=import-error,import-outside-toplevel
+    finally:
+        sys.path.remove(str(tmp_path))
+
+    async def call(crash: bool = False) -> int:
+        for _ in range(100):
+            client = workers.WorkerService.Client(host="127.0.0.1", port=free_port)
+            try:
+                response = await client.pid(workers.WorkerRequest(crash=crash))
+                return response.pid
+            except grpc.aio.AioRpcError:
+                if crash:
+                    return 0
+                await asyncio.sleep(0.1)
+        raise TimeoutError("Workers are not available")
+
+    with subprocess.Popen(
+        [sys.executable, str(script)],
+        env=os.environ | {"PYTHONPATH": str(ROOT_PATH)},
+    ) as process:
+        try:
+            worker_pid = asyncio.run(call())
+
+            assert worker_pid != process.pid
+
+            asyncio.run(call(crash=True))
+
+            assert asyncio.run(call())
+            assert process.poll() is None
+
+            process.send_signal(signal.SIGTERM)
+
+            assert process.wait(timeout=10) == 0
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+
+def test_run_workers_stops_after_crashes(tmp_path: pathlib.Path, free_port: int):
+    script = tmp_path / "workers.py"
+    script.write_text(data=textwrap.dedent(WORKERS_SCRIPT).replace("{port}", str(free_port)))
+
+    with subprocess.Popen(
+        [sys.executable, str(script), "--fail"],
+        env=os.environ | {"PYTHONPATH": str(ROOT_PATH)},
+        stderr=subprocess.PIPE,
+    ) as process:
+        try:
+            # Restarts are delayed by 0.1, 0.2 and 0.4 seconds before fourth crash stops server
+            _, stderr = process.communicate(timeout=30)
+        finally:
+            if process.poll() is None:
+                process.kill()
+
+    assert process.returncode != 0
+    assert stderr.count(b"restarting in") == 3
+    assert b"Workers exited more than 3 times in 60.0 seconds" in stderr
+
+
+class PyTestPayload(pydantic.BaseModel):
+    data: bytes
+
+
+class PyTestLimitsService(FastGRPCService):
+    @grpc_method(max_request_size=1024, compression=grpc.Compression.Gzip)
+    async def small(self, request: PyTestPayload) -> PyTestPayload:
+        return request
+
+    @grpc_method(max_response_size=1024)
+    async def grow(self, request: PyTestPayload) -> PyTestPayload:
+        return PyTestPayload(data=request.data * 2048)
+
+    @grpc_method
+    async def large(self, request: PyTestPayload) -> PyTestPayload:
+        return PyTestPayload(data=request.data[:10])
+
+
+def test_server_config_options():
+    config = ServerConfig(
+        max_receive_message_length=1024,
+        http2_bdp_probe=False,
+        http2_lookahead_bytes=65536,
+        options=(("grpc.so_reuseport", 0),),
+    )
+
+    assert config.get_options() == (
+        ("grpc.max_receive_message_length", 1024),
+        ("grpc.http2.lookahead_bytes", 65536),
+        ("grpc.http2.bdp_probe", 0),
+        ("grpc.so_reuseport", 0),
+    )
+
+
+class PyTestLargeLimitService(FastGRPCService):
+    @grpc_method(max_request_size=8 * 1024 * 1024)
+    async def upload(self, request: PyTestPayload) -> PyTestPayload:
+        return request
+
+
+def test_method_limit_over_server_one():
+    with pytest.raises(ValueError):
+        FastGRPC(PyTestLargeLimitService())
+    with pytest.raises(ValueError):
+        FastGRPC(PyTestLimitsService(), config=ServerConfig(max_send_message_length=512))
+
+    # Limit of method is allowed up to limit of server
+    config = ServerConfig(max_receive_message_length=8 * 1024 * 1024)
+    FastGRPC(PyTestLargeLimitService(), config=config)
+
+
+def test_server_config_and_method_limits(free_port: int, serve):
+    config = ServerConfig(
+        max_receive_message_length=32 * 1024 * 1024,
+        maximum_concurrent_rpcs=10,
+        migration_thread_pool_workers=2,
+    )
+
+    async def run():
+        async with serve(FastGRPC(PyTestLimitsService(), port=free_port, config=config)):
+            client = PyTestLimitsService.Client(
+                host="127.0.0.1",
+                port=free_port,
+                config=ChannelConfig(max_receive_message_length=32 * 1024 * 1024),
+            )
+            async with client:
+                large = await client.large(PyTestPayload(data=b"x" * 20 * 1024 * 1024))
+                small = await client.small(PyTestPayload(data=b"x"))
+                errors = []
+                for method, data in ((client.small, b"x" * 2048), (client.grow, b"x")):
+                    try:
+                        await method(PyTestPayload(data=data))
+                    except grpc.aio.AioRpcError as error:
+                        errors.append(error.code())
+            return large, small, errors
+
+    large, small, errors = asyncio.run(run())
+
+    assert large.data == b"x" * 10
+    assert small.data == b"x"
+    assert errors == [grpc.StatusCode.RESOURCE_EXHAUSTED] * 2
+
+
+EVENTS = []
+
+
+class PyTestLifespanService(FastGRPCService):
+    async def on_startup(self):
+        EVENTS.append("service startup")
+
+    async def on_shutdown(self):
+        EVENTS.append("service shutdown")
+
+    @grpc_method
+    async def slow(self, request: PyTestPayload) -> PyTestPayload:
+        await asyncio.sleep(0.5)
+        EVENTS.append("slow")
+        return request
+
+
+async def close_app():
+    EVENTS.append("app shutdown")
+
+
+async def wait_for_server(port: int):
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        await asyncio.wait_for(channel.channel_ready(), timeout=10)
+
+
+@pytest.mark.parametrize("stop_by", ["stop", "signal", "cancel"])
+def test_lifespan_and_graceful_stop(free_port: int, stop_by: str):
+    EVENTS.clear()
+    app = FastGRPC(
+        PyTestLifespanService(),
+        port=free_port,
+        on_startup=(lambda: EVENTS.append("app startup"),),
+        on_shutdown=(close_app,),
+    )
+
+    async def run():
+        serving = asyncio.ensure_future(app.run_async(handle_signals=stop_by == "signal"))
+        await wait_for_server(port=free_port)
+        async with PyTestLifespanService.Client(host="127.0.0.1", port=free_port) as client:
+            slow_call = asyncio.ensure_future(client.slow(PyTestPayload(data=b"x")))
+            await asyncio.sleep(0.1)
+            stopping = serving
+            if stop_by == "signal":
+                os.kill(os.getpid(), signal.SIGTERM)
+            elif stop_by == "cancel":
+                serving.cancel()
+            else:
+                stopping = asyncio.ensure_future(app.stop())
+            await asyncio.sleep(0.1)
+
+            # In-flight request is drained, new ones are rejected
+            assert not stopping.done()
+            with pytest.raises(grpc.aio.AioRpcError):
+                await client.slow(PyTestPayload(data=b"y"))
+            assert await slow_call == PyTestPayload(data=b"x")
+        await asyncio.wait([serving], timeout=10)
+        assert serving.done()
+
+    asyncio.run(run())
+
+    assert EVENTS == ["app startup", "service startup", "slow", "service shutdown", "app shutdown"]
+
+
+def test_run_async_in_thread(free_port: int):
+    app = FastGRPC(PyTestLifespanService(), port=free_port)
+
+    async def run():
+        serving = asyncio.ensure_future(app.run_async())
+        await wait_for_server(port=free_port)
+        await app.stop()
+        await serving
+
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(asyncio.run, run()).result(timeout=30)
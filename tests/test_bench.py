@@ -0,0 +1,180 @@
+import asyncio
+import enum
+import json
+import pathlib
+import random
+from typing import AsyncIterator
+
+import grpc
+import pydantic
+import pytest
+
+from fast_grpc import FastGRPC, FastGRPCService, grpc_method
+from fast_grpc.bench import (
+    generate_request,
+    get_percentile,
+    load_requests,
+    load_service,
+    main,
+    run_load,
+)
+
+
+class PyTestBenchColor(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class PyTestBenchItem(pydantic.BaseModel):
+    name: str
+    color: PyTestBenchColor
+    tags: list[str]
+
+
+class PyTestBenchRequest(pydantic.BaseModel):
+    id: int
+    enabled: bool
+    score: float
+    item: PyTestBenchItem
+    items: dict[str, PyTestBenchItem]
+    comment: str | None = None
+
+
+class PyTestBenchResponse(pydantic.BaseModel):
+    id: int
+
+
+class PyTestBenchService(FastGRPCService):
+    @grpc_method
+    async def get(self, request: PyTestBenchRequest, context) -> PyTestBenchResponse:
+        if request.id < 0:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "negative id")
+        return PyTestBenchResponse(id=request.id)
+
+    @grpc_method
+    async def stream(self, request: PyTestBenchResponse) -> AsyncIterator[PyTestBenchResponse]:
+        for _ in range(3):
+            yield request
+
+
+def test_get_percentile():
+    values = [float(value) for value in range(1, 101)]
+
+    assert get_percentile(values, percentile=50) == 50
+    assert get_percentile(values, percentile=99) == 99
+    assert get_percentile(values, percentile=99.9) == 100
+    assert get_percentile([1.0], percentile=50) == 1
+
+
+def test_generate_request():
+    request = generate_request(model=PyTestBenchRequest, rng=random.Random(1))
+
+    assert isinstance(request.item.color, PyTestBenchColor)
+    assert request.item.tags
+    assert all(isinstance(item, PyTestBenchItem) for item in request.items.values())
+    assert request == generate_request(model=PyTestBenchRequest, rng=random.Random(1))
+
+
+def test_load_requests(tmp_path: pathlib.Path):
+    json_file = tmp_path / "requests.json"
+    json_file.write_text(json.dumps({"id": 1}))
+    jsonl_file = tmp_path / "requests.jsonl"
+    jsonl_file.write_text('{"id": 1}\n\n{"id": 2}\n')
+
+    requests = load_requests(path=jsonl_file, model=PyTestBenchResponse)
+
+    assert load_requests(path=json_file, model=PyTestBenchResponse) == [PyTestBenchResponse(id=1)]
+    assert [request.id for request in requests] == [1, 2]
+
+
+def test_load_service():
+    assert load_service(target="tests.test_bench:PyTestBenchService") is PyTestBenchService
+
+    with pytest.raises(ValueError):
+        load_service(target="tests.test_bench")
+    with pytest.raises(ValueError):
+        load_service(target="tests.test_bench:PyTestBenchRequest")
+
+
+def test_run_load(free_port: int, serve):
+    requests = [
+        generate_request(model=PyTestBenchRequest, rng=random.Random(index))
+        for index in range(10)
+    ]
+    requests[0] = requests[0].model_copy(update={"id": -1})
+
+    async def run():
+        async with serve(FastGRPC(PyTestBenchService(), port=free_port)):
+            async with PyTestBenchService.Client(host="127.0.0.1", port=free_port) as client:
+                open_loop = await run_load(
+                    client=client,
+                    method_name="get",
+                    requests=requests,
+                    duration=0.5,
+                    rps=200,
+                    warmup=0.1,
+                )
+                closed_loop = await run_load(
+                    client=client,
+                    method_name="stream",
+                    requests=[PyTestBenchResponse(id=1)],
+                    duration=0.2,
+                    concurrency=4,
+                    server_streaming=True,
+                )
+        return open_loop, closed_loop
+
+    open_loop, closed_loop = asyncio.run(run())
+
+    assert open_loop.mode == "open loop, 200 rps"
+    assert open_loop.requests == 100
+    assert open_loop.codes == {"OK": 90, "INVALID_ARGUMENT": 10}
+    assert set(open_loop.latency) == {"p50", "p90", "p99", "p99.9", "mean", "max"}
+    assert closed_loop.requests > 0
+    assert closed_loop.codes == {"OK": closed_loop.requests}
+
+
+class PyTestFailingClient:
+    async def get(self, request: PyTestBenchResponse) -> PyTestBenchResponse:
+        if request.id == 1:
+            raise ValueError("Invalid response")
+        if request.id == 2:
+            raise asyncio.CancelledError()
+        return request
+
+
+def test_run_load_records_client_errors():
+    report = asyncio.run(run_load(
+        client=PyTestFailingClient(),
+        method_name="get",
+        requests=[PyTestBenchResponse(id=index) for index in range(3)],
+        duration=0.3,
+        rps=100,
+    ))
+
+    assert report.requests == 30
+    assert report.codes == {"OK": 10, "ValueError": 10, "CANCELLED": 10}
+
+
+def test_main(free_port: int, capsys: pytest.CaptureFixture, serve):
+    async def run():
+        async with serve(FastGRPC(PyTestBenchService(), port=free_port)):
+            await asyncio.to_thread(
+                main,
+                [
+                    "tests.test_bench:PyTestBenchService",
+                    "--method", "get",
+                    "--port", str(free_port),
+                    "--seed", "1",
+                    "--duration", "0.2",
+                    "--warmup", "0",
+                    "--concurrency", "2",
+                    "--json",
+                ],
+            )
+
+    asyncio.run(run())
+    report = json.loads(capsys.readouterr().out)
+
+    assert report["method"] == "get"
+    assert report["requests"] > 0
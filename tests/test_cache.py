@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import grpc
+import pydantic
+import pytest
+
+from fast_grpc import FastGRPC, FastGRPCService, LRUCache, ResponseCache, grpc_method
+
+# Methods, decorated by grpc_method, are GRPCMethod instances, that pylint does not infer
+# pylint: disable=no-member
+
+
+class PyTestCacheRequest(pydantic.BaseModel):
+    key: str
+
+
+class PyTestCacheResponse(pydantic.BaseModel):
+    value: int
+
+
+CALLS = []
+
+
+class PyTestCacheService(FastGRPCService):
+    @grpc_method(cache=LRUCache(max_size=2), cache_metadata=("user",))
+    async def get(self, request: PyTestCacheRequest) -> PyTestCacheResponse:
+        CALLS.append(request.key)
+        return PyTestCacheResponse(value=len(CALLS))
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(max_size=2)
+    cache.set("first", b"1")
+    cache.set("second", b"2")
+    cache.get("first")
+    cache.set("third", b"3")
+
+    assert cache.get("second") is None
+    assert cache.get("first") == b"1"
+    assert cache.get("third") == b"3"
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_lru_cache_ttl(monkeypatch):
+    now = time.monotonic()
+    cache = LRUCache(ttl=10)
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.set("key", b"value")
+
+    assert cache.get("key") == b"value"
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_memory_cap():
+    cache = LRUCache(max_size=None, max_memory=10)
+    cache.set(b"a", b"1234")
+    cache.set(b"b", b"1234")
+    cache.set(b"c", b"1234")
+    cache.set(b"d", b"x" * 100)
+
+    assert len(cache) == 2
+    assert cache.memory == 10
+    assert cache.get(b"a") is None
+    assert cache.get(b"d") is None
+
+
+def test_incomplete_cache_is_not_instantiated():
+    # Cache without invalidate and _get is incomplete on purpose
+    # pylint: disable=abstract-method,abstract-class-instantiated
+    class PyTestIncompleteCache(ResponseCache):
+        def set(self, key, value):
+            pass
+
+    with pytest.raises(TypeError):
+        PyTestIncompleteCache()
+
+
+def test_cache_requires_unary_method():
+    with pytest.raises(ValueError):
+        @grpc_method(cache=True)
+        async def stream(self, request: PyTestCacheRequest) -> PyTestCacheResponse:
+            yield PyTestCacheResponse(value=0)
+
+
+def test_cached_method(make_context):
+    CALLS.clear()
+    service = PyTestCacheService()
+    handler = PyTestCacheService.get.bind(service=service)
+    request_class = service.pb2.PyTestCacheRequest
+    response_class = service.pb2.PyTestCacheResponse
+
+    async def call(key: str, user: str) -> int:
+        context = make_context(metadata=(("user", user),))
+        response = await handler(request_class(key=key), context)
+        return response_class.FromString(response).value
+
+    async def run():
+        values = [await call("a", "alice"), await call("a", "alice"), await call("a", "bob")]
+        PyTestCacheService.invalidate_cache(method_name="get", request=PyTestCacheRequest(key="b"))
+        values.append(await call("a", "alice"))
+        PyTestCacheService.invalidate_cache(request=PyTestCacheRequest(key="a"))
+        values.append(await call("a", "alice"))
+        return values
+
+    values = asyncio.run(run())
+
+    assert values == [1, 1, 2, 1, 3]
+    assert CALLS == ["a", "a", "a"]
+    assert PyTestCacheService.get.cache.hits == 2
+
+
+def test_cached_method_server(free_port: int, serve):
+    CALLS.clear()
+    middleware_calls = []
+
+    async def middleware(call_next, request, context):
+        response = await call_next(request, context)
+        middleware_calls.append((type(request).__name__, type(response)))
+        return response
+
+    async def run():
+        async with serve(FastGRPC(PyTestCacheService(), port=free_port, middlewares=(middleware,))):
+            async with PyTestCacheService.Client(host="127.0.0.1", port=free_port) as client:
+                first = await client.get(PyTestCacheRequest(key="server"))
+                second = await client.get(PyTestCacheRequest(key="server"))
+            return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert CALLS == ["server"]
+    # Middlewares of server get protobuf requests and serialized responses of cached method
+    assert middleware_calls == [("PyTestCacheRequest", bytes)] * 2
+
+
+async def authenticate(call_next, request, context):
+    if dict(context.invocation_metadata()).get("authorization") != "secret":
+        await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Unauthenticated")
+    return await call_next(request, context)
+
+
+class PyTestAuthCacheService(FastGRPCService):
+    @grpc_method(cache=True, middlewares=(authenticate,))
+    async def get_secret(self, request: PyTestCacheRequest) -> PyTestCacheResponse:
+        CALLS.append(request.key)
+        return PyTestCacheResponse(value=len(CALLS))
+
+
+def test_cache_hit_runs_middlewares(free_port: int, serve):
+    CALLS.clear()
+
+    async def run():
+        async with serve(FastGRPC(PyTestAuthCacheService(), port=free_port)):
+            async with PyTestAuthCacheService.Client(host="127.0.0.1", port=free_port) as client:
+                message = PyTestAuthCacheService.pb2.PyTestCacheRequest(key="a")
+                metadata = (("authorization", "secret"),)
+                authenticated = [
+                    await client.stub.get_secret(message, metadata=metadata) for _ in range(2)
+                ]
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await client.stub.get_secret(message)
+            return authenticated, error.value.code()
+
+    authenticated, code = asyncio.run(run())
+
+    assert [response.value for response in authenticated] == [1, 1]
+    assert code == grpc.StatusCode.UNAUTHENTICATED
+    assert CALLS == ["a"]
@@ -0,0 +1,189 @@
+import asyncio
+
+import grpc
+import pydantic
+
+from fast_grpc import ChannelConfig, ChannelPool, FastGRPC, FastGRPCService, grpc_method
+
+
+class PyTestClientRequest(pydantic.BaseModel):
+    name: str
+
+
+class PyTestClientResponse(pydantic.BaseModel):
+    text: str
+
+
+class PyTestClientService(FastGRPCService):
+    @grpc_method
+    async def say_hello(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=f"Hello, {request.name}!")
+
+
+def test_channel_config_options():
+    config = ChannelConfig(
+        max_receive_message_length=1024,
+        keepalive_permit_without_calls=True,
+        options=(("grpc.primary_user_agent", "test"),),
+    )
+
+    assert config.get_options() == (
+        ("grpc.max_receive_message_length", 1024),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.primary_user_agent", "test"),
+    )
+
+
+def test_shared_pool_is_reference_counted():
+    async def run():
+        config = ChannelConfig(compression=grpc.Compression.Gzip)
+        first = ChannelPool.acquire(target="localhost:1", config=config, size=2, shared=True)
+        second = ChannelPool.acquire(target="localhost:1", config=config, size=2, shared=True)
+        other = ChannelPool.acquire(target="localhost:1", config=config, size=2)
+
+        assert first is second
+        assert first is not other
+        assert len(first.channels) == 2
+
+        await first.release()
+        assert ChannelPool._shared  # pylint: disable=protected-access
+        await second.release()
+        await other.release()
+        assert not ChannelPool._shared  # pylint: disable=protected-access
+
+    asyncio.run(run())
+
+
+class PyTestPeerService(FastGRPCService):
+    @grpc_method
+    async def get_peer(self, request: PyTestClientRequest, context) -> PyTestClientResponse:
+        return PyTestClientResponse(text=context.peer())
+
+
+def test_client_uses_channels_round_robin(free_port: int, serve):
+
+    async def run():
+        async with serve(FastGRPC(PyTestPeerService(), port=free_port)):
+            client = PyTestPeerService.Client(host="127.0.0.1", port=free_port, channels=3)
+            async with client:
+                responses = [
+                    await client.get_peer(PyTestClientRequest(name="world")) for _ in range(6)
+                ]
+            return {response.text for response in responses}
+
+    peers = asyncio.run(run())
+
+    # Each channel has its own connection
+    assert len(peers) == 3
+
+
+class PyTestMapService(FastGRPCService):
+    @grpc_method
+    async def delay(self, request: PyTestClientRequest, context) -> PyTestClientResponse:
+        if request.name == "error":
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "error")
+        await asyncio.sleep(0.01 * int(request.name))
+        return PyTestClientResponse(text=request.name)
+
+
+def test_client_method_map(free_port: int, serve):
+    names = ["5", "error", "1", "3", "0"]
+
+    async def requests():
+        for name in names:
+            yield PyTestClientRequest(name=name)
+
+    async def run():
+        async with serve(FastGRPC(PyTestMapService(), port=free_port)):
+            async with PyTestMapService.Client(host="127.0.0.1", port=free_port) as client:
+                ordered = [result async for result in client.delay.map(requests(), ordered=True)]
+                unordered = [
+                    result
+                    async for result in client.delay.map(
+                        [PyTestClientRequest(name=name) for name in names if name != "error"],
+                        concurrency=2,
+                    )
+                ]
+            return ordered, unordered
+
+    ordered, unordered = asyncio.run(run())
+
+    assert [result.index for result in ordered] == [0, 1, 2, 3, 4]
+    assert [result.response.text for result in ordered if result.error is None] == [
+        "5", "1", "3", "0",
+    ]
+    assert ordered[1].error.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert sorted(result.response.text for result in unordered) == ["0", "1", "3", "5"]
+    assert [result.index for result in unordered] != [0, 1, 2, 3]
+
+
+class PyTestTrustedService(FastGRPCService):
+    @grpc_method(trusted=True)
+    async def trusted(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=request.name)
+
+    @grpc_method
+    async def untrusted(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=request.name)
+
+
+def test_client_trusted_responses(monkeypatch, free_port: int, serve):
+    codec = PyTestTrustedService.codecs["PyTestClientResponse"]
+    decoded = []
+    monkeypatch.setattr(codec, "decode", lambda message: decoded.append("validated"))
+    monkeypatch.setattr(codec, "decode_trusted", lambda message: decoded.append("trusted"))
+    monkeypatch.setattr(PyTestTrustedService, "Client", PyTestTrustedService.generate_client(
+        name=PyTestTrustedService.name,
+        grpc_methods=PyTestTrustedService.grpc_methods,
+        pb2_grpc=PyTestTrustedService.pb2_grpc,
+        codecs=PyTestTrustedService.codecs,
+    ))
+    request = PyTestClientRequest(name="world")
+
+    async def run():
+        # Warm-up would decode messages by patched codec
+        async with serve(FastGRPC(PyTestTrustedService(), port=free_port, warmup=False)):
+            async with PyTestTrustedService.Client(host="127.0.0.1", port=free_port) as client:
+                await client.trusted(request)
+                await client.untrusted(request)
+            client = PyTestTrustedService.Client(host="127.0.0.1", port=free_port, trusted=True)
+            async with client:
+                await client.untrusted(request)
+
+    asyncio.run(run())
+
+    assert decoded == ["trusted", "validated", "trusted"]
+
+
+class PyTestSessionService(FastGRPCService):
+    @grpc_method
+    async def close(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=f"closed {request.name}")
+
+    @grpc_method
+    async def stub(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=f"stub {request.name}")
+
+    @grpc_method
+    async def tracing(self, request: PyTestClientRequest) -> PyTestClientResponse:
+        return PyTestClientResponse(text=f"tracing {request.name}")
+
+
+def test_client_methods_named_as_client_attributes(free_port: int, serve):
+    request = PyTestClientRequest(name="session")
+
+    async def run():
+        async with serve(FastGRPC(PyTestSessionService(), port=free_port)):
+            async with PyTestSessionService.Client(host="127.0.0.1", port=free_port) as client:
+                responses = [
+                    await client.close(request),
+                    await client.stub(request),
+                    await client.tracing(request),
+                ]
+            return client, [response.text for response in responses]
+
+    client, texts = asyncio.run(run())
+
+    assert texts == ["closed session", "stub session", "tracing session"]
+    # Client is closed by context manager, not by service method
+    assert client._closed  # pylint: disable=protected-access
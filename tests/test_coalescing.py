@@ -0,0 +1,145 @@
+import asyncio
+
+import grpc
+import pydantic
+
+from fast_grpc import FastGRPC, FastGRPCService, SingleFlight, grpc_method
+
+# Messages of pb2 module, built in memory, are unknown to pylint
+# pylint: disable=no-member
+
+
+def test_single_flight_runs_once():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do(key="key", function=load) for _ in range(10)))
+        return results, len(flights)
+
+    results, flights_count = asyncio.run(run())
+
+    assert results == [1] * 10
+    assert calls == [1]
+    assert flights_count == 0
+
+
+def test_single_flight_cancels_only_without_waiters():
+    started = []
+    cancelled = []
+
+    async def load():
+        started.append(1)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.do(key="key", function=load))
+        second = asyncio.ensure_future(flights.do(key="key", function=load))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        cancelled_after_first = list(cancelled)
+        second.cancel()
+        await asyncio.sleep(0.01)
+        return cancelled_after_first, len(flights)
+
+    cancelled_after_first, flights_count = asyncio.run(run())
+
+    assert started == [1]
+    assert not cancelled_after_first
+    assert cancelled == [1]
+    assert flights_count == 0
+
+
+class PyTestCoalesceRequest(pydantic.BaseModel):
+    key: str
+
+
+class PyTestCoalesceResponse(pydantic.BaseModel):
+    calls: int
+
+
+COALESCE_CALLS = []
+
+
+class PyTestCoalesceService(FastGRPCService):
+    @grpc_method(coalesce=True)
+    async def load(self, request: PyTestCoalesceRequest, context) -> PyTestCoalesceResponse:
+        COALESCE_CALLS.append(request.key)
+        await asyncio.sleep(0.1)
+        if request.key == "missing":
+            await context.abort(grpc.StatusCode.NOT_FOUND, "missing")
+        return PyTestCoalesceResponse(calls=len(COALESCE_CALLS))
+
+
+def test_coalesced_method(free_port: int, serve):
+    COALESCE_CALLS.clear()
+
+    async def call(client, key: str):
+        try:
+            return await client.load(PyTestCoalesceRequest(key=key))
+        except grpc.aio.AioRpcError as error:
+            return error.code()
+
+    async def run():
+        async with serve(FastGRPC(PyTestCoalesceService(), port=free_port)):
+            async with PyTestCoalesceService.Client(host="127.0.0.1", port=free_port) as client:
+                return await asyncio.gather(
+                    *(call(client, "key") for _ in range(10)),
+                    *(call(client, "missing") for _ in range(3)),
+                )
+
+    results = asyncio.run(run())
+
+    assert sorted(COALESCE_CALLS) == ["key", "missing"]
+    assert len({result.calls for result in results[:10]}) == 1
+    assert results[10:] == [grpc.StatusCode.NOT_FOUND] * 3
+
+
+async def authenticate(call_next, request, context):
+    if dict(context.invocation_metadata()).get("authorization") != "secret":
+        await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Unauthenticated")
+    return await call_next(request, context)
+
+
+class PyTestAuthCoalesceService(FastGRPCService):
+    @grpc_method(coalesce=True, middlewares=(authenticate,))
+    async def load_secret(self, request: PyTestCoalesceRequest) -> PyTestCoalesceResponse:
+        COALESCE_CALLS.append(request.key)
+        await asyncio.sleep(0.1)
+        return PyTestCoalesceResponse(calls=len(COALESCE_CALLS))
+
+
+def test_coalesced_waiter_runs_middlewares(free_port: int, serve):
+    COALESCE_CALLS.clear()
+
+    async def call(client, metadata: tuple = ()):
+        message = PyTestAuthCoalesceService.pb2.PyTestCoalesceRequest(key="key")
+        try:
+            return (await client.stub.load_secret(message, metadata=metadata)).calls
+        except grpc.aio.AioRpcError as error:
+            return error.code()
+
+    async def run():
+        async with serve(FastGRPC(PyTestAuthCoalesceService(), port=free_port)):
+            async with PyTestAuthCoalesceService.Client(host="127.0.0.1", port=free_port) as client:
+                return await asyncio.gather(
+                    call(client, metadata=(("authorization", "secret"),)),
+                    call(client),
+                    call(client, metadata=(("authorization", "secret"),)),
+                )
+
+    results = asyncio.run(run())
+
+    assert results == [1, grpc.StatusCode.UNAUTHENTICATED, 1]
+    assert COALESCE_CALLS == ["key"]
@@ -0,0 +1,140 @@
+import enum
+import pathlib
+import uuid
+
+import pydantic
+import pytest
+
+from fast_grpc import FastGRPCService, grpc_method
+
+# Messages of pb2 module, built in memory, are unknown to pylint
+# pylint: disable=no-member
+
+
+class CodecColor(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+    BLUE = "blue"
+
+
+class CodecItem(pydantic.BaseModel):
+    name: str
+    color: CodecColor
+    tags: list[str] = []
+
+
+class CodecRequest(pydantic.BaseModel):
+    id: uuid.UUID
+    path: pathlib.Path
+    count: int
+    ratio: float
+    enabled: bool
+    payload: bytes
+    note: str | None = None
+    item: CodecItem | None = None
+    items: list[CodecItem] = []
+    colors: list[CodecColor] = []
+    by_name: dict[str, CodecItem] = {}
+    counters: dict[int, int] = {}
+
+
+class CodecResponse(pydantic.BaseModel):
+    request: CodecRequest
+
+
+class CodecService(FastGRPCService):
+    @grpc_method
+    async def echo(self, request: CodecRequest) -> CodecResponse:
+        return CodecResponse(request=request)
+
+
+def make_request() -> CodecRequest:
+    return CodecRequest(
+        id=uuid.uuid4(),
+        path=pathlib.Path("/tmp/test"),
+        count=-42,
+        ratio=0.5,
+        enabled=True,
+        payload=b"\x00\x01binary",
+        item=CodecItem(name="single", color=CodecColor.GREEN, tags=["a", "b"]),
+        items=[
+            CodecItem(name="first", color=CodecColor.RED),
+            CodecItem(name="second", color=CodecColor.BLUE),
+        ],
+        colors=[CodecColor.BLUE, CodecColor.RED],
+        by_name={"third": CodecItem(name="third", color=CodecColor.GREEN)},
+        counters={1: 10, 2: 20},
+    )
+
+
+def test_codec_round_trip():
+    request = make_request()
+    codec = CodecService.codecs["CodecRequest"]
+
+    message = codec.encode(request)
+
+    assert isinstance(message, CodecService.pb2.CodecRequest)
+    assert message.id == str(request.id)
+    assert message.items[1].color == CodecService.pb2.CodecColor.Value("BLUE")
+    assert codec.decode(message) == request
+
+
+def test_codec_round_trip_through_bytes():
+    request = make_request()
+    codec = CodecService.codecs["CodecRequest"]
+
+    data = codec.encode(request).SerializeToString()
+
+    assert codec.decode(CodecService.pb2.CodecRequest.FromString(data)) == request
+
+
+def test_codec_missing_optional_fields_use_defaults():
+    codec = CodecService.codecs["CodecRequest"]
+    message = CodecService.pb2.CodecRequest(id=str(uuid.uuid4()), path="/")
+
+    request = codec.decode(message)
+
+    assert request.note is None
+    assert request.item is None
+    assert request.items == []
+    assert request.payload == b""
+
+
+def test_codec_nested_response():
+    request = make_request()
+    codec = CodecService.codecs["CodecResponse"]
+
+    message = codec.encode(CodecResponse(request=request))
+
+    assert message.HasField("request")
+    assert codec.decode(message).request == request
+
+
+def test_codec_decode_trusted_matches_validated():
+    request = make_request()
+    codec = CodecService.codecs["CodecRequest"]
+    message = codec.encode(request)
+
+    trusted_request = codec.decode_trusted(message)
+
+    assert trusted_request == request
+    assert isinstance(trusted_request.id, uuid.UUID)
+    assert isinstance(trusted_request.path, pathlib.Path)
+    assert isinstance(trusted_request.item, CodecItem)
+    assert trusted_request.items[1].color is CodecColor.BLUE
+    assert trusted_request.by_name["third"].color is CodecColor.GREEN
+
+
+def test_codec_decode_trusted_skips_validation(monkeypatch):
+    codec = CodecService.codecs["CodecResponse"]
+    message = codec.encode(CodecResponse(request=make_request()))
+    monkeypatch.setattr(
+        CodecRequest,
+        "__init__",
+        lambda *args, **kwargs: pytest.fail("Model validated"),
+    )
+
+    response = codec.decode_trusted(message)
+
+    assert response.request.note is None
+    assert response.request.counters == {1: 10, 2: 20}
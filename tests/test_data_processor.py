@@ -0,0 +1,86 @@
+import enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+from fast_grpc.data_processor import (
+    DataProcessor,
+    EnumByNameTypeProcessor,
+    EnumNameByValueTypeProcessor,
+)
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class Item(BaseModel):
+    name: str
+    color: Color
+
+
+class Plain(BaseModel):
+    name: str
+    values: list[int]
+
+
+class Container(BaseModel):
+    title: str
+    plain: Plain
+    items: list[Item]
+    by_name: dict[str, Item]
+    color: Optional[Color] = None
+
+
+class Tree(BaseModel):
+    color: Color
+    children: list["Tree"] = []
+
+
+def test_compile_model_skips_fields_without_enums():
+    plan = DataProcessor(EnumByNameTypeProcessor()).compile_model(model=Container)
+
+    assert [key for key, _ in plan.steps] == ["items", "by_name", "color"]
+    assert not DataProcessor(EnumByNameTypeProcessor()).compile_model(model=Plain)
+
+
+def test_compile_model_is_cached():
+    data_processor = DataProcessor(EnumByNameTypeProcessor())
+
+    assert data_processor.compile_model(model=Item) is data_processor.compile_model(model=Item)
+
+
+def test_plan_without_steps_returns_same_data():
+    data = {"name": "test", "values": [1, 2, 3]}
+
+    assert DataProcessor(EnumByNameTypeProcessor())(data=data, model=Plain) is data
+
+
+def test_load_and_dump():
+    data = {
+        "title": "test",
+        "plain": {"name": "plain", "values": [1]},
+        "items": [{"name": "first", "color": "RED"}],
+        "by_name": {"second": {"name": "second", "color": "GREEN"}},
+        "color": None,
+    }
+
+    loaded = DataProcessor(EnumByNameTypeProcessor())(data=data, model=Container)
+    container = Container.model_validate(loaded)
+    dumped = DataProcessor(EnumNameByValueTypeProcessor())(
+        data=container.model_dump(mode="json"),
+        model=Container,
+    )
+
+    assert container.items[0].color is Color.RED
+    assert container.by_name["second"].color is Color.GREEN
+    assert dumped == data
+
+
+def test_recursive_model():
+    data = {"color": "RED", "children": [{"color": "GREEN", "children": []}]}
+
+    loaded = DataProcessor(EnumByNameTypeProcessor())(data=data, model=Tree)
+
+    assert loaded == {"color": Color.RED, "children": [{"color": Color.GREEN, "children": []}]}
@@ -0,0 +1,77 @@
+import asyncio
+
+import grpc
+import pydantic
+import pytest
+
+from fast_grpc import FastGRPC, FastGRPCService, get_time_remaining, grpc_method
+from fast_grpc.deadline import get_timeout
+
+# Methods, decorated by grpc_method, are GRPCMethod instances, that pylint does not infer
+# pylint: disable=no-member
+
+
+class PyTestDeadlineMessage(pydantic.BaseModel):
+    value: float
+
+
+class PyTestDeadlineService(FastGRPCService):
+    def __init__(self, port: int = 0):
+        self.port = port
+        self.decoded = 0
+        self.cancelled = asyncio.Event()
+
+    @grpc_method
+    async def inner(self, request: PyTestDeadlineMessage, context) -> PyTestDeadlineMessage:
+        self.decoded += 1
+        return PyTestDeadlineMessage(value=context.time_remaining())
+
+    @grpc_method
+    async def outer(self, request: PyTestDeadlineMessage) -> PyTestDeadlineMessage:
+        assert get_time_remaining() <= request.value
+        async with PyTestDeadlineService.Client(host="127.0.0.1", port=self.port) as client:
+            return await client.inner(request, timeout=60)
+
+    @grpc_method
+    async def slow(self, request: PyTestDeadlineMessage) -> PyTestDeadlineMessage:
+        try:
+            await asyncio.sleep(request.value)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return request
+
+
+def test_get_timeout_without_deadline():
+    assert get_time_remaining() is None
+    assert get_timeout() is None
+    assert get_timeout(1.5) == 1.5
+
+
+def test_expired_deadline_is_aborted_before_decoding(make_context):
+    service = PyTestDeadlineService()
+    handler = PyTestDeadlineService.inner.bind(service=service)
+    context = make_context(time_remaining=0.0)
+
+    with pytest.raises(grpc.aio.AbortError):
+        asyncio.run(handler(None, context))
+
+    assert context.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert service.decoded == 0
+
+
+def test_deadline_propagation(free_port: int, serve):
+    service = PyTestDeadlineService(port=free_port)
+
+    async def run():
+        async with serve(FastGRPC(service, port=free_port)):
+            async with PyTestDeadlineService.Client(host="127.0.0.1", port=free_port) as client:
+                response = await client.outer(PyTestDeadlineMessage(value=5), timeout=5)
+                assert 0 < response.value <= 5
+
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await client.slow(PyTestDeadlineMessage(value=10), timeout=0.2)
+                assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+                await asyncio.wait_for(service.cancelled.wait(), timeout=5)
+
+    asyncio.run(run())
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent import futures
+from typing import AsyncIterator
+
+import pydantic
+import pytest
+
+from fast_grpc import (
+    Executors,
+    FastGRPC,
+    FastGRPCService,
+    ServerConfig,
+    get_time_remaining,
+    grpc_method,
+)
+from fast_grpc.executor import get_process_service
+
+PICKLED_OFFSETS = []
+
+
+class PyTestExecutorRequest(pydantic.BaseModel):
+    value: float
+
+
+class PyTestExecutorResponse(pydantic.BaseModel):
+    value: float
+    pid: int = 0
+    thread: str = ""
+    time_remaining: float = -1
+
+
+class PyTestExecutorService(FastGRPCService):
+    def __init__(self, offset: float = 0):
+        self.offset = offset
+
+    def __getstate__(self):
+        PICKLED_OFFSETS.append(self.offset)
+        return self.__dict__
+
+    @grpc_method(executor="thread")
+    def sleep(self, request: PyTestExecutorRequest, context) -> PyTestExecutorResponse:
+        time.sleep(request.value)
+        time_remaining = get_time_remaining()
+        return PyTestExecutorResponse(
+            value=request.value,
+            thread=threading.current_thread().name,
+            time_remaining=-1 if time_remaining is None else time_remaining,
+        )
+
+    @grpc_method(executor="process")
+    def compute(self, request: PyTestExecutorRequest) -> PyTestExecutorResponse:
+        return PyTestExecutorResponse(value=request.value + self.offset, pid=os.getpid())
+
+    @grpc_method
+    async def fast(self, request: PyTestExecutorRequest) -> PyTestExecutorResponse:
+        return PyTestExecutorResponse(value=request.value)
+
+
+def test_executor_validation():
+    with pytest.raises(ValueError):
+        @grpc_method(executor="thread")
+        async def coroutine(self, request: PyTestExecutorRequest) -> PyTestExecutorResponse:
+            ...
+
+    with pytest.raises(ValueError):
+        @grpc_method(executor="thread")
+        def stream(
+                self,
+                request: PyTestExecutorRequest,
+        ) -> AsyncIterator[PyTestExecutorResponse]:
+            ...
+
+    with pytest.raises(ValueError):
+        @grpc_method(executor="process")
+        def with_context(
+                self,
+                request: PyTestExecutorRequest,
+                context,
+        ) -> PyTestExecutorResponse:
+            ...
+
+    with pytest.raises(ValueError):
+        @grpc_method(executor="fiber")
+        def unknown(self, request: PyTestExecutorRequest) -> PyTestExecutorResponse:
+            ...
+
+    with futures.ProcessPoolExecutor(max_workers=1) as pool, pytest.raises(ValueError):
+        @grpc_method(executor=pool)
+        def custom_process_pool(
+                self,
+                request: PyTestExecutorRequest,
+        ) -> PyTestExecutorResponse:
+            ...
+
+
+def test_thread_executor_does_not_block_loop(free_port: int, serve):
+    app = FastGRPC(
+        PyTestExecutorService(),
+        port=free_port,
+        config=ServerConfig(handler_thread_workers=2),
+    )
+
+    async def run():
+        async with serve(app):
+            async with PyTestExecutorService.Client(host="127.0.0.1", port=free_port) as client:
+                sleep_call = asyncio.ensure_future(
+                    client.sleep(PyTestExecutorRequest(value=0.5), timeout=10),
+                )
+                await asyncio.sleep(0.1)
+                assert await client.fast(PyTestExecutorRequest(value=1)) == (
+                    PyTestExecutorResponse(value=1)
+                )
+                assert not sleep_call.done()
+                return await sleep_call
+
+    response = asyncio.run(run())
+
+    assert response.thread.startswith("fast-grpc-handler")
+    assert 0 < response.time_remaining < 10
+
+
+def test_process_executor(free_port: int, serve):
+    PICKLED_OFFSETS.clear()
+    app = FastGRPC(
+        PyTestExecutorService(offset=10),
+        port=free_port,
+        config=ServerConfig(handler_process_workers=1),
+    )
+
+    async def run():
+        async with serve(app):
+            async with PyTestExecutorService.Client(host="127.0.0.1", port=free_port) as client:
+                return await asyncio.gather(*(
+                    client.compute(PyTestExecutorRequest(value=value))
+                    for value in range(3)
+                ))
+
+    responses = asyncio.run(run())
+
+    assert [response.value for response in responses] == [10, 11, 12]
+    assert len({response.pid for response in responses}) == 1
+    assert responses[0].pid != os.getpid()
+    # Service is pickled once for all requests
+    assert PICKLED_OFFSETS == [10]
+
+
+def test_process_pool_services():
+    executors = Executors(process_workers=1)
+    second_service = PyTestExecutorService(offset=2)
+    try:
+        first_key = executors.register_service(PyTestExecutorService(offset=1))
+        pool = executors.get("process")
+
+        assert pool.submit(get_process_service, first_key).result().offset == 1
+
+        second_key = executors.register_service(second_service)
+
+        assert executors.register_service(second_service) == second_key
+        # Started pool is replaced, so new workers get both services
+        assert executors.get("process") is not pool
+        assert [
+            executors.get("process").submit(get_process_service, key).result().offset
+            for key in (first_key, second_key)
+        ] == [1, 2]
+    finally:
+        executors.shutdown()
@@ -0,0 +1,222 @@
+import asyncio
+import contextlib
+import time
+
+import grpc
+import pydantic
+import pytest
+
+from fast_grpc import (
+    ConcurrencyLimiter,
+    FastGRPC,
+    FastGRPCService,
+    GradientLimiter,
+    LoadShedder,
+    Tracer,
+    Tracing,
+    VegasLimiter,
+    grpc_method,
+)
+
+# Stubs of pb2_grpc module, built in memory, are unknown to pylint
+# pylint: disable=no-member
+
+
+class PyTestLimiterMessage(pydantic.BaseModel):
+    value: int
+
+
+class PyTestLimiterService(FastGRPCService):
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.finish = asyncio.Event()
+        self.calls = 0
+
+    @grpc_method(limiter=ConcurrencyLimiter(limit=1))
+    async def slow(self, request: PyTestLimiterMessage) -> PyTestLimiterMessage:
+        self.calls += 1
+        self.started.set()
+        await self.finish.wait()
+        return request
+
+    @grpc_method(max_queue_delay=0.1)
+    async def dropped(self, request: PyTestLimiterMessage) -> PyTestLimiterMessage:
+        self.calls += 1
+        return request
+
+    @grpc_method
+    async def stall(self, request: PyTestLimiterMessage) -> PyTestLimiterMessage:
+        # Blocks event loop, so requests to server wait for it
+        time.sleep(request.value / 1000)
+        return request
+
+    @grpc_method
+    async def fast(self, request: PyTestLimiterMessage) -> PyTestLimiterMessage:
+        return request
+
+
+class PyTestLimiterTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None, parent=None):
+        self.spans.append(name)
+        return contextlib.nullcontext()
+
+
+def test_concurrency_limiter():
+    limiter = ConcurrencyLimiter(limit=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.is_available()
+    assert not limiter.try_acquire()
+
+    limiter.release(latency=0.1)
+
+    assert limiter.in_flight == 1
+    assert limiter.try_acquire()
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(limit=0)
+
+
+def observe(limiter: ConcurrencyLimiter, latency: float, count: int, dropped: bool = False):
+    for _ in range(count):
+        limiter.in_flight = limiter.limit
+        limiter.release(latency=latency, dropped=dropped)
+
+
+def test_vegas_limiter():
+    limiter = VegasLimiter(initial_limit=10, max_limit=100)
+    observe(limiter, latency=0.01, count=50)
+
+    assert limiter.limit == 100
+
+    observe(limiter, latency=0.1, count=50)
+
+    assert limiter.limit < 50
+
+    limit = limiter.limit
+    observe(limiter, latency=0.01, count=1, dropped=True)
+
+    assert limiter.limit < limit
+
+
+def test_vegas_limiter_ignores_latency_below_limit():
+    limiter = VegasLimiter(initial_limit=10)
+    limiter.release(latency=0.01)
+    for _ in range(10):
+        limiter.in_flight = 1
+        limiter.release(latency=1.0)
+
+    assert limiter.limit == 10
+
+
+def test_gradient_limiter():
+    limiter = GradientLimiter(initial_limit=10, max_limit=100, smoothing=1.0)
+    observe(limiter, latency=0.01, count=20)
+
+    assert limiter.limit == 100
+
+    observe(limiter, latency=0.1, count=10)
+
+    assert limiter.limit < 50
+
+
+def test_rejecting_stream_method(make_context):
+    load_shedder = LoadShedder()
+    context = make_context()
+
+    async def run():
+        async for _ in load_shedder.get_rejecting_method(streaming=True)(None, context):
+            pass
+
+    with pytest.raises(grpc.aio.AbortError):
+        asyncio.run(run())
+
+    assert context.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert load_shedder.rejected == 1
+
+
+def test_load_shedding(free_port: int, serve):
+    service = PyTestLimiterService()
+    tracer = PyTestLimiterTracer()
+    app = FastGRPC(
+        service,
+        port=free_port,
+        limiter=ConcurrencyLimiter(limit=10),
+        metrics=True,
+        tracing=Tracing(tracer=tracer),
+    )
+    service_name = "pytestlimiterservice.PyTestLimiterService"
+
+    async def run():
+        async with serve(app):
+            async with PyTestLimiterService.Client(host="127.0.0.1", port=free_port) as client:
+                slow_call = asyncio.ensure_future(client.slow(PyTestLimiterMessage(value=1)))
+                await service.started.wait()
+
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await client.slow(PyTestLimiterMessage(value=2))
+                assert error.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+                assert await client.fast(PyTestLimiterMessage(value=3)) == PyTestLimiterMessage(
+                    value=3,
+                )
+
+                service.finish.set()
+                assert await slow_call == PyTestLimiterMessage(value=1)
+                assert await client.slow(PyTestLimiterMessage(value=4)) == PyTestLimiterMessage(
+                    value=4,
+                )
+
+    asyncio.run(run())
+    slow_shedder = app.get_load_shedder(service_name=service_name, method_name="slow")
+
+    assert service.calls == 2
+    assert slow_shedder.rejected == 1
+    assert all(limiter.in_flight == 0 for limiter in slow_shedder.limiters)
+    assert app.get_load_shedder(service_name=service_name, method_name="fast").limiters[0] is (
+        slow_shedder.limiters[0]
+    )
+    # Requests, rejected before decoding, are measured and traced
+    slow_metrics = app.metrics.get_method(service_name=service_name, method_name="slow")
+    assert slow_metrics.status_codes == {"OK": 2, "RESOURCE_EXHAUSTED": 1}
+    assert tracer.spans.count(f"/{service_name}/slow") == 3
+
+
+def test_load_shedding_drops_requests_behind_blocked_loop(free_port: int, serve):
+    service = PyTestLimiterService()
+    tracer = PyTestLimiterTracer()
+    app = FastGRPC(service, port=free_port, metrics=True, tracing=Tracing(tracer=tracer))
+    service_name = "pytestlimiterservice.PyTestLimiterService"
+    pb2 = PyTestLimiterService.pb2
+
+    def call_blocked_server() -> list[grpc.StatusCode]:
+        # Client in other thread sends requests, while event loop of server is blocked
+        with grpc.insecure_channel(f"127.0.0.1:{free_port}") as channel:
+            stub = PyTestLimiterService.pb2_grpc.PyTestLimiterServiceStub(channel)
+            stall = stub.stall.future(pb2.PyTestLimiterMessage(value=500))
+            time.sleep(0.1)
+            calls = [stub.dropped.future(pb2.PyTestLimiterMessage(value=1)) for _ in range(20)]
+            stall.result()
+            # Lag of stall decreases with time
+            time.sleep(0.5)
+            after_stall = stub.dropped.with_call(pb2.PyTestLimiterMessage(value=2))[1]
+            return [call.code() for call in calls] + [after_stall.code()]
+
+    async def run():
+        async with serve(app):
+            # Lag monitor measures lag after the first interval
+            await asyncio.sleep(0.05)
+            return await asyncio.to_thread(call_blocked_server)
+
+    codes = asyncio.run(run())
+    shedder = app.get_load_shedder(service_name=service_name, method_name="dropped")
+
+    assert codes == [grpc.StatusCode.RESOURCE_EXHAUSTED] * 20 + [grpc.StatusCode.OK]
+    assert shedder.dropped == 20
+    assert service.calls == 1
+    # Requests, dropped before decoding, are measured and traced
+    metrics = app.metrics.get_method(service_name=service_name, method_name="dropped")
+    assert metrics.status_codes == {"RESOURCE_EXHAUSTED": 20, "OK": 1}
+    assert tracer.spans.count(f"/{service_name}/dropped") == 21
@@ -0,0 +1,100 @@
+import asyncio
+import urllib.request
+
+import grpc
+import pydantic
+
+from fast_grpc import FastGRPC, FastGRPCService, MetricsRegistry, grpc_method
+from fast_grpc.metrics import Histogram
+
+# Methods, decorated by grpc_method, are GRPCMethod instances, that pylint does not infer
+# pylint: disable=no-member
+
+
+class PyTestMetricsRequest(pydantic.BaseModel):
+    name: str
+
+
+class PyTestMetricsResponse(pydantic.BaseModel):
+    text: str
+
+
+async def metrics_middleware(next_call, request, context):
+    await asyncio.sleep(0.01)
+    return await next_call(request, context)
+
+
+class PyTestMetricsService(FastGRPCService):
+    middlewares = (metrics_middleware,)
+
+    @grpc_method
+    async def hello(self, request: PyTestMetricsRequest, context) -> PyTestMetricsResponse:
+        if not request.name:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "empty name")
+        await asyncio.sleep(0.02)
+        return PyTestMetricsResponse(text=f"Hello, {request.name}!")
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(1, 5))
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.get_cumulative_counts() == [("1", 2), ("5", 3), ("+Inf", 4)]
+    assert histogram.sum == 14.5
+
+
+def test_bind_without_metrics_has_no_instrumentation():
+    service = PyTestMetricsService()
+    handler = PyTestMetricsService.hello.bind(service=service)
+
+    # Only deadline check wraps handler
+    assert handler.__qualname__ == "apply_deadline.<locals>.deadline_handler"
+
+
+def test_method_metrics(free_port: int, serve):
+    app = FastGRPC(PyTestMetricsService(), port=free_port, metrics=True)
+
+    async def run():
+        async with serve(app):
+            async with PyTestMetricsService.Client(host="127.0.0.1", port=free_port) as client:
+                await client.hello(PyTestMetricsRequest(name="world"))
+                try:
+                    await client.hello(PyTestMetricsRequest(name=""))
+                except grpc.aio.AioRpcError:
+                    pass
+
+    asyncio.run(run())
+    method_metrics = app.metrics.get_method(
+        service_name="pytestmetricsservice.PyTestMetricsService",
+        method_name="hello",
+    )
+
+    assert method_metrics.latency.count == 2
+    assert method_metrics.in_flight == 0
+    assert method_metrics.status_codes == {"OK": 1, "INVALID_ARGUMENT": 1}
+    assert method_metrics.stages["decode"].count == 2
+    assert method_metrics.stages["encode"].count == 1
+    assert method_metrics.stages["serialize"].count == 1
+    assert method_metrics.request_bytes.count == 2
+    assert method_metrics.stages["handler"].sum >= 0.02
+    assert 0.02 > method_metrics.stages["middlewares"].sum / 2 >= 0.01
+
+
+def test_metrics_http_server(free_port: int):
+    metrics = MetricsRegistry()
+    metrics.get_method(service_name="test.Test", method_name="ping").status_codes["OK"] += 1
+    metrics_server = metrics.serve(port=free_port)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{free_port}/metrics") as response:
+            content = response.read().decode()
+    finally:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+
+    assert 'fast_grpc_responses_total{service="test.Test",method="ping",code="OK"} 1' in content
+    assert "# TYPE fast_grpc_request_duration_seconds histogram" in content
+    assert (
+        'fast_grpc_stage_duration_seconds_count{service="test.Test",method="ping",stage="decode"} 0'
+        in content
+    )
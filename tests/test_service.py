@@ -1,6 +1,17 @@
+import asyncio
+import inspect
+import pathlib
+from typing import AsyncIterator
+
 import pydantic
+import pytest
+
+from fast_grpc import FastGRPCService, ProtoEngine, RawRequest, grpc_method
+from fast_grpc.app import _FastGRPCInterceptor
+from fast_grpc.service import FastGRPCServiceMeta, GRPCMethod
 
-from fast_grpc import FastGRPCService, grpc_method
+# Methods, decorated by grpc_method, are GRPCMethod instances, that pylint does not infer
+# pylint: disable=no-member
 
 
 class PyTestRequest(pydantic.BaseModel):
@@ -73,3 +84,301 @@ def test_get_service_name():
     service = PyTestService()
 
     assert service.get_service_name() == "pytestservice.PyTestService"
+
+
+def test_bind_applies_middlewares_once(monkeypatch):
+    calls = []
+
+    async def service_middleware(next_call, request, context):
+        calls.append("service")
+        return await next_call(request, context)
+
+    async def method_middleware(next_call, request, context):
+        calls.append("method")
+        return await next_call(request, context)
+
+    class PyTestMiddlewaresService(FastGRPCService):
+        middlewares = (service_middleware,)
+
+        @grpc_method(middlewares=(method_middleware,))
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            calls.append("handler")
+            return PyTestResponse(message=request.message)
+
+    service = PyTestMiddlewaresService()
+    handler = PyTestMiddlewaresService.test.bind(service=service)
+    monkeypatch.setattr(
+        GRPCMethod,
+        "_apply_middlewares_to_function",
+        staticmethod(lambda *args, **kwargs: pytest.fail("Middlewares applied on request")),
+    )
+    request = service.pb2.PyTestRequest(message="hello")
+
+    for _ in range(2):
+        response = asyncio.run(handler(request, None))
+
+        assert isinstance(response, service.pb2.PyTestResponse)
+        assert response.message == "hello"
+    assert calls == ["service", "method", "handler"] * 2
+
+
+def test_call_reuses_bound_handler():
+    service = PyTestService()
+    request = service.pb2.PyTestRequest(message="hello")
+
+    response = asyncio.run(service.test(request, None))
+
+    assert response.message == "hello"
+    assert service in PyTestService.test._handlers  # pylint: disable=protected-access
+
+
+def test_interceptor_compose():
+    calls = []
+
+    async def middleware(next_call, request, context):
+        calls.append(request)
+        return await next_call(request, context)
+
+    async def method(request, context):
+        return request * 2
+
+    interceptor = _FastGRPCInterceptor(middlewares=(middleware,))
+    handler = interceptor.compose(method_name="/test.Test/method", method=method)
+
+    assert asyncio.run(handler(2, None)) == 4
+    assert calls == [2]
+
+
+class PyTestStreamService(FastGRPCService):
+    @grpc_method
+    async def stream(self, request: PyTestRequest) -> AsyncIterator[PyTestResponse]:
+        for index in range(3):
+            yield PyTestResponse(message=f"{request.message}-{index}")
+
+
+def test_server_streaming_proto():
+    assert PyTestStreamService.stream.server_streaming
+    assert not PyTestService.test.server_streaming
+    assert "rpc stream(PyTestRequest) returns (stream PyTestResponse) {}" in (
+        PyTestStreamService.get_proto()
+    )
+
+
+def test_server_streaming_handler_is_lazy():
+    service = PyTestStreamService()
+    handler = PyTestStreamService.stream.bind(service=service)
+    request = service.pb2.PyTestRequest(message="item")
+
+    async def consume():
+        responses = handler(request, None)
+        first = await anext(responses)
+        rest = [response async for response in responses]
+        return [first, *rest]
+
+    responses = asyncio.run(consume())
+
+    assert [response.message for response in responses] == ["item-0", "item-1", "item-2"]
+    assert inspect.isasyncgenfunction(PyTestStreamService.Client.stream)
+
+
+class PyTestClientStreamService(FastGRPCService):
+    @grpc_method
+    async def collect(self, request: AsyncIterator[PyTestRequest]) -> PyTestResponse:
+        messages = [item.message async for item in request]
+        return PyTestResponse(message=",".join(messages))
+
+    @grpc_method
+    async def echo(self, request: AsyncIterator[PyTestRequest]) -> AsyncIterator[PyTestResponse]:
+        async for item in request:
+            yield PyTestResponse(message=item.message)
+
+
+def test_client_streaming_proto():
+    content = PyTestClientStreamService.get_proto()
+
+    assert PyTestClientStreamService.collect.client_streaming
+    assert not PyTestClientStreamService.collect.server_streaming
+    assert "rpc collect(stream PyTestRequest) returns (PyTestResponse) {}" in content
+    assert "rpc echo(stream PyTestRequest) returns (stream PyTestResponse) {}" in content
+
+
+def test_client_streaming_handlers_decode_incrementally():
+    service = PyTestClientStreamService()
+    pulled = []
+
+    async def requests():
+        for index in range(3):
+            pulled.append(index)
+            yield service.pb2.PyTestRequest(message=str(index))
+
+    async def run():
+        collected = await PyTestClientStreamService.collect.bind(service=service)(
+            requests(),
+            None,
+        )
+        pulled.clear()
+        echo = PyTestClientStreamService.echo.bind(service=service)(requests(), None)
+        first = await anext(echo)
+        pulled_after_first = list(pulled)
+        rest = [response async for response in echo]
+        return collected, first, pulled_after_first, rest
+
+    collected, first, pulled_after_first, rest = asyncio.run(run())
+
+    assert collected.message == "0,1,2"
+    assert first.message == "0"
+    assert pulled_after_first == [0]
+    assert [response.message for response in rest] == ["1", "2"]
+
+
+def test_from_proto(tmp_path: pathlib.Path):
+    proto_file = tmp_path / "from_proto_test.proto"
+    proto_file.write_text(data="""
+    syntax = "proto3";
+    package from.proto.test;
+
+    service FromProtoTest {
+        rpc check(CheckRequest) returns (CheckResponse) {}
+    }
+
+    message CheckRequest {
+        string text = 1;
+    }
+
+    message CheckResponse {
+        repeated string words = 1;
+    }
+    """)
+
+    service_class = FastGRPCService.from_proto(proto_file=proto_file, grpc_path=tmp_path)
+    request_codec = service_class.codecs["CheckRequest"]
+    request = request_codec.model(text="hello")
+
+    assert service_class().get_service_name() == "from.proto.test.FromProtoTest"
+    assert request_codec.decode(request_codec.encode(request)) == request
+
+
+def test_protoc_engine_uses_cache(tmp_path: pathlib.Path):
+    class PyTestProtocService(FastGRPCService):
+        engine = ProtoEngine.PROTOC
+        grpc_path = tmp_path
+
+        @grpc_method
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            return PyTestResponse(message=request.message)
+
+    request = PyTestRequest(message="hello")
+    codec = PyTestProtocService.codecs["PyTestRequest"]
+    cached_paths = list(tmp_path.iterdir())
+
+    assert len(cached_paths) == 1
+    assert (cached_paths[0] / "pytestprotocservice_pb2.py").is_file()
+    assert PyTestProtocService().get_service_name() == "pytestprotocservice.PyTestProtocService"
+    assert codec.decode(codec.encode(request)) == request
+
+
+def test_service_is_materialized_lazily(tmp_path: pathlib.Path):
+    class PyTestLazyService(FastGRPCService):
+        engine = ProtoEngine.PROTOC
+        grpc_path = tmp_path
+
+        @grpc_method
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            return PyTestResponse(message=request.message)
+
+    assert not PyTestLazyService.is_materialized
+    assert not list(tmp_path.iterdir())
+
+    client_class = PyTestLazyService.Client
+
+    assert PyTestLazyService.is_materialized
+    assert PyTestLazyService.__dict__["Client"] is client_class
+    assert hasattr(PyTestLazyService.pb2, "PyTestRequest")
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_subclass_does_not_materialize_parent():
+    class PyTestLazyInterface(FastGRPCService):
+        @grpc_method
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            pass
+
+    class PyTestLazyImplementation(PyTestLazyInterface):
+        disabled = True
+
+    assert not PyTestLazyInterface.is_materialized
+    assert PyTestLazyImplementation.grpc_methods.keys() == {"test"}
+
+    service = PyTestLazyImplementation()
+
+    assert service.pb2 is PyTestLazyInterface.pb2
+    assert PyTestLazyInterface.is_materialized
+
+
+def test_materialize_all():
+    class PyTestMaterializeService(FastGRPCService):
+        @grpc_method
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            pass
+
+    FastGRPCServiceMeta.materialize_all()
+
+    assert PyTestMaterializeService.is_materialized
+
+
+def test_materialize_is_done_once(monkeypatch):
+    class PyTestMaterializeOnceService(FastGRPCService):
+        @grpc_method
+        async def test(self, request: PyTestRequest) -> PyTestResponse:
+            pass
+
+    PyTestMaterializeOnceService.materialize()
+    pb2, client_class = PyTestMaterializeOnceService.pb2, PyTestMaterializeOnceService.Client
+
+    def generate_pb2(**kwargs):
+        raise AssertionError("Materialized service is built again")
+
+    monkeypatch.setattr(PyTestMaterializeOnceService, "generate_pb2", generate_pb2)
+    PyTestMaterializeOnceService.materialize()
+    FastGRPCServiceMeta.materialize_all()
+
+    assert PyTestMaterializeOnceService.pb2 is pb2
+    assert PyTestMaterializeOnceService.Client is client_class
+
+
+class PyTestRawService(FastGRPCService):
+    @grpc_method(raw=True)
+    async def forward(self, request: PyTestRequest) -> PyTestResponse:
+        return self.pb2.PyTestResponse(message=request.message)
+
+    @grpc_method
+    async def inspect(self, request: RawRequest[PyTestRequest]) -> PyTestResponse:
+        return PyTestResponse(message=str(isinstance(request, pydantic.BaseModel)))
+
+    @grpc_method
+    async def collect(self, request: AsyncIterator[RawRequest[PyTestRequest]]) -> PyTestResponse:
+        return PyTestResponse(message=",".join([item.message async for item in request]))
+
+
+def test_raw_methods():
+    service = PyTestRawService()
+    request = service.pb2.PyTestRequest(message="raw")
+
+    async def requests():
+        for message in ("a", "b"):
+            yield service.pb2.PyTestRequest(message=message)
+
+    forwarded = asyncio.run(PyTestRawService.forward.bind(service=service)(request, None))
+    inspected = asyncio.run(PyTestRawService.inspect.bind(service=service)(request, None))
+    collected = asyncio.run(PyTestRawService.collect.bind(service=service)(requests(), None))
+
+    assert PyTestRawService.forward.raw_response
+    assert PyTestRawService.inspect.raw_request
+    assert not PyTestRawService.inspect.raw_response
+    assert PyTestRawService.collect.client_streaming
+    assert PyTestRawService.collect.request_model is PyTestRequest
+    assert isinstance(forwarded, service.pb2.PyTestResponse)
+    assert forwarded.message == "raw"
+    assert inspected.message == "False"
+    assert collected.message == "a,b"
+    assert "rpc inspect(PyTestRequest) returns (PyTestResponse) {}" in service.get_proto()
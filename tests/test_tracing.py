@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import contextvars
+import itertools
+from typing import AsyncIterator
+
+import pydantic
+
+from fast_grpc import FastGRPC, FastGRPCService, Tracer, Tracing, grpc_method
+
+
+class PyTestTracingRequest(pydantic.BaseModel):
+    name: str
+
+
+class PyTestTracingResponse(pydantic.BaseModel):
+    text: str
+
+
+class PyTestTracingService(FastGRPCService):
+    @grpc_method
+    async def hello(self, request: PyTestTracingRequest) -> PyTestTracingResponse:
+        return PyTestTracingResponse(text=f"Hello, {request.name}!")
+
+    @grpc_method
+    async def hello_stream(
+            self,
+            request: PyTestTracingRequest,
+    ) -> AsyncIterator[PyTestTracingResponse]:
+        for index in range(2):
+            yield PyTestTracingResponse(text=f"Hello, {request.name} {index}!")
+
+
+class RecordingTracer(Tracer):
+    def __init__(self, sampled: bool = True):
+        self.sampled = sampled
+        self.spans: list[tuple[str, str, str | None]] = []
+        self.current: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+            "current",
+            default=None,
+        )
+        self._ids = itertools.count()
+
+    @contextlib.contextmanager
+    def start_span(self, name, attributes=None, parent=None):
+        span_id = f"span-{next(self._ids)}"
+        self.spans.append((name, span_id, parent or self.current.get()))
+        token = self.current.set(span_id)
+        try:
+            yield
+        finally:
+            self.current.reset(token)
+
+    @contextlib.contextmanager
+    def attach(self, parent):
+        token = self.current.set(parent)
+        try:
+            yield
+        finally:
+            self.current.reset(token)
+
+    def inject(self, metadata):
+        if self.current.get() is not None:
+            metadata["x-span-id"] = self.current.get()
+
+    def extract(self, metadata):
+        return metadata.get("x-span-id")
+
+    def is_sampled(self, parent):
+        return self.sampled
+
+
+def test_tracing_stages_without_sampling():
+    tracer = RecordingTracer()
+    tracing = Tracing(tracer=tracer, sample_rate=0.0)
+    handler = tracing.trace_stage(name="decode", function=lambda value: value + 1)
+
+    assert handler(1) == 2
+    assert not tracer.spans
+
+
+def test_tracing_follows_unsampled_parent(make_context):
+    tracer = RecordingTracer(sampled=False)
+    tracing = Tracing(tracer=tracer, sample_rate=1.0)
+    calls = []
+
+    async def call_rpc(request, timeout=None, metadata=None):
+        calls.append(dict(metadata))
+        return request
+
+    async def method(request, context):
+        return await tracing.call(method_name="/downstream", call_rpc=call_rpc, request=request)
+
+    handler = tracing.trace_request(method_name="/upstream", method=method)
+    context = make_context(metadata=(("x-span-id", "parent"),))
+
+    assert asyncio.run(handler("request", context)) == "request"
+    # Client call neither starts root span, nor loses context and decision of parent
+    assert not tracer.spans
+    assert calls == [{"x-span-id": "parent", "fast-grpc-sampled": "0"}]
+
+
+def test_tracing_propagation(free_port: int, serve):
+    client_tracer = RecordingTracer()
+    server_tracer = RecordingTracer()
+    # Server does not sample requests itself, it follows sampling decision of client
+    app = FastGRPC(
+        PyTestTracingService(),
+        port=free_port,
+        tracing=Tracing(tracer=server_tracer, sample_rate=0.0),
+    )
+
+    async def run():
+        async with serve(app):
+            async with PyTestTracingService.Client(
+                    host="127.0.0.1",
+                    port=free_port,
+                    tracing=Tracing(tracer=client_tracer),
+            ) as client:
+                response = await client.hello(PyTestTracingRequest(name="world"))
+                assert response.text == "Hello, world!"
+
+                with client_tracer.start_span(name="parent"):
+                    responses = [
+                        response
+                        async for response in client.hello_stream(
+                            PyTestTracingRequest(name="world"),
+                        )
+                    ]
+                    assert len(responses) == 2
+
+    asyncio.run(run())
+
+    assert client_tracer.spans == [
+        ("/pytesttracingservice.PyTestTracingService/hello", "span-0", None),
+        ("parent", "span-1", None),
+    ]
+    names = [name for name, _, _ in server_tracer.spans]
+    assert names == [
+        "/pytesttracingservice.PyTestTracingService/hello",
+        "decode",
+        "middlewares",
+        "handler",
+        "encode",
+        "/pytesttracingservice.PyTestTracingService/hello_stream",
+        "decode",
+        "middlewares",
+        "handler",
+        "encode",
+        "encode",
+    ]
+    spans = {name: (span_id, parent) for name, span_id, parent in server_tracer.spans[:5]}
+    assert spans["/pytesttracingservice.PyTestTracingService/hello"][1] == "span-0"
+    assert spans["handler"][1] == spans["middlewares"][0]
+    assert server_tracer.spans[5][2] == "span-1"
+
+
+def test_tracing_without_sampling(free_port: int, serve):
+    client_tracer = RecordingTracer()
+    server_tracer = RecordingTracer()
+    app = FastGRPC(
+        PyTestTracingService(),
+        port=free_port,
+        tracing=Tracing(tracer=server_tracer, sample_rate=0.0),
+    )
+
+    async def run():
+        async with serve(app):
+            async with PyTestTracingService.Client(
+                    host="127.0.0.1",
+                    port=free_port,
+                    tracing=Tracing(tracer=client_tracer, sample_rate=0.0),
+            ) as client:
+                await client.hello(PyTestTracingRequest(name="world"))
+                async for _ in client.hello_stream(PyTestTracingRequest(name="world")):
+                    pass
+
+    asyncio.run(run())
+
+    assert not client_tracer.spans
+    assert not server_tracer.spans
+
+
+def test_tracing_follows_unsampled_client(free_port: int, serve):
+    client_tracer = RecordingTracer()
+    server_tracer = RecordingTracer()
+    # Server follows decision of client, even if it samples own requests
+    app = FastGRPC(
+        PyTestTracingService(),
+        port=free_port,
+        tracing=Tracing(tracer=server_tracer, sample_rate=1.0),
+    )
+
+    async def run():
+        async with serve(app):
+            async with PyTestTracingService.Client(
+                    host="127.0.0.1",
+                    port=free_port,
+                    tracing=Tracing(tracer=client_tracer, sample_rate=0.0),
+            ) as client:
+                await client.hello(PyTestTracingRequest(name="world"))
+
+    asyncio.run(run())
+
+    assert not client_tracer.spans
+    assert not server_tracer.spans
@@ -0,0 +1,86 @@
+import asyncio
+from typing import AsyncIterator
+
+import grpc
+import pydantic
+
+from fast_grpc import FastGRPC, FastGRPCService, grpc_method
+
+SERVICE_NAME = "pytestwarmupservice.PyTestWarmupService"
+
+
+class PyTestWarmupMessage(pydantic.BaseModel):
+    value: int
+
+
+class PyTestWarmupService(FastGRPCService):
+    def __init__(self):
+        self.values = []
+
+    @grpc_method(warmup_requests=(PyTestWarmupMessage(value=1), PyTestWarmupMessage(value=2)))
+    async def unary(self, request: PyTestWarmupMessage) -> PyTestWarmupMessage:
+        self.values.append(request.value)
+        return request
+
+    @grpc_method(warmup_requests=(PyTestWarmupMessage(value=3),))
+    async def server_stream(
+            self,
+            request: PyTestWarmupMessage,
+    ) -> AsyncIterator[PyTestWarmupMessage]:
+        self.values.append(request.value)
+        yield request
+
+    @grpc_method(warmup_requests=(PyTestWarmupMessage(value=4), PyTestWarmupMessage(value=5)))
+    async def client_stream(
+            self,
+            request: AsyncIterator[PyTestWarmupMessage],
+    ) -> PyTestWarmupMessage:
+        async for message in request:
+            self.values.append(message.value)
+        return PyTestWarmupMessage(value=0)
+
+    @grpc_method(warmup_requests=(PyTestWarmupMessage(value=6),))
+    async def failing(self, request: PyTestWarmupMessage, context) -> PyTestWarmupMessage:
+        await context.abort(grpc.StatusCode.NOT_FOUND, "Not found")
+
+    @grpc_method
+    async def cold(self, request: PyTestWarmupMessage) -> PyTestWarmupMessage:
+        self.values.append(request.value)
+        return request
+
+
+def test_warm_up():
+    service = PyTestWarmupService()
+    middleware_calls = []
+
+    async def middleware(call_next, request, context):
+        middleware_calls.append(request)
+        return await call_next(request, context)
+
+    app = FastGRPC(service, middlewares=(middleware,), metrics=True, warmup_requests=True)
+
+    report = asyncio.run(app.warm_up())
+
+    assert sorted(service.values) == [1, 2, 3, 4, 5]
+    assert len(middleware_calls) == 5
+    assert set(report.codecs) == {SERVICE_NAME}
+    assert set(report.requests) == {
+        f"/{SERVICE_NAME}/{name}" for name in ("unary", "server_stream", "client_stream")
+    }
+    assert report.failed == [f"/{SERVICE_NAME}/failing"]
+    assert report.duration >= sum(report.requests.values())
+    # Sample requests are not counted in metrics of methods
+    method_metrics = app.metrics.get_method(service_name=SERVICE_NAME, method_name="unary")
+    assert method_metrics.latency.count == 0
+    assert method_metrics.stages["handler"].count == 0
+
+
+def test_warm_up_without_requests():
+    service = PyTestWarmupService()
+
+    report = asyncio.run(FastGRPC(service).warm_up())
+
+    # Handlers are called by warm-up only on opt-in
+    assert not service.values
+    assert set(report.codecs) == {SERVICE_NAME}
+    assert not report.requests